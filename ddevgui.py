@@ -1,18 +1,37 @@
+import time
+# Taken before anything else so --startup-profile can show what the imports cost
+STARTUP_MARKS = [("start", time.perf_counter())]
 import os
+import sys
 import subprocess
 import threading
-import tkinter as tk
-from tkinter import messagebox, filedialog, simpledialog, ttk
+try:
+    import tkinter as tk
+    from tkinter import messagebox, filedialog, simpledialog, ttk
+except ImportError:
+    # Headless hosts still get the command line
+    tk = messagebox = filedialog = simpledialog = ttk = None
 from pathlib import Path
 import platform
-import yaml
 import base64
 import json
-import shutil
-import tempfile
 import re
+import select
+import queue
+import signal
+import itertools
+import math
+import stat
+from collections import deque
+STARTUP_MARKS.append(("imports", time.perf_counter()))
 
 CONFIG_FILE = os.path.join(os.path.expanduser("~"), ".ddevgui.json")
+INDEX_FILE = os.path.join(os.path.expanduser("~"), ".ddevgui-index.json")
+ARTIFACT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ddevgui-cache")
+DISK_USAGE_DIR = os.path.join(os.path.expanduser("~"), ".ddevgui-du")
+IDLE_LOG_FILE = os.path.join(os.path.expanduser("~"), ".ddevgui-idle.log")
+SNAPSHOT_FILE = os.path.join(os.path.expanduser("~"), ".ddevgui-snapshot.json")
+DAEMON_FILE = os.path.join(os.path.expanduser("~"), ".ddevgui-daemon.json")
 DEFAULTS = {
     "php_version": "8.3",
     "db_version": "mysql:8.0",
@@ -36,6 +55,60 @@ PROJECTS_DIR = pathnix
 if platform.system() == "Windows":
     PROJECTS_DIR = Path(pathwin)
 REFRESH_INTERVAL = 5000
+EVENTS_REFRESH_INTERVAL = 120000
+INDEX_POLL_INTERVAL = 30
+INDEX_SAFETY_SYNC = 600  # full rescan alongside inotify, for events that slip past the watches
+MAX_PARALLEL_JOBS = 4
+JOB_HISTORY = 200
+JOB_OUTPUT_LINES = 2000
+STDERR_TAIL_LINES = 50
+CONSOLE_MAX_LINES = 5000
+CONSOLE_MAX_TABS = 12
+CONSOLE_UPDATE_INTERVAL = 200
+IMPORT_CHUNK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL = 0.5
+DESCRIBE_TTL = 60
+SHELL_READ_TIMEOUT = 600  # seconds without output before a shell session is given up on
+DAEMON_HEARTBEAT = 15
+DAEMON_QUEUE_SIZE = 100
+JOB_WATCH_TTL = 300  # seconds a polled job is kept out of history trimming after the last poll
+PROVISION_STATE_FILE = ".ddevgui-provision.json"
+PROVISION_PARALLEL = 4
+WP_CORE_URL = "https://wordpress.org/latest.zip"
+WP_VERSION_API = "https://api.wordpress.org/core/version-check/1.7/"
+WP_PLUGIN_API = "https://api.wordpress.org/plugins/info/1.0/{slug}.json"
+GITHUB_RELEASE_API = "https://api.github.com/repos/{repo}/releases/latest"
+ARTIFACT_CACHE_LIMIT = 1024 * 1024 * 1024
+TEMPLATES_DIR_NAME = ".ddevgui-templates"
+TRASH_DIR_NAME = ".ddevgui-trash"
+DELETE_WORKERS = 8
+DELETE_RETRIES = 5
+DELETE_RETRY_WINERRORS = {5, 32, 145}  # access denied, sharing violation, directory not empty
+DISK_SCAN_INTERVAL = 600
+DISK_FULL_RESCAN = 24 * 3600
+DISK_COLD_AGE = 24 * 3600   # a subtree with nothing modified for this long counts as cold
+DISK_COLD_RESCAN = 3600     # cold subtrees are reused for at most this long before being walked again
+DOCKER_SIZE_UNITS = {
+    "B": 1, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4,
+    "KIB": 1024, "MIB": 1024 ** 2, "GIB": 1024 ** 3, "TIB": 1024 ** 4,
+}
+STATS_HISTORY = 60
+TRACE_BUFFER_SIZE = 5000
+METRICS_INTERVAL = 60000
+STATS_UPDATE_INTERVAL = 3
+IDLE_CHECK_INTERVAL = 60000
+IDLE_TIMEOUT_MINUTES = 120
+# Less than this between two stats frames is keep-alive noise, not a request
+IDLE_NET_THRESHOLD = 4096
+IDLE_ACTIONS = ["stop", "pause"]
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+# Left behind by ddevgui or ddev in a project, not worth carrying into a template
+TEMPLATE_EXCLUDES = [PROVISION_STATE_FILE, ".ddev/db_snapshots", ".ddev/.ddev-docker-compose-full.yaml"]
+EXPORT_FORMATS = ["gzip", "zstd", "sql"]
+EXPORT_EXTENSIONS = {"gzip": ".sql.gz", "zstd": ".sql.zst", "sql": ".sql"}
+# Tables whose rows are disposable: caches, logs, sessions, transients
+TRANSIENT_TABLE_RE = re.compile(r"(^|_)(cache|caches|log|logs|sessions|transients?)(_|$)", re.IGNORECASE)
+DOCKER_COMMAND = "docker"
 DDEV_COMMAND = "ddev"
 if platform.system() == "Windows":
     DDEV_COMMAND = "C:\\Program Files\\ddev\\ddev.exe"
@@ -47,7 +120,141 @@ DB_VERSIONS = [
 ]
 WEBSERVERS = ["apache-fpm", "nginx-fpm", "generic"]
 
-def extract_table_prefix(wp_config_path, docroot, project_path):
+# Custom order: running → paused → stopped → unknown/other
+STATUS_PRIORITY = {
+    "running": 0,
+    "paused": 1,
+    "stopped": 2,
+    "unknown": 3,
+}
+
+SORT_MODES = ["status", "size"]
+
+def sort_projects(projects, mode="status"):
+    if mode == "size":
+        # Biggest first, files and database volume together
+        return sorted(
+            projects,
+            key=lambda p: (-(p.get("size") or 0) - (p.get("db_size") or 0), p["name"].lower())
+        )
+    # Sort projects by status, then by name
+    return sorted(
+        projects,
+        key=lambda p: (
+            STATUS_PRIORITY.get(p["status"], 99),
+            p["name"].lower()
+        )
+    )
+
+def diff_rows(old_rows, new_rows):
+    # Only rows whose position or content changed need to touch the listbox
+    changes = [
+        (idx, row) for idx, row in enumerate(new_rows)
+        if idx >= len(old_rows) or old_rows[idx] != row
+    ]
+    return changes, len(new_rows)
+
+class ProjectConfig:
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, path, data, mtime):
+        self.path = Path(path)
+        self.data = data
+        self.mtime = mtime
+
+    @classmethod
+    def load(cls, project_path):
+        import yaml
+        path = Path(project_path) / ".ddev" / "config.yaml"
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            raise FileNotFoundError(f"{path} not found")
+
+        key = str(path)
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+        if cached is not None and cached.mtime == mtime:
+            return cached
+
+        with open(path, "r", encoding="utf-8") as f:
+            # libyaml is several times faster on big configs, fall back to the pure Python loader
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+        config = cls(path, data, mtime)
+        with cls._cache_lock:
+            cls._cache[key] = config
+        return config
+
+    @classmethod
+    def invalidate(cls, project_path):
+        with cls._cache_lock:
+            cls._cache.pop(str(Path(project_path) / ".ddev" / "config.yaml"), None)
+
+    @property
+    def project_path(self):
+        return self.path.parent.parent
+
+    @property
+    def name(self):
+        return self.data.get("name") or self.project_path.name
+
+    def get_docroot(self, default="public"):
+        return str(self.data.get("docroot", default) or "").strip() or default
+
+    @property
+    def docroot(self):
+        return self.get_docroot()
+
+    @property
+    def project_type(self):
+        return self.data.get("type", "php")
+
+    @property
+    def php_version(self):
+        return self.data.get("php_version")
+
+    @property
+    def database(self):
+        db = self.data.get("database") or {}
+        return db.get("type"), db.get("version")
+
+    @property
+    def webserver_type(self):
+        return self.data.get("webserver_type", "nginx-fpm")
+
+    @property
+    def additional_hostnames(self):
+        return list(self.data.get("additional_hostnames") or [])
+
+    @property
+    def hostnames(self):
+        tld = self.data.get("project_tld") or "ddev.site"
+        return [f"{h}.{tld}" for h in [self.name] + self.additional_hostnames]
+
+    def update(self, **changes):
+        import tempfile
+        import yaml
+        data = dict(self.data)
+        data.update(changes)
+        # Write next to the original and swap, a crash never leaves half a config
+        fd, tmp_path = tempfile.mkstemp(suffix=".yaml", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                yaml.dump(data, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+            os.chmod(tmp_path, self.path.stat().st_mode & 0o777)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.data = data
+        self.mtime = self.path.stat().st_mtime_ns
+        with ProjectConfig._cache_lock:
+            ProjectConfig._cache[str(self.path)] = self
+        return self
+
+def extract_table_prefix(wp_config_path, docroot, project_path, job=None):
     try:
         content = Path(wp_config_path).read_text()
         match = re.search(r"""\$table_prefix\s*=\s*(['"])(.*?)\1""", content)
@@ -58,17 +265,10 @@ def extract_table_prefix(wp_config_path, docroot, project_path):
         print(f"[ERROR] Reading wp-config.php: {e}")
 
     try:
-        result = subprocess.run(
-            [
-                DDEV_COMMAND, "exec", "bash", "-c",
-                f"wp --path={docroot} db prefix"
-            ],
-            cwd=project_path,
-            encoding="utf-8",
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        if job is not None:
+            result = job.shell(project_path, f"wp --path={docroot} db prefix", check=True)
+        else:
+            result = shell_pool.run(project_path, f"wp --path={docroot} db prefix", check=True)
         fallback_prefix = result.stdout.strip()
         return fallback_prefix
     except subprocess.CalledProcessError as e:
@@ -78,19 +278,2648 @@ def extract_table_prefix(wp_config_path, docroot, project_path):
 
     return "wp_"
 
+# ddev commands that replace the web container and so end any shell session in it
+SESSION_RESET_COMMANDS = {"start", "stop", "restart", "poweroff", "delete"}
+
+# Container event → project status, only the web container decides
+EVENT_STATUS = {
+    "start": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "stop": "stopped",
+    "die": "stopped",
+}
+
+def command_kind(args):
+    # "ddev list", "docker stats", "cp": the program plus its subcommand, flags and paths dropped
+    args = [str(arg) for arg in args]
+    if not args:
+        return "?"
+    if args[0] == DDEV_COMMAND:
+        program = "ddev"
+    elif args[0] == DOCKER_COMMAND:
+        program = "docker"
+    else:
+        program = re.sub(r"\.exe$", "", os.path.basename(args[0].replace("\\", "/")), flags=re.IGNORECASE)
+    if program in ("ddev", "docker"):
+        subcommand = next((arg for arg in args[1:] if not arg.startswith("-")), None)
+        if subcommand:
+            return f"{program} {subcommand}"
+    return program
+
+def project_for_cwd(cwd):
+    if cwd is None:
+        return None
+    try:
+        relative = Path(cwd).resolve().relative_to(Path(PROJECTS_DIR).resolve())
+    except (ValueError, OSError):
+        return None
+    return relative.parts[0] if relative.parts else None
+
+def percentile(values, fraction):
+    # Nearest rank, values must be sorted
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+def trace_summary(records):
+    by_kind = {}
+    for record in records:
+        by_kind.setdefault(record["kind"], []).append(record)
+    summary = {}
+    for kind, entries in by_kind.items():
+        durations = sorted(entry["duration"] for entry in entries)
+        summary[kind] = {
+            "count": len(entries),
+            "p50": percentile(durations, 0.5),
+            "p95": percentile(durations, 0.95),
+            "max": durations[-1],
+            "failures": sum(1 for entry in entries if entry["returncode"] != 0 and not entry.get("cancelled")),
+            "cancelled": sum(1 for entry in entries if entry.get("cancelled")),
+            "output_bytes": sum(entry["output_bytes"] for entry in entries),
+        }
+    return summary
+
+class CommandTracer:
+    # Every finished ddev/docker subprocess: a ring buffer for the Performance panel plus running totals
+    def __init__(self, size=TRACE_BUFFER_SIZE):
+        self.records = deque(maxlen=size)
+        self.totals = {}  # kind → count, seconds, failures, cancellations, output bytes since start
+        self._lock = threading.Lock()
+
+    def record(self, args, duration, returncode, output_bytes, project=None, cwd=None, cancelled=False):
+        # -1 when there is no exit status, the call was killed or raised before it finished
+        if returncode is None:
+            returncode = -1
+        record = {
+            "time": time.time() - duration,
+            "kind": command_kind(args),
+            "command": [str(arg) for arg in args],
+            "project": project or project_for_cwd(cwd),
+            "duration": round(duration, 4),
+            "returncode": returncode,
+            "cancelled": cancelled,
+            "output_bytes": output_bytes,
+        }
+        with self._lock:
+            self.records.append(record)
+            totals = self.totals.setdefault(
+                record["kind"], {"count": 0, "seconds": 0.0, "failures": 0, "cancelled": 0, "output_bytes": 0}
+            )
+            totals["count"] += 1
+            totals["seconds"] += duration
+            totals["failures"] += returncode != 0 and not cancelled
+            totals["cancelled"] += cancelled
+            totals["output_bytes"] += output_bytes
+        return record
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.records)
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+    def write_jsonl(self, path):
+        with open(path, "w") as f:
+            for record in self.snapshot():
+                f.write(json.dumps(record) + "\n")
+
+    def prometheus_text(self):
+        # Quantiles over the ring buffer, sums and counts since start, as the summary type expects
+        summary = trace_summary(self.snapshot())
+        with self._lock:
+            totals = {kind: dict(entry) for kind, entry in self.totals.items()}
+        lines = [
+            "# HELP ddevgui_subprocess_duration_seconds Duration of ddev/docker subprocess calls.",
+            "# TYPE ddevgui_subprocess_duration_seconds summary",
+        ]
+        for kind in sorted(totals):
+            label = kind.replace("\\", "\\\\").replace('"', '\\"')
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95")):
+                value = (summary.get(kind) or {}).get(key)
+                if value is not None:
+                    lines.append(f'ddevgui_subprocess_duration_seconds{{kind="{label}",quantile="{quantile}"}} {value}')
+            lines.append(f'ddevgui_subprocess_duration_seconds_sum{{kind="{label}"}} {totals[kind]["seconds"]:.4f}')
+            lines.append(f'ddevgui_subprocess_duration_seconds_count{{kind="{label}"}} {totals[kind]["count"]}')
+        for name, key, text in (
+            ("ddevgui_subprocess_failures_total", "failures", "Subprocess calls that exited non-zero or broke off."),
+            ("ddevgui_subprocess_cancelled_total", "cancelled", "Subprocess calls killed because their job was cancelled."),
+            ("ddevgui_subprocess_output_bytes_total", "output_bytes", "Bytes read from subprocess stdout and stderr."),
+        ):
+            lines += [f"# HELP {name} {text}", f"# TYPE {name} counter"]
+            for kind in sorted(totals):
+                label = kind.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{kind="{label}"}} {totals[kind][key]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # The textfile collector may read at any moment, only ever show it a complete file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+tracer = CommandTracer()
+
+def write_metrics_textfile(path=None):
+    # For node_exporter's textfile collector, set "metrics_textfile" in ~/.ddevgui.json
+    path = path or settings.get("metrics_textfile")
+    if not path:
+        return
+    try:
+        tracer.write_prometheus(path)
+    except OSError as e:
+        print(f"Error writing metrics: {e}")
+
+def traced_run(args, **kwargs):
+    started = time.perf_counter()
+    result = subprocess.run(args, **kwargs)
+    output = (result.stdout or "") + (result.stderr or "") if kwargs.get("capture_output") else ""
+    tracer.record(args, time.perf_counter() - started, result.returncode, len(output), cwd=kwargs.get("cwd"))
+    return result
+
+def docker_event_stream():
+    args = [DOCKER_COMMAND, "events", "--format", "{{json .}}",
+            "--filter", "type=container",
+            "--filter", "label=com.ddev.site-name"]
+    for action in EVENT_STATUS:
+        args += ["--filter", f"event={action}"]
+    proc = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+        text=True
+    )
+    return _read_json_lines(proc)
+
+def _read_json_lines(proc):
+    started = time.perf_counter()
+    output_bytes = 0
+    try:
+        for line in proc.stdout:
+            output_bytes += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+    finally:
+        returncode = proc.poll()
+        proc.kill()
+        proc.wait()
+        # Streams are traced once they end, under their own kind so they don't skew short calls;
+        # being stopped by us is not a failure
+        tracer.record(proc.args, time.perf_counter() - started, returncode or 0, output_bytes)
+
+def docker_stats_stream():
+    proc = subprocess.Popen(
+        [DOCKER_COMMAND, "stats", "--format", "{{json .}}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+        text=True
+    )
+    started = time.perf_counter()
+    output_bytes = 0
+    try:
+        for line in proc.stdout:
+            output_bytes += len(line)
+            # Every refresh starts by clearing the screen, that escape marks the end of a frame
+            if "\x1b[" in line:
+                yield None
+            line = ANSI_ESCAPE_RE.sub("", line).strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+    finally:
+        returncode = proc.poll()
+        proc.kill()
+        proc.wait()
+        tracer.record(proc.args, time.perf_counter() - started, returncode or 0, output_bytes)
+
+class ResourceMonitor:
+    # One `docker stats` stream for every container, summed per ddev site (ddev-<site>-<service>)
+    def __init__(self, on_update, stats_source=docker_stats_stream, history=STATS_HISTORY):
+        self.on_update = on_update
+        self.stats_source = stats_source
+        self.history_size = history
+        self.history = {}
+        self.current = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_update = 0
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        delay = 1
+        while not self._stop.is_set():
+            try:
+                frame = []
+                for row in self.stats_source():
+                    if self._stop.is_set():
+                        break
+                    if row is None:
+                        if frame:
+                            self.handle_frame(frame)
+                        frame = []
+                        delay = 1
+                    else:
+                        frame.append(row)
+                if frame:
+                    self.handle_frame(frame)
+            except Exception as e:
+                print("Docker stats stream failed:", e)
+            self._stop.wait(delay)
+            delay = min(delay * 2, 60)
+
+    @staticmethod
+    def _split_name(name):
+        if name in ("ddev-router", "ddev-ssh-agent"):
+            return None, None
+        match = re.match(r"^ddev-(.+)-([a-z0-9_]+)$", name or "")
+        return (match.group(1), match.group(2)) if match else (None, None)
+
+    def handle_frame(self, rows):
+        now = time.time()
+        current = {}
+        for row in rows:
+            site, service = self._split_name(row.get("Name"))
+            if not site:
+                continue
+            cpu = float((row.get("CPUPerc") or "0").rstrip("%") or 0)
+            mem = parse_docker_size((row.get("MemUsage") or "").split("/")[0])
+            entry = current.setdefault(site, {"cpu": 0.0, "mem": 0, "net": 0, "services": {}})
+            entry["cpu"] += cpu
+            entry["mem"] += mem
+            if service == "web":
+                # Cumulative bytes in and out of the web container, it moves with every request
+                entry["net"] = sum(parse_docker_size(part) for part in (row.get("NetIO") or "").split("/"))
+            entry["services"][service] = (cpu, mem)
+        with self._lock:
+            self.current = current
+            for site, entry in current.items():
+                history = self.history.setdefault(site, deque(maxlen=self.history_size))
+                history.append((now, entry["cpu"], entry["mem"]))
+            for site in list(self.history):
+                if site not in current:
+                    del self.history[site]
+        if now - self._last_update >= STATS_UPDATE_INTERVAL:
+            self._last_update = now
+            self.on_update(self.snapshot())
+
+    def snapshot(self):
+        with self._lock:
+            return {site: dict(entry) for site, entry in self.current.items()}
+
+    def series(self, site):
+        with self._lock:
+            return list(self.history.get(site, ()))
+
+class IdleTracker:
+    def __init__(self, timeout_minutes=IDLE_TIMEOUT_MINUTES, overrides=None, pinned=None):
+        self.timeout_minutes = timeout_minutes
+        self.overrides = dict(overrides or {})
+        self.pinned = set(pinned or [])
+        self.last_activity = {}
+        self._net = {}
+        self._lock = threading.Lock()
+
+    def touch(self, project, now=None):
+        with self._lock:
+            self.last_activity[project] = time.time() if now is None else now
+
+    def observe(self, usage_by_project, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            for project, entry in usage_by_project.items():
+                net = entry.get("net") or 0
+                previous = self._net.get(project)
+                # Just started (again): the idle clock starts now, not at an earlier stop
+                if previous is None or net - previous > IDLE_NET_THRESHOLD:
+                    self.last_activity[project] = now
+            self._net = {project: entry.get("net") or 0 for project, entry in usage_by_project.items()}
+            # Stopped projects leave the stats stream
+            for project in list(self.last_activity):
+                if project not in usage_by_project:
+                    del self.last_activity[project]
+
+    def timeout_for(self, project):
+        return self.overrides.get(project, self.timeout_minutes)
+
+    def idle_projects(self, running, now=None):
+        now = time.time() if now is None else now
+        idle = []
+        with self._lock:
+            for project in running:
+                if project in self.pinned:
+                    continue
+                timeout = self.timeout_for(project)
+                if not timeout or timeout <= 0:
+                    continue
+                last = self.last_activity.setdefault(project, now)
+                if now - last >= timeout * 60:
+                    idle.append((project, now - last))
+        return idle
+
+def log_idle_action(project, action, idle_seconds, freed):
+    line = (
+        f"{time.strftime('%Y-%m-%d %H:%M:%S')} {action} {project} "
+        f"after {format_duration(idle_seconds)} idle, freed {format_bytes(freed)}\n"
+    )
+    try:
+        with open(IDLE_LOG_FILE, "a") as f:
+            f.write(line)
+    except OSError as e:
+        print(f"Error writing idle log: {e}")
+    return line
+
+def read_idle_log(lines=20):
+    try:
+        with open(IDLE_LOG_FILE, "r") as f:
+            return list(deque(f, maxlen=lines))
+    except OSError:
+        return []
+
+def load_project_snapshot(snapshot_file=SNAPSHOT_FILE):
+    # Last known list from the previous run, shown until `ddev list` answers
+    try:
+        with open(snapshot_file, "r") as f:
+            rows = json.load(f).get("projects", [])
+    except (json.JSONDecodeError, OSError, AttributeError):
+        return []
+    return [dict(row, stale=True) for row in rows if isinstance(row, dict) and "name" in row]
+
+def save_project_snapshot(projects, snapshot_file=SNAPSHOT_FILE):
+    rows = [
+        {key: proj.get(key) for key in ("name", "status", "resolved_path", "size", "db_size")}
+        for proj in projects
+    ]
+    tmp_path = f"{snapshot_file}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"saved": time.time(), "projects": rows}, f)
+        os.replace(tmp_path, snapshot_file)
+    except OSError as e:
+        print(f"Error saving project snapshot: {e}")
+
+def startup_mark(label):
+    STARTUP_MARKS.append((label, time.perf_counter()))
+
+def startup_report():
+    start = STARTUP_MARKS[0][1]
+    lines = ["Startup profile:"]
+    for (_, previous), (label, at) in zip(STARTUP_MARKS, STARTUP_MARKS[1:]):
+        lines.append(f"  {label:<20} {(at - start) * 1000:8.1f} ms  (+{(at - previous) * 1000:.1f} ms)")
+    return "\n".join(lines)
+
+class ProjectStatusWatcher:
+    def __init__(self, on_status, on_connect=None, event_source=docker_event_stream):
+        # event_source returns an iterable of docker event dicts, tests can pass a fake one
+        self.on_status = on_status
+        self.on_connect = on_connect
+        self.event_source = event_source
+        self.connected = False
+        self._stop = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        delay = 1
+        while not self._stop.is_set():
+            try:
+                events = self.event_source()
+                self.connected = True
+                # Anything may have changed while we were not listening
+                if self.on_connect:
+                    self.on_connect()
+                for event in events:
+                    if self._stop.is_set():
+                        break
+                    self.handle_event(event)
+                    delay = 1
+            except Exception as e:
+                print("Docker events stream failed:", e)
+            self.connected = False
+            self._stop.wait(delay)
+            delay = min(delay * 2, 60)
+
+    def handle_event(self, event):
+        action = event.get("Action") or event.get("status") or ""
+        status = EVENT_STATUS.get(action.split(":", 1)[0])
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        site = attributes.get("com.ddev.site-name")
+        if not status or not site:
+            return
+        service = attributes.get("com.docker.compose.service")
+        if service and service != "web":
+            return
+        self.on_status(site, status)
+
+class JobCancelled(Exception):
+    pass
+
+def kill_process_tree(proc, timeout=3):
+    if proc.poll() is not None:
+        return
+    try:
+        if platform.system() == "Windows":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                capture_output=True
+            )
+        else:
+            # Children share the session started for the ddev process
+            os.killpg(proc.pid, signal.SIGTERM)
+            try:
+                proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError) as e:
+        print(f"Error killing process {proc.pid}: {e}")
+        proc.kill()
+
+def run_command(args, cwd=None, job=None, check=False, input=None, capture=True, feed=None, stdout_sink=None):
+    # Without capture the output only goes to the job's ring buffer, memory stays flat
+    if job is not None and job.cancel_requested:
+        raise JobCancelled()
+
+    popen_kwargs = {}
+    if platform.system() == "Windows":
+        popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        popen_kwargs["start_new_session"] = True
+
+    started = time.perf_counter()
+    output_bytes = 0
+    proc = subprocess.Popen(
+        args,
+        cwd=cwd,
+        stdin=subprocess.PIPE if input is not None or feed is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+        errors="replace",
+        text=True,
+        **popen_kwargs
+    )
+    if job is not None:
+        job.attach(proc)
+    try:
+        if job is None:
+            stdout, stderr = proc.communicate(input)
+            output_bytes = len(stdout or "") + len(stderr or "")
+        else:
+            stdout, stderr, output_bytes = _stream_output(proc, job, input, capture, feed, stdout_sink)
+    except BaseException:
+        kill_process_tree(proc)
+        raise
+    finally:
+        if job is not None:
+            job.detach(proc)
+        tracer.record(
+            args, time.perf_counter() - started, proc.poll(), output_bytes,
+            project=job.project if job is not None else None, cwd=cwd,
+            cancelled=job is not None and job.cancel_requested
+        )
+
+    if job is not None and job.cancel_requested:
+        raise JobCancelled()
+    result = subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+    if check:
+        result.check_returncode()
+    return result
+
+def _stream_output(proc, job, input, capture, feed=None, stdout_sink=None):
+    stdout_lines = [] if capture else None
+    stderr_lines = [] if capture else deque(maxlen=STDERR_TAIL_LINES)
+    sizes = {"stdout": 0, "stderr": 0}
+
+    def pump(stream, name, sink):
+        for line in stream:
+            sizes[name] += len(line)
+            job.log(line.rstrip("\n"), name)
+            if sink is not None:
+                sink.append(line)
+        stream.close()
+
+    def pump_binary(stream):
+        # stdout_sink gets raw bytes, e.g. a dump on its way into a compressor
+        while True:
+            chunk = stream.read(IMPORT_CHUNK_SIZE)
+            if not chunk:
+                break
+            sizes["stdout"] += len(chunk)
+            stdout_sink(chunk)
+        stream.close()
+
+    if stdout_sink is not None:
+        stdout_reader = threading.Thread(target=pump_binary, args=(proc.stdout.buffer,), daemon=True)
+    else:
+        stdout_reader = threading.Thread(target=pump, args=(proc.stdout, "stdout", stdout_lines), daemon=True)
+    readers = [
+        stdout_reader,
+        threading.Thread(target=pump, args=(proc.stderr, "stderr", stderr_lines), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        if feed is not None:
+            # feed writes raw bytes, e.g. a decompressed dump, straight into the child
+            feed(proc.stdin.buffer)
+        elif input is not None:
+            proc.stdin.write(input)
+    except BrokenPipeError:
+        pass
+    finally:
+        if proc.stdin:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+    proc.wait()
+    for reader in readers:
+        reader.join()
+
+    stdout = "".join(stdout_lines) if stdout_lines is not None else None
+    return stdout, "".join(stderr_lines), sizes["stdout"] + sizes["stderr"]
+
+class Job:
+    def __init__(self, job_id, project, title, fn, on_done=None):
+        self.id = job_id
+        self.project = project
+        self.title = title
+        self.fn = fn
+        self.on_done = on_done
+        self.state = "queued"  # queued → running → done / failed / cancelled
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.cancel_requested = False
+        self.watched_until = 0  # set while a daemon client still waits for the outcome
+        self.progress = ""
+        self.output = deque(maxlen=JOB_OUTPUT_LINES)
+        self.output_seq = 0
+        self._procs = set()
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def run(self, args, cwd=None, check=False, input=None, capture=False, feed=None, stdout_sink=None):
+        self.log("$ " + " ".join(map(str, args)), "cmd")
+        return run_command(
+            args, cwd=cwd, job=self, check=check, input=input,
+            capture=capture, feed=feed, stdout_sink=stdout_sink
+        )
+
+    def shell(self, project_path, command, check=False):
+        self.log("$ [shell] " + command.strip(), "cmd")
+        return shell_pool.run(project_path, command, job=self, check=check)
+
+    def log(self, line, stream="stdout"):
+        with self._lock:
+            self.output_seq += 1
+            self.output.append((self.output_seq, stream, line))
+
+    def output_since(self, seq):
+        with self._lock:
+            lines = [entry for entry in self.output if entry[0] > seq]
+            last = self.output_seq
+        skipped = (lines[0][0] - seq - 1) if lines else 0
+        return lines, skipped, last
+
+    def attach(self, proc):
+        with self._lock:
+            self._procs.add(proc)
+            cancelled = self.cancel_requested
+        if cancelled:
+            kill_process_tree(proc)
+
+    def detach(self, proc):
+        with self._lock:
+            self._procs.discard(proc)
+
+    def cancel(self):
+        with self._lock:
+            self.cancel_requested = True
+            procs = list(self._procs)
+        for proc in procs:
+            kill_process_tree(proc)
+
+    def check_cancelled(self):
+        if self.cancel_requested:
+            raise JobCancelled()
+
+class JobExecutor:
+    def __init__(self, max_workers=MAX_PARALLEL_JOBS):
+        self.max_workers = max_workers
+        self.jobs = []
+        self._queues = {}     # project → queued jobs, a project runs one job at a time
+        self._busy = set()
+        self._running = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, project, title, fn, on_done=None):
+        job = Job(next(self._ids), project, title, fn, on_done)
+        with self._lock:
+            self.jobs.append(job)
+            self._queues.setdefault(project, deque()).append(job)
+            self._trim_history()
+        self._dispatch()
+        return job
+
+    def set_max_workers(self, max_workers):
+        with self._lock:
+            self.max_workers = max_workers
+        self._dispatch()
+
+    def cancel(self, job):
+        with self._lock:
+            queued = job.state == "queued"
+            if queued:
+                self._queues.get(job.project, deque()).remove(job)
+                job.cancel_requested = True
+                job.state = "cancelled"
+                job.finished = time.time()
+        if queued:
+            if job.on_done:
+                job.on_done(job)
+        else:
+            job.cancel()
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.jobs)
+
+    def _trim_history(self):
+        now = time.time()
+        finished = [j for j in self.jobs if j.finished is not None and j.watched_until < now]
+        for job in finished[:max(0, len(self.jobs) - JOB_HISTORY)]:
+            self.jobs.remove(job)
+
+    def _next_runnable(self):
+        heads = [
+            queue[0] for project, queue in self._queues.items()
+            if queue and (project is None or project not in self._busy)
+        ]
+        if not heads:
+            return None
+        job = min(heads, key=lambda j: j.id)
+        self._queues[job.project].popleft()
+        return job
+
+    def _dispatch(self):
+        to_start = []
+        with self._lock:
+            while self._running < self.max_workers:
+                job = self._next_runnable()
+                if job is None:
+                    break
+                self._running += 1
+                if job.project is not None:
+                    self._busy.add(job.project)
+                job.state = "running"
+                job.started = time.time()
+                to_start.append(job)
+        for job in to_start:
+            threading.Thread(target=self._run_job, args=(job,), daemon=True).start()
+
+    def _run_job(self, job):
+        try:
+            job.check_cancelled()
+            job.result = job.fn(job)
+            job.state = "done"
+        except JobCancelled:
+            job.state = "cancelled"
+        except Exception as e:
+            job.error = e
+            job.state = "failed"
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self._running -= 1
+                self._busy.discard(job.project)
+            if job.on_done:
+                try:
+                    job.on_done(job)
+                except Exception as e:
+                    print(f"Error in job callback for {job.title}: {e}")
+            self._dispatch()
+
+def format_job_error(job):
+    e = job.error
+    if isinstance(e, subprocess.CalledProcessError):
+        detail = (e.stderr or e.stdout or "").strip()
+        return f"{' '.join(map(str, e.cmd))} failed with exit code {e.returncode}\n{detail}".strip()
+    return str(e)
+
+class ShellSession:
+    # One long-lived `ddev exec bash` per project; commands are framed by a sentinel line
+    _counter = itertools.count(1)
+
+    def __init__(self, project_path):
+        self.project_path = Path(project_path)
+        self.sentinel = f"__DDEVGUI_{os.getpid()}_{next(ShellSession._counter)}__"
+        self.lock = threading.Lock()
+        self.lines = {"stdout": queue.Queue(), "stderr": queue.Queue()}
+        popen_kwargs = {}
+        if platform.system() == "Windows":
+            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            popen_kwargs["start_new_session"] = True
+        self.proc = subprocess.Popen(
+            [DDEV_COMMAND, "exec", "bash"],
+            cwd=self.project_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="replace",
+            text=True,
+            **popen_kwargs
+        )
+        for name in ("stdout", "stderr"):
+            threading.Thread(
+                target=self._pump, args=(getattr(self.proc, name), self.lines[name]), daemon=True
+            ).start()
+
+    @staticmethod
+    def _pump(stream, lines):
+        for line in stream:
+            lines.put(line)
+        lines.put(None)
+        stream.close()
+
+    @property
+    def alive(self):
+        return self.proc.poll() is None
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        kill_process_tree(self.proc)
+
+    def run(self, command, job=None, check=False):
+        with self.lock:
+            if job is not None:
+                job.check_cancelled()
+                job.attach(self.proc)
+            started = time.perf_counter()
+            returncode, stdout, stderr = None, "", ""
+            try:
+                # Subshell so `exit` or `set -e` can't take the session down; stdin stays ours
+                # The sentinel starts on a fresh line even when the output lacks a trailing newline
+                self.proc.stdin.write(
+                    f"(\n{command}\n) </dev/null\n"
+                    f"printf '\\n%s %d\\n' '{self.sentinel}' \"$?\"\n"
+                    f"printf '\\n%s\\n' '{self.sentinel}' >&2\n"
+                )
+                self.proc.stdin.flush()
+                returncode, stdout = self._read_until_sentinel("stdout", job)
+                _, stderr = self._read_until_sentinel("stderr", job)
+            except (BrokenPipeError, OSError) as e:
+                # Also a read timeout; the pool replaces the closed session on next use
+                self.close()
+                if job is not None:
+                    job.check_cancelled()
+                raise RuntimeError(f"Shell session for {self.project_path.name} ended: {e}")
+            finally:
+                if job is not None:
+                    job.detach(self.proc)
+                tracer.record(
+                    [DDEV_COMMAND, "exec", command.strip()], time.perf_counter() - started,
+                    returncode, len(stdout) + len(stderr), project=self.project_path.name,
+                    cancelled=job is not None and job.cancel_requested
+                )
+
+        result = subprocess.CompletedProcess(command, returncode, stdout, stderr)
+        if check:
+            result.check_returncode()
+        return result
+
+    def _read_until_sentinel(self, name, job):
+        output = []
+        # Held back one line: the one before the sentinel ends with the newline printf added
+        pending = None
+        while True:
+            try:
+                line = self.lines[name].get(timeout=SHELL_READ_TIMEOUT)
+            except queue.Empty:
+                raise TimeoutError(f"no output for {SHELL_READ_TIMEOUT}s")
+            if line is None:
+                raise BrokenPipeError("session closed")
+            if line.startswith(self.sentinel):
+                if pending:
+                    pending = pending[:-1]
+                    output.append(pending)
+                    if pending and job is not None:
+                        job.log(pending.rstrip("\n"), name)
+                code = line[len(self.sentinel):].strip()
+                return (int(code) if code else 0), "".join(output)
+            if pending is not None:
+                output.append(pending)
+                if job is not None:
+                    job.log(pending.rstrip("\n"), name)
+            pending = line
+
+class ShellSessionPool:
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_path):
+        key = str(project_path)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None or not session.alive:
+                session = ShellSession(project_path)
+                self._sessions[key] = session
+            return session
+
+    def run(self, project_path, command, job=None, check=False):
+        return self.get(project_path).run(command, job=job, check=check)
+
+    def recycle(self, project_path):
+        with self._lock:
+            session = self._sessions.pop(str(project_path), None)
+        if session is not None:
+            session.close()
+
+    def close_all(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+shell_pool = ShellSessionPool()
+
+def parse_describe_output(stdout, stderr=""):
+    # ddev -j prints one JSON object per log line, the one carrying "raw" is the description
+    for line in ((stdout or "") + "\n" + (stderr or "")).splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(data.get("raw"), dict):
+            return data["raw"]
+    data = json.loads((stdout or "") + "\n" + (stderr or ""))
+    return data.get("raw") or {}
+
+def describe_service_url(raw, service):
+    if service == "mailpit":
+        url = raw.get("mailpit_https_url") or raw.get("mailpit_url")
+        if url:
+            return url
+    info = (raw.get("services") or {}).get(service) or {}
+    for key in ("https_url", "http_url", "host_https_url", "host_http_url"):
+        if info.get(key):
+            return info[key]
+    return None
+
+class DescribeCache:
+    # `ddev describe -j` per project; entries expire after the TTL or when config.yaml changes
+    def __init__(self, ttl=DESCRIBE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._queued = set()
+        self._wakeup = threading.Event()
+        self._worker = None
+        self.on_update = None
+        # Optional project_path → describe data (e.g. from the daemon), None falls back to ddev
+        self.loader = None
+
+    @staticmethod
+    def _config_mtime(project_path):
+        try:
+            return (Path(project_path) / ".ddev" / "config.yaml").stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def peek(self, project_path):
+        with self._lock:
+            entry = self._entries.get(str(project_path))
+        return entry[2] if entry else None
+
+    def is_fresh(self, project_path):
+        with self._lock:
+            entry = self._entries.get(str(project_path))
+        if not entry:
+            return False
+        fetched, config_mtime, _raw = entry
+        return time.time() - fetched < self.ttl and config_mtime == self._config_mtime(project_path)
+
+    def get(self, project_path, job=None):
+        if self.is_fresh(project_path):
+            return self.peek(project_path)
+        return self.fetch(project_path, job)
+
+    def fetch(self, project_path, job=None):
+        config_mtime = self._config_mtime(project_path)
+        raw = self.loader(project_path) if self.loader else None
+        if raw is None:
+            args = [DDEV_COMMAND, "describe", "-j"]
+            if job is not None:
+                result = job.run(args, cwd=str(project_path), check=True, capture=True)
+            else:
+                result = run_command(args, cwd=str(project_path), check=True)
+            raw = parse_describe_output(result.stdout, result.stderr)
+        self.store(project_path, raw, config_mtime)
+        return raw
+
+    def store(self, project_path, raw, config_mtime=None):
+        if config_mtime is None:
+            config_mtime = self._config_mtime(project_path)
+        with self._lock:
+            self._entries[str(project_path)] = (time.time(), config_mtime, raw)
+        if self.on_update:
+            self.on_update(project_path, raw)
+
+    def invalidate(self, project_path):
+        with self._lock:
+            self._entries.pop(str(project_path), None)
+
+    def prefetch(self, project_paths):
+        with self._lock:
+            for project_path in project_paths:
+                key = str(project_path)
+                if key not in self._queued:
+                    self._queued.add(key)
+                    self._pending.append(project_path)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._prefetch_loop, daemon=True)
+                self._worker.start()
+        self._wakeup.set()
+
+    def _prefetch_loop(self):
+        while True:
+            with self._lock:
+                project_path = self._pending.popleft() if self._pending else None
+            if project_path is None:
+                self._wakeup.wait(self.ttl)
+                self._wakeup.clear()
+                continue
+            try:
+                if not self.is_fresh(project_path):
+                    self.fetch(project_path)
+            except Exception as e:
+                print(f"ddev describe failed for {project_path}: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(str(project_path))
+
+describe_cache = DescribeCache()
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+def open_dump(path):
+    # Returns the decompressed stream and the raw file, whose position drives progress
+    import gzip
+    import zipfile
+    raw = open(path, "rb")
+    magic = raw.read(4)
+    raw.seek(0)
+    try:
+        if magic[:2] == b"\x1f\x8b":
+            return gzip.GzipFile(fileobj=raw, mode="rb"), raw
+        if magic == b"PK\x03\x04":
+            archive = zipfile.ZipFile(raw)
+            members = [m for m in archive.infolist() if not m.is_dir()]
+            sql_members = [m for m in members if m.filename.lower().endswith(".sql")]
+            if not members:
+                raise ValueError(f"{path} contains no files")
+            return archive.open((sql_members or members)[0]), raw
+        if magic == b"\x28\xb5\x2f\xfd":
+            try:
+                import zstandard
+            except ImportError:
+                raise RuntimeError("Importing .zst dumps needs the zstandard package (pip install zstandard)")
+            return zstandard.ZstdDecompressor().stream_reader(raw), raw
+        return raw, raw
+    except Exception:
+        raw.close()
+        raise
+
+class TransferProgress:
+    def __init__(self, job, total, label):
+        self.job = job
+        self.total = total
+        self.label = label
+        self.started = time.time()
+        self._last_update = 0
+        self._last_log = 0
+
+    def update(self, done, force=False):
+        now = time.time()
+        if not force and now - self._last_update < PROGRESS_INTERVAL:
+            return
+        self._last_update = now
+        elapsed = max(now - self.started, 0.001)
+        rate = done / elapsed
+        text = f"{self.label} {format_bytes(done)}"
+        if self.total:
+            percent = min(100.0, done * 100.0 / self.total)
+            eta = (self.total - done) / rate if rate else 0
+            text += f" / {format_bytes(self.total)} ({percent:.0f}%), {format_bytes(rate)}/s, ETA {format_duration(eta)}"
+        else:
+            text += f", {format_bytes(rate)}/s"
+        self.job.progress = text
+        if force or now - self._last_log >= 5:
+            self._last_log = now
+            self.job.log(text, "cmd")
+
+def import_database(job, project_path, dump_path, speedups=True):
+    db_type, _version = ProjectConfig.load(project_path).database
+    if db_type == "postgres":
+        # The pipeline below talks to the MySQL client, leave postgres to ddev
+        return job.run([DDEV_COMMAND, "import-db", "--file", dump_path], cwd=project_path, check=True)
+
+    mysql = [DDEV_COMMAND, "mysql", "-uroot", "-proot"]
+    previous_flush = None
+    if speedups:
+        result = job.run(
+            mysql + ["-N", "-e", "SELECT @@GLOBAL.innodb_flush_log_at_trx_commit"],
+            cwd=project_path, check=True, capture=True
+        )
+        previous_flush = result.stdout.strip() or "1"
+        job.run(mysql + ["-e", "SET GLOBAL innodb_flush_log_at_trx_commit = 2"], cwd=project_path, check=True)
+
+    # Same semantics as ddev import-db: start from an empty db database
+    preamble = "DROP DATABASE IF EXISTS db;\nCREATE DATABASE db;\nUSE db;\n"
+    postamble = "\n"
+    if speedups:
+        preamble += "SET FOREIGN_KEY_CHECKS = 0;\nSET UNIQUE_CHECKS = 0;\nSET autocommit = 0;\n"
+        postamble += "COMMIT;\nSET FOREIGN_KEY_CHECKS = 1;\nSET UNIQUE_CHECKS = 1;\nSET autocommit = 1;\n"
+
+    progress = TransferProgress(job, os.path.getsize(dump_path), "Imported")
+
+    def feed(stdin):
+        stream, raw = open_dump(dump_path)
+        try:
+            stdin.write(preamble.encode())
+            while True:
+                job.check_cancelled()
+                chunk = stream.read(IMPORT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                stdin.write(chunk)
+                progress.update(raw.tell())
+            stdin.write(postamble.encode())
+            stdin.flush()
+            progress.update(progress.total, force=True)
+        finally:
+            stream.close()
+            raw.close()
+
+    try:
+        return job.run(mysql, cwd=project_path, check=True, feed=feed)
+    finally:
+        if previous_flush is not None:
+            # Not through the job, it must still run after a cancel or a failed import
+            run_command(
+                mysql + ["-e", f"SET GLOBAL innodb_flush_log_at_trx_commit = {int(previous_flush)}"],
+                cwd=project_path
+            )
+
+def zstd_available():
+    import importlib.util
+    return importlib.util.find_spec("zstandard") is not None
+
+def open_compressed_writer(path, fmt, level):
+    import gzip
+    raw = open(path, "wb")
+    if fmt == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=level), raw
+    if fmt == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=level).stream_writer(raw), raw
+    return raw, raw
+
+def export_database(job, project_path, output_path, fmt="gzip", level=6, parallel=4, skip_transient=False):
+    import shlex
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+    config = ProjectConfig.load(project_path)
+    db_type, _version = config.database
+    if db_type == "postgres":
+        return job.run([DDEV_COMMAND, "export-db", "--file", output_path], cwd=project_path, check=True)
+
+    mysql = [DDEV_COMMAND, "mysql", "-uroot", "-proot", "-N", "-B", "-e"]
+    result = job.run(
+        mysql + ["SELECT table_name, table_type, COALESCE(data_length + index_length, 0) "
+                 "FROM information_schema.tables WHERE table_schema = 'db'"],
+        cwd=project_path, check=True, capture=True
+    )
+    tables, views = [], []
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 3:
+            continue
+        name, table_type, size = parts
+        if table_type == "VIEW":
+            views.append(name)
+        else:
+            tables.append((name, int(size or 0)))
+
+    prefix = None
+    if skip_transient:
+        docroot = config.docroot
+        prefix = extract_table_prefix(project_path / docroot / "wp-config.php", docroot, project_path, job)
+
+    # Each part is its own --single-transaction, so the tables don't share one snapshot
+    mysqldump = [DDEV_COMMAND, "exec", "-s", "db", "mysqldump", "-uroot", "-proot",
+                 "--single-transaction", "--quick", "--skip-lock-tables", "--no-tablespaces"]
+    parts_dir = Path(f"{output_path}.parts")
+    parts_dir.mkdir(parents=True, exist_ok=True)
+
+    total_size = sum(size for _name, size in tables)
+    state = {"tables": 0, "raw": 0, "written": 0}
+    state_lock = threading.Lock()
+
+    def table_args(name):
+        if prefix is None:
+            return ["db", name]
+        bare = name[len(prefix):] if name.startswith(prefix) else name
+        if bare == "options":
+            return ["--where=option_name NOT LIKE '\\_transient\\_%' "
+                    "AND option_name NOT LIKE '\\_site\\_transient\\_%'", "db", name]
+        if TRANSIENT_TABLE_RE.search(bare):
+            return ["--no-data", "db", name]
+        return ["db", name]
+
+    def dump_part(index, label, args):
+        part_path = parts_dir / f"{index:05d}.part"
+        started = time.time()
+        counted = {"raw": 0}
+        writer, raw = open_compressed_writer(part_path, fmt, level)
+
+        def sink(chunk):
+            writer.write(chunk)
+            counted["raw"] += len(chunk)
+
+        try:
+            # `ddev exec` joins its arguments into a shell command; table names come from the database
+            job.run(mysqldump + [shlex.quote(arg) for arg in args], cwd=project_path, check=True, stdout_sink=sink)
+        finally:
+            writer.close()
+            raw.close()
+        written = part_path.stat().st_size
+        with state_lock:
+            state["tables"] += 1
+            state["raw"] += counted["raw"]
+            state["written"] += written
+            job.progress = (
+                f"{state['tables']}/{len(tables) + 1} parts, "
+                f"{format_bytes(state['raw'])} dumped → {format_bytes(state['written'])}"
+                + (f" of ~{format_bytes(total_size)}" if total_size else "")
+            )
+        job.log(
+            f"{label}: {format_bytes(counted['raw'])} → {format_bytes(written)} in {time.time() - started:.1f}s",
+            "cmd"
+        )
+        return part_path
+
+    # Biggest tables first so the long ones overlap with the rest
+    ordered = sorted(enumerate(tables), key=lambda item: -item[1][1])
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+            futures = [
+                pool.submit(dump_part, index, name, table_args(name))
+                for index, (name, _size) in ordered
+            ]
+            # Views, routines and events go last, once every table exists
+            tail = ["--no-data", "--routines", "--events", "--skip-triggers", "db"] + views
+            if not views:
+                tail = ["--no-create-info", "--no-data", "--routines", "--events", "--skip-triggers", "db"]
+            futures.append(pool.submit(dump_part, len(tables), "views/routines", tail))
+            for future in futures:
+                future.result()
+
+        # gzip members and zstd frames stay valid when concatenated
+        with open(output_path, "wb") as out:
+            for part_path in sorted(parts_dir.glob("*.part")):
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, out, IMPORT_CHUNK_SIZE)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+    return output_path
+
+WP_ADMIN_PASSWORD_HASH = "$P$Bk60b9sSLvYMTmfLn0njbnRavY8.6U0"
+
+def reset_wp_admins(job, project_path):
+    docroot = ProjectConfig.load(project_path).docroot
+    prefix = extract_table_prefix(project_path / docroot / "wp-config.php", docroot, project_path, job)
+    if not re.fullmatch(r"\w*", prefix):
+        raise ValueError(f"Refusing unusual table prefix: {prefix!r}")
+
+    admins = (
+        f"SELECT user_id FROM {prefix}usermeta "
+        f"WHERE meta_key = '{prefix}capabilities' AND meta_value LIKE '%administrator%'"
+    )
+    # One round trip: lock and list the admins, then rename them all in ID order
+    sql = (
+        "START TRANSACTION;\n"
+        f"SELECT ID, user_login FROM {prefix}users WHERE ID IN ({admins}) ORDER BY ID FOR UPDATE;\n"
+        "SET @ddevgui_n := -1;\n"
+        f"UPDATE {prefix}users SET "
+        "user_login = IF((@ddevgui_n := @ddevgui_n + 1) = 0, 'admin', CONCAT('admin', @ddevgui_n)), "
+        f"user_pass = '{WP_ADMIN_PASSWORD_HASH}' "
+        f"WHERE ID IN ({admins}) ORDER BY ID;\n"
+        "COMMIT;\n"
+    )
+    result = job.run(
+        [DDEV_COMMAND, "mysql", "-uroot", "-proot", "-N", "-B"],
+        cwd=project_path, check=True, capture=True, input=sql
+    )
+
+    changes = []
+    for line in result.stdout.splitlines():
+        uid, _, old_login = line.partition("\t")
+        if uid.strip().isdigit():
+            new_login = "admin" if not changes else f"admin{len(changes)}"
+            changes.append((int(uid), old_login, new_login))
+    for uid, old_login, new_login in changes:
+        job.log(f"User {uid}: {old_login} → {new_login}", "cmd")
+    return changes
+
+class ProvisionStep:
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+
+class Provisioner:
+    # Runs steps as soon as their deps are done; finished steps are remembered for a rerun
+    def __init__(self, job, project_path, steps, max_workers=PROVISION_PARALLEL):
+        self.job = job
+        self.project_path = Path(project_path)
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max_workers
+        self.state_file = self.project_path / PROVISION_STATE_FILE
+        self.timings = {}
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, "r") as f:
+                return json.load(f).get("done", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, done):
+        try:
+            with open(self.state_file, "w") as f:
+                json.dump({"done": done}, f, indent=2)
+        except OSError as e:
+            print(f"Error saving provisioning state: {e}")
+
+    def _report(self, done, running):
+        self.job.progress = f"{len(done)}/{len(self.steps)} steps" + (
+            f", running {', '.join(sorted(running))}" if running else ""
+        )
+
+    def _run_step(self, step):
+        self.job.check_cancelled()
+        self.job.log(f"▶ {step.name}", "cmd")
+        started = time.time()
+        step.fn(self.job)
+        return time.time() - started
+
+    def run(self):
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        done = {name: t for name, t in self._load_state().items() if name in self.steps}
+        for name in done:
+            self.job.log(f"✓ {name} (done in an earlier run)", "cmd")
+        running = {}
+        failure = None
+        self.project_path.mkdir(parents=True, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                if failure is None:
+                    for step in self.steps.values():
+                        if step.name in done or step.name in running.values():
+                            continue
+                        if all(dep in done for dep in step.deps):
+                            running[pool.submit(self._run_step, step)] = step.name
+                self._report(done, running.values())
+                if not running:
+                    break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        elapsed = future.result()
+                    except BaseException as e:
+                        self.job.log(f"✗ {name}: {e}", "stderr")
+                        failure = failure or e
+                        continue
+                    done[name] = round(elapsed, 2)
+                    self.timings[name] = elapsed
+                    self.job.log(f"✓ {name} in {elapsed:.1f}s", "cmd")
+                    self._save_state(done)
+
+        if failure is not None:
+            raise failure
+        if len(done) < len(self.steps):
+            raise RuntimeError("Unsatisfiable step dependencies: " + ", ".join(sorted(set(self.steps) - set(done))))
+        try:
+            self.state_file.unlink()
+        except OSError:
+            pass
+        return self.timings
+
+def fetch_json(url):
+    import urllib.request
+    request = urllib.request.Request(url, headers={"User-Agent": "ddevgui"})
+    with urllib.request.urlopen(request, timeout=15) as response:
+        return json.load(response)
+
+def fetch_text(url):
+    import urllib.request
+    request = urllib.request.Request(url, headers={"User-Agent": "ddevgui"})
+    with urllib.request.urlopen(request, timeout=15) as response:
+        return response.read().decode("utf-8", "replace")
+
+class ArtifactCache:
+    # Downloads stored once by sha256 under objects/, index.json maps name@version to them.
+    # checksums.json keeps the sha256 first seen for each name@version, it outlives eviction
+    def __init__(self, root=ARTIFACT_CACHE_DIR, limit=ARTIFACT_CACHE_LIMIT):
+        self.root = Path(root)
+        self.limit = limit
+        self.index_file = self.root / "index.json"
+        self.checksums_file = self.root / "checksums.json"
+        self._last_used = {}  # LRU bumps from cache hits, written with the next store
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        try:
+            with open(self.index_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index, index_file=None):
+        import tempfile
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".json", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, index_file or self.index_file)
+
+    def _load_checksums(self):
+        try:
+            with open(self.checksums_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _object_path(self, entry):
+        return self.root / "objects" / entry["sha256"][:2] / (entry["sha256"] + entry.get("ext", ""))
+
+    def lookup(self, name, version=None):
+        with self._lock:
+            index = self._load_index()
+            if version is not None:
+                candidates = [(key, index[key]) for key in [f"{name}@{version}"] if key in index]
+            else:
+                # Offline: newest download we have for this name
+                candidates = sorted(
+                    ((key, entry) for key, entry in index.items() if entry.get("name") == name),
+                    key=lambda item: item[1].get("added", 0), reverse=True
+                )
+            for key, entry in candidates:
+                path = self._object_path(entry)
+                if path.is_file():
+                    self._last_used[key] = time.time()
+                    return path
+        return None
+
+    def fetch(self, name, resolve, job=None, ext=""):
+        try:
+            version, url, checksum = resolve()
+        except JobCancelled:
+            raise
+        except Exception as e:
+            path = self.lookup(name)
+            if path is None:
+                raise
+            if job is not None:
+                job.log(f"{name}: offline ({e}), using cached {path.name}", "cmd")
+            return path
+
+        path = self.lookup(name, version)
+        if path is not None:
+            if job is not None:
+                job.log(f"{name}@{version}: from cache", "cmd")
+            return path
+        return self._download(name, version, url, checksum, job, ext)
+
+    def _download(self, name, version, url, checksum, job, ext):
+        # checksum is (algorithm, hex digest) when the source publishes one; otherwise the sha256
+        # recorded on the first download of this name@version is checked
+        import hashlib
+        import tempfile
+        import urllib.request
+        key = f"{name}@{version}"
+        if checksum is None:
+            with self._lock:
+                pinned = self._load_checksums().get(key)
+            checksum = ("sha256", pinned) if pinned else None
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        published = hashlib.new(checksum[0]) if checksum else None
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=self.root)
+        try:
+            request = urllib.request.Request(url, headers={"User-Agent": "ddevgui"})
+            with os.fdopen(fd, "wb") as out, urllib.request.urlopen(request, timeout=30) as response:
+                total = int(response.headers.get("Content-Length") or 0)
+                progress = TransferProgress(job, total, f"Downloading {name}") if job else None
+                while True:
+                    if job is not None:
+                        job.check_cancelled()
+                    chunk = response.read(IMPORT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    digest.update(chunk)
+                    if published is not None:
+                        published.update(chunk)
+                    size += len(chunk)
+                    if progress:
+                        progress.update(size)
+            sha256 = digest.hexdigest()
+            if published is not None and published.hexdigest() != checksum[1].lower():
+                raise ValueError(f"{checksum[0]} checksum mismatch for {key} from {url}")
+            entry = {
+                "name": name, "version": version, "sha256": sha256, "size": size,
+                "ext": ext, "source": url, "added": time.time(), "last_used": time.time(),
+            }
+            path = self._object_path(entry)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            index = self._load_index()
+            for used_key, used in self._last_used.items():
+                if used_key in index:
+                    index[used_key]["last_used"] = max(index[used_key].get("last_used", 0), used)
+            self._last_used.clear()
+            index[key] = entry
+            self._evict(index, keep=sha256)
+            self._save_index(index)
+            checksums = self._load_checksums()
+            if key not in checksums:
+                checksums[key] = sha256
+                self._save_index(checksums, self.checksums_file)
+        return path
+
+    def _evict(self, index, keep):
+        # Least recently used first; objects shared by several keys count once
+        objects = {}
+        for key, entry in index.items():
+            obj = objects.setdefault(entry["sha256"], {"size": entry["size"], "last_used": 0, "keys": []})
+            obj["last_used"] = max(obj["last_used"], entry.get("last_used", 0))
+            obj["keys"].append(key)
+        total = sum(obj["size"] for obj in objects.values())
+        for sha256, obj in sorted(objects.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.limit:
+                break
+            if sha256 == keep:
+                continue
+            path = self._object_path(index[obj["keys"][0]])
+            for key in obj["keys"]:
+                del index[key]
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            total -= obj["size"]
+
+artifact_cache = ArtifactCache()
+
+def wordpress_core_artifact(job=None):
+    def resolve():
+        offer = fetch_json(WP_VERSION_API)["offers"][0]
+        # Published next to every release zip
+        sha1 = fetch_text(offer["download"] + ".sha1").split()[0]
+        return offer["version"], offer["download"], ("sha1", sha1)
+    return artifact_cache.fetch("wordpress", resolve, job, ext=".zip")
+
+def wordpress_plugin_artifact(slug, job=None):
+    def resolve():
+        info = fetch_json(WP_PLUGIN_API.format(slug=slug))
+        return info["version"], info["download_link"], None
+    return artifact_cache.fetch(f"plugin:{slug}", resolve, job, ext=".zip")
+
+def addon_artifact(repo, job=None):
+    def resolve():
+        release = fetch_json(GITHUB_RELEASE_API.format(repo=repo))
+        return release["tag_name"], release["tarball_url"], None
+    return artifact_cache.fetch(f"addon:{repo}", resolve, job, ext=".tar.gz")
+
+def extract_zip(archive_path, destination):
+    # WordPress and plugin zips keep everything under one top-level folder
+    import shutil
+    import zipfile
+    with zipfile.ZipFile(archive_path) as zf:
+        for member in zf.infolist():
+            name = member.filename.replace("\\", "/")
+            if name.startswith("/") or ":" in name.split("/", 1)[0] or ".." in name.split("/"):
+                raise ValueError(f"Refusing unsafe path {member.filename!r} in {Path(archive_path).name}")
+            relative = name.split("/", 1)[1] if "/" in name else ""
+            if not relative or member.is_dir():
+                continue
+            target = Path(destination) / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(member) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+
+def download_wordpress_core(job, docroot_path):
+    extract_zip(wordpress_core_artifact(job), docroot_path)
+
+def install_wordpress_plugin(job, project_path, docroot, slug):
+    archive = wordpress_plugin_artifact(slug, job)
+    extract_zip(archive, Path(project_path) / docroot / "wp-content" / "plugins" / slug)
+
+def install_addon(job, project_path, repo):
+    try:
+        source = str(addon_artifact(repo, job))
+    except JobCancelled:
+        raise
+    except Exception as e:
+        job.log(f"Add-on cache unavailable ({e}), fetching {repo} directly", "stderr")
+        source = repo
+    job.run([DDEV_COMMAND, "add-on", "get", source], cwd=project_path, check=True)
+
+WP_DEBUG_CONFIG = [
+    "define('WP_DEBUG', true);\n",
+    "define('WP_DEBUG_LOG', true);\n",
+    "define('WP_REDIS_HOST', 'redis');\n",
+    "define('WP_REDIS_PORT', 6379);\n",
+    "define('WP_REDIS_TIMEOUT', 1);\n",
+    "define('WP_REDIS_READ_TIMEOUT', 1);\n",
+    "define('WP_REDIS_DATABASE', 0);\n"
+]
+
+PLACEHOLDER_PNG = (
+    b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMCAKbNPioAAAAASUVORK5CYII='
+)
+
+HTACCESS_RULES = (
+    "<IfModule mod_rewrite.c>\n"
+    "RewriteEngine On\n"
+    "RewriteCond %{REQUEST_FILENAME} !-f\n"
+    "RewriteRule \\.(jpe?g|png|gif|webp|bmp|svg|ico)$ /placeholder.png [L]\n"
+    "</IfModule>\n\n"
+    "# BEGIN WordPress\n\n"
+    "<IfModule mod_rewrite.c>\n"
+    "RewriteEngine On\n"
+    "RewriteRule .* - [E=HTTP_AUTHORIZATION:%{HTTP:Authorization}]\n"
+    "RewriteBase /\n"
+    "RewriteRule ^index\\.php$ - [L]\n"
+    "RewriteCond %{REQUEST_FILENAME} !-f\n"
+    "RewriteCond %{REQUEST_FILENAME} !-d\n"
+    "RewriteRule . /index.php [L]\n"
+    "</IfModule>\n\n"
+    "# END WordPress\n"
+)
+
+def wordpress_provision_steps(name, path, php_version, db_version, webserver_type):
+    web = path / "web"
+
+    def configure(job):
+        job.run([DDEV_COMMAND, "config", "--project-name", name, "--project-type", "wordpress", "--docroot", "web",
+                 "--php-version", php_version, "--database", db_version, "--webserver-type", webserver_type],
+                cwd=path, check=True)
+
+    def settings(job):
+        try:
+            ProjectConfig.load(path).update(disable_settings_management=True)
+        except FileNotFoundError:
+            pass
+        (path / "profiler").mkdir(parents=True, exist_ok=True)
+        php_config_dir = path / ".ddev" / "php"
+        php_config_dir.mkdir(parents=True, exist_ok=True)
+        with open(php_config_dir / "php.ini", "w") as f:
+            f.write(DEV_PHP_INI)
+
+    def adminer(job):
+        install_addon(job, path, "ddev/ddev-adminer")
+
+    def core(job):
+        # Unpacked on the host from the artifact cache, overlapping config and container start
+        try:
+            download_wordpress_core(job, web)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            job.log(f"Host download failed, will download inside the container: {e}", "stderr")
+
+    def start(job):
+        job.run([DDEV_COMMAND, "start"], cwd=path, check=True)
+
+    def install(job):
+        if not (web / "wp-includes").is_dir():
+            job.shell(path, "wp --path=web core download", check=True)
+        job.shell(
+            path,
+            f"wp --path=web core install --url=http://{name}.ddev.site --title='WordPress Site' "
+            "--admin_user=admin --admin_password=admin --admin_email=admin@example.com",
+            check=True
+        )
+
+    def wp_config(job):
+        wp_config_path = web / "wp-config.php"
+        with open(wp_config_path, "r") as f:
+            lines = f.readlines()
+        insert_index = next((i for i, line in enumerate(lines) if "/* That's all, stop editing!" in line), len(lines))
+        existing_content = "".join(lines)
+        to_insert = ["\n"] + [line for line in WP_DEBUG_CONFIG if line not in existing_content]
+        if len(to_insert) > 1:
+            lines[insert_index:insert_index] = to_insert
+            with open(wp_config_path, "w") as f:
+                f.writelines(lines)
+
+    def placeholder(job):
+        web.mkdir(parents=True, exist_ok=True)
+        with open(web / "placeholder.png", "wb") as img_file:
+            img_file.write(base64.b64decode(PLACEHOLDER_PNG))
+
+    def htaccess(job):
+        htaccess_path = web / ".htaccess"
+        original_contents = htaccess_path.read_text() if htaccess_path.exists() else ""
+        web.mkdir(parents=True, exist_ok=True)
+        with open(htaccess_path, "w") as f:
+            f.write(HTACCESS_RULES + original_contents)
+
+    return [
+        ProvisionStep("config", configure),
+        ProvisionStep("core download", core),
+        ProvisionStep("placeholder.png", placeholder),
+        ProvisionStep(".htaccess", htaccess),
+        ProvisionStep("settings", settings, ["config"]),
+        ProvisionStep("adminer add-on", adminer, ["config"]),
+        ProvisionStep("start", start, ["settings", "adminer add-on"]),
+        ProvisionStep("core install", install, ["start", "core download"]),
+        ProvisionStep("wp-config.php", wp_config, ["core install"]),
+    ]
+
+# Desired plugin state for "Prepare dev environment"
+DEV_PLUGIN_STATE = {
+    "absent": [
+        "wp-mail-smtp", "wp-mail-smtp-pro", "post-smtp", "easy-wp-smtp", "smtp-mailer", "gmail-smtp",
+        "sendinblue", "mailgun", "pepipost-smtp", "mailjet", "smtp-settings",
+        "akismet", "hello-dolly", "hello",
+    ],
+    "active": ["all-in-one-wp-migration"],
+}
+
+def plan_plugin_changes(current, desired):
+    # current: name → status from `wp plugin list`; must-use and drop-ins are left alone
+    managed = {name: status for name, status in current.items() if status in ("active", "inactive", "active-network")}
+    plan = {"deactivate": [], "delete": [], "install": [], "activate": []}
+    for name in desired.get("absent", []):
+        if name in managed:
+            if managed[name] != "inactive":
+                plan["deactivate"].append(name)
+            plan["delete"].append(name)
+    for name in desired.get("active", []):
+        if name not in managed:
+            plan["install"].append(name)
+        elif managed[name] == "inactive":
+            plan["activate"].append(name)
+    return plan
+
+def reconcile_plugins(job, project_path, docroot, desired=DEV_PLUGIN_STATE):
+    project_path = Path(project_path)
+    wp = f"wp --path={docroot}"
+    listing = job.shell(project_path, f"{wp} plugin list --format=json --fields=name,status", check=True)
+    current = {p["name"]: p["status"] for p in json.loads(listing.stdout.strip() or "[]")}
+    plan = plan_plugin_changes(current, desired)
+
+    # Unpack from the artifact cache on the host, only what that fails for goes through WP-CLI
+    to_activate = list(plan["activate"])
+    wp_install = []
+    for name in plan["install"]:
+        try:
+            install_wordpress_plugin(job, project_path, docroot, name)
+            to_activate.append(name)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            job.log(f"{name}: cache unavailable ({e}), WP-CLI will download it", "stderr")
+            wp_install.append(name)
+
+    commands = ["set -e"]
+    if plan["deactivate"]:
+        commands.append(f"{wp} plugin deactivate {' '.join(plan['deactivate'])}")
+    if plan["delete"]:
+        commands.append(f"{wp} plugin delete {' '.join(plan['delete'])}")
+    if wp_install:
+        commands.append(f"{wp} plugin install {' '.join(wp_install)} --activate")
+    if to_activate:
+        commands.append(f"{wp} plugin activate {' '.join(to_activate)}")
+    commands.append(f"{wp} rewrite flush --hard")
+    job.shell(project_path, "\n".join(commands), check=True)
+
+    report = []
+    for name in desired.get("absent", []):
+        if name in plan["delete"]:
+            report.append((name, "deactivated and deleted" if name in plan["deactivate"] else "deleted"))
+    for name in desired.get("active", []):
+        if name in plan["install"]:
+            report.append((name, "installed and activated"))
+        elif name in plan["activate"]:
+            report.append((name, "activated"))
+        else:
+            report.append((name, "already active"))
+    for name, action in report:
+        job.log(f"{name}: {action}", "cmd")
+    return report
+
+def trash_dir():
+    return Path(PROJECTS_DIR) / TRASH_DIR_NAME
+
+def move_to_trash(project_path):
+    # Same filesystem, so this is one atomic rename and the project vanishes at once
+    project_path = Path(project_path)
+    trash = trash_dir()
+    trash.mkdir(parents=True, exist_ok=True)
+    target = trash / f"{project_path.name}-{int(time.time() * 1000)}"
+    os.replace(project_path, target)
+    return target
+
+def _retry_fs(fn, path):
+    for attempt in range(DELETE_RETRIES):
+        try:
+            fn(path)
+            return
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            # Windows: read-only files, handles held by scanners or editors, folders still being emptied
+            retry = isinstance(e, PermissionError) or getattr(e, "winerror", None) in DELETE_RETRY_WINERRORS
+            if not retry or attempt == DELETE_RETRIES - 1:
+                raise
+            try:
+                os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+            except OSError:
+                pass
+            time.sleep(0.2 * (attempt + 1))
+
+def remove_tree(job, path, workers=DELETE_WORKERS):
+    from concurrent.futures import ThreadPoolExecutor
+    path = Path(path)
+    batches = []
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        job.check_cancelled()
+        if files:
+            batches.append([os.path.join(root, name) for name in files])
+            total += len(files)
+
+    state = {"removed": 0, "reported": 0}
+    state_lock = threading.Lock()
+
+    def unlink_batch(batch):
+        for file_path in batch:
+            job.check_cancelled()
+            _retry_fs(os.unlink, file_path)
+        with state_lock:
+            state["removed"] += len(batch)
+            now = time.time()
+            if now - state["reported"] >= PROGRESS_INTERVAL:
+                state["reported"] = now
+                job.progress = f"Deleted {state['removed']}/{total} files"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(unlink_batch, batches):
+            pass
+
+    for root, dirs, _files in os.walk(path, topdown=False):
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            _retry_fs(os.unlink if os.path.islink(dir_path) else os.rmdir, dir_path)
+    _retry_fs(os.rmdir, path)
+    job.progress = f"Deleted {total} files"
+    return total
+
+def purge_trashed_project(job, trashed_path):
+    trashed_path = Path(trashed_path)
+    if (trashed_path / ".ddev" / "config.yaml").is_file():
+        # Left over from an interrupted delete; by name, ddev still has it under its old folder
+        name = ProjectConfig.load(trashed_path).data.get("name") or trashed_path.name.rsplit("-", 1)[0]
+        job.run([DDEV_COMMAND, "delete", "-Oy", name])
+    return remove_tree(job, trashed_path)
+
+def clone_tree(source, destination):
+    # Reflinks (btrfs/xfs) or clonefile (APFS) share blocks until written, cp falls back to a plain copy
+    import shutil
+    source, destination = Path(source), Path(destination)
+    if platform.system() == "Linux":
+        args = ["cp", "-a", "--reflink=auto", str(source), str(destination)]
+    elif platform.system() == "Darwin":
+        args = ["cp", "-c", "-R", "-p", str(source), str(destination)]
+    else:
+        args = None
+    if args:
+        result = traced_run(args, capture_output=True, text=True)
+        if result.returncode == 0:
+            return
+        print(f"Clone copy failed, copying normally: {result.stderr.strip()}")
+        shutil.rmtree(destination, ignore_errors=True)
+    shutil.copytree(source, destination, symlinks=True)
+
+def templates_dir():
+    return Path(PROJECTS_DIR) / TEMPLATES_DIR_NAME
+
+def list_templates():
+    try:
+        return sorted(
+            entry.name for entry in templates_dir().iterdir()
+            if (entry / "template.json").is_file()
+        )
+    except OSError:
+        return []
+
+def save_template(job, project_path, template_name):
+    import shutil
+    project_path = Path(project_path)
+    config = ProjectConfig.load(project_path)
+    target = templates_dir() / template_name
+    staging = templates_dir() / f".{template_name}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    try:
+        job.run(
+            [DDEV_COMMAND, "export-db", "--gzip", "--file", str(staging / "db.sql.gz")],
+            cwd=project_path, check=True
+        )
+        job.log(f"Cloning {project_path} into the template", "cmd")
+        clone_tree(project_path, staging / "files")
+        for relative in TEMPLATE_EXCLUDES:
+            excluded = staging / "files" / relative
+            if excluded.is_dir():
+                shutil.rmtree(excluded, ignore_errors=True)
+            elif excluded.exists():
+                excluded.unlink()
+        with open(staging / "template.json", "w") as f:
+            json.dump({
+                "source": config.name or project_path.name,
+                "docroot": config.docroot,
+                "project_type": config.project_type,
+                "created": time.time(),
+            }, f, indent=2)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+def template_clone_steps(template_name, name, path):
+    import shutil
+    template = templates_dir() / template_name
+    with open(template / "template.json", "r") as f:
+        meta = json.load(f)
+    old_host = f"{meta['source']}.ddev.site"
+    new_host = f"{name}.ddev.site"
+
+    def clone(job):
+        # Clone next to the target and swap it in, a failed copy leaves nothing half-done
+        staging = path.parent / f".{name}.clone-tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        clone_tree(template / "files", staging)
+        if path.exists():
+            if any(path.iterdir()):
+                shutil.rmtree(staging, ignore_errors=True)
+                raise FileExistsError(f"{path} already exists and is not empty")
+            path.rmdir()
+        os.replace(staging, path)
+
+    def rename(job):
+        ProjectConfig.load(path).update(name=name)
+
+    def start(job):
+        job.run([DDEV_COMMAND, "start"], cwd=path, check=True)
+
+    def import_db(job):
+        import_database(job, path, str(template / "db.sql.gz"), speedups=True)
+
+    def replace_urls(job):
+        if meta.get("project_type") == "wordpress" and old_host != new_host:
+            job.shell(
+                path,
+                f"wp --path={meta.get('docroot') or 'web'} search-replace '{old_host}' '{new_host}' "
+                "--all-tables --skip-columns=guid",
+                check=True
+            )
+
+    return [
+        ProvisionStep("clone files", clone),
+        ProvisionStep("rename", rename, ["clone files"]),
+        ProvisionStep("start", start, ["rename"]),
+        ProvisionStep("import database", import_db, ["start"]),
+        ProvisionStep("replace URLs", replace_urls, ["import database"]),
+    ]
+
+def parse_docker_size(text):
+    match = re.match(r"^\s*([\d.]+)\s*([kKMGT]?i?B)\s*$", text or "")
+    if not match:
+        return 0
+    return int(float(match.group(1)) * DOCKER_SIZE_UNITS[match.group(2).upper()])
+
+def docker_volume_sizes():
+    result = run_command(
+        [DOCKER_COMMAND, "system", "df", "-v", "--format", "{{json .Volumes}}"], check=True
+    )
+    volumes = json.loads(result.stdout.strip() or "[]") or []
+    return {volume["Name"]: parse_docker_size(volume.get("Size")) for volume in volumes}
+
+class DiskUsageScanner:
+    # Per-directory [mtime, bytes of direct files, newest file mtime, listed at, subdirs]. Files growing in
+    # place don't touch the directory mtime, so files are restat'ed on every pass except in cold directories
+    # (unchanged mtime, no file modified for DISK_COLD_AGE), which are reused for up to DISK_COLD_RESCAN
+    def __init__(self, get_projects, on_update=None, cache_dir=DISK_USAGE_DIR, interval=DISK_SCAN_INTERVAL):
+        self.get_projects = get_projects
+        self.on_update = on_update
+        self.cache_dir = Path(cache_dir)
+        self.interval = interval
+        self.totals = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._load_totals()
+
+    def _load_totals(self):
+        try:
+            with open(self.cache_dir / "totals.json", "r") as f:
+                self.totals = json.load(f)
+        except (OSError, ValueError):
+            self.totals = {}
+
+    def _save_json(self, name, data):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_dir / f"{name}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_dir / name)
+        except OSError as e:
+            print(f"Error saving disk usage cache: {e}")
+
+    def sizes(self, name):
+        with self._lock:
+            entry = self.totals.get(name) or {}
+        return entry.get("size"), entry.get("db_size")
+
+    def start(self):
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def rescan(self):
+        self._wakeup.set()
+
+    def _loop(self):
+        while True:
+            try:
+                self.scan_all()
+            except Exception as e:
+                print(f"Disk usage scan failed: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def scan_all(self):
+        try:
+            volumes = docker_volume_sizes()
+        except Exception as e:
+            print(f"docker system df failed: {e}")
+            volumes = None
+        for name, path in sorted(self.get_projects().items()):
+            self.scan_project(name, Path(path), volumes)
+
+    def scan_project(self, name, path, volumes=None):
+        cache_name = re.sub(r"[^\w.-]", "_", name) + ".json"
+        try:
+            with open(self.cache_dir / cache_name, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        previous = self.totals.get(name) or {}
+        full = time.time() - previous.get("full_scan", 0) > DISK_FULL_RESCAN
+        dirs = {} if full else cached.get("dirs", {})
+        fresh = {}
+        size = self._scan_tree(path, dirs, fresh)
+
+        db_size = previous.get("db_size")
+        if volumes is not None:
+            try:
+                site = ProjectConfig.load(path).name or name
+            except Exception:
+                site = name
+            db_size = sum(
+                volume_size for volume_name, volume_size in volumes.items()
+                if volume_name in (f"{site}-mariadb", f"{site}-mysql", f"{site}-postgres")
+            )
+
+        entry = {
+            "size": size,
+            "db_size": db_size,
+            "scanned": time.time(),
+            "full_scan": time.time() if full else previous.get("full_scan", 0),
+        }
+        self._save_json(cache_name, {"dirs": fresh})
+        with self._lock:
+            self.totals[name] = entry
+            totals = dict(self.totals)
+        self._save_json("totals.json", totals)
+        if self.on_update and (previous.get("size"), previous.get("db_size")) != (size, db_size):
+            self.on_update(name, size, db_size)
+        return size
+
+    def _scan_tree(self, root, cached, fresh):
+        now = time.time()
+        total = 0
+        pending = [str(root)]
+        visited = 0
+        while pending:
+            directory = pending.pop()
+            visited += 1
+            if visited % 500 == 0:
+                # Stay out of the way of the refresh and job threads
+                time.sleep(0.01)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+                record = cached.get(directory)
+                if (record is not None and len(record) == 5 and record[0] == mtime
+                        and now - record[2] > DISK_COLD_AGE and now - record[3] < DISK_COLD_RESCAN):
+                    # Neither listed nor restat'ed; subdirectories still get their own check
+                    fresh[directory] = record
+                    pending.extend(record[4])
+                    total += record[1]
+                    continue
+                own, newest, subdirs = 0, 0, []
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            info = entry.stat(follow_symlinks=False)
+                            own += info.st_size
+                            newest = max(newest, info.st_mtime)
+            except OSError:
+                continue
+            pending.extend(subdirs)
+            fresh[directory] = [mtime, own, newest, now, subdirs]
+            total += own
+        return total
+
+class ProjectIndex:
+    def __init__(self, root_dir, index_file=INDEX_FILE):
+        self.root_dir = Path(root_dir)
+        self.index_file = index_file
+        self.dirs = {}       # every child folder → its mtime
+        self.projects = {}   # ddev project folder → resolved path and config mtime
+        self.loaded = False
+        self.on_change = None
+        self._lock = threading.RLock()
+
+    def load(self):
+        with self._lock:
+            try:
+                with open(self.index_file, "r") as f:
+                    data = json.load(f)
+                if data.get("root") == str(self.root_dir):
+                    self.dirs = data.get("dirs", {})
+                    self.projects = data.get("projects", {})
+            except (json.JSONDecodeError, IOError):
+                pass
+            # Only folders whose mtime moved since the last launch get rescanned
+            self.sync()
+            self.loaded = True
+
+    def ensure_loaded(self):
+        with self._lock:
+            if not self.loaded:
+                self.load()
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(entry) for name, entry in self.projects.items()}
+
+    def sync(self):
+        with self._lock:
+            seen = {}
+            try:
+                with os.scandir(self.root_dir) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir():
+                                seen[entry.name] = entry.stat().st_mtime
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Error scanning {self.root_dir}: {e}")
+                return False
+
+            changed = [name for name, mtime in seen.items() if self.dirs.get(name) != mtime]
+            changed += [name for name in self.dirs if name not in seen]
+            # Config edits do not touch the folder mtime
+            changed += [
+                name for name, entry in self.projects.items()
+                if name in seen and name not in changed
+                and self._config_mtime(name) != entry.get("config_mtime")
+            ]
+            self.dirs = seen
+            return self.apply_changes(changed)
+
+    def apply_changes(self, names):
+        with self._lock:
+            changed = False
+            for name in set(names):
+                changed = self._update_entry(name) or changed
+            if changed:
+                self.save()
+        if changed and self.on_change:
+            self.on_change()
+        return changed
+
+    def _update_entry(self, name):
+        d = self.root_dir / name
+        entry = None
+        # Dot folders hold ddevgui's own data (templates, trash), never projects
+        if not name.startswith(".") and (d / ".ddev").is_dir():
+            entry = {
+                "resolved_path": str(d.resolve()),
+                "config_mtime": self._config_mtime(name),
+            }
+        try:
+            self.dirs[name] = d.stat().st_mtime
+        except OSError:
+            self.dirs.pop(name, None)
+        if entry is None:
+            return self.projects.pop(name, None) is not None
+        if self.projects.get(name) == entry:
+            return False
+        self.projects[name] = entry
+        return True
+
+    def _config_mtime(self, name):
+        try:
+            return (self.root_dir / name / ".ddev" / "config.yaml").stat().st_mtime
+        except OSError:
+            return None
+
+    def save(self):
+        data = {"root": str(self.root_dir), "dirs": self.dirs, "projects": self.projects}
+        tmp_file = f"{self.index_file}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.index_file)
+        except IOError as e:
+            print(f"Error saving project index: {e}")
+
+class _Inotify:
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ONLYDIR = 0x01000000
+    IN_CLOEXEC = 0o2000000
+    DIR_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        import struct
+        self._struct = struct
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        return wd if wd >= 0 else None
+
+    def read_events(self):
+        data = os.read(self.fd, 65536)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = self._struct.unpack_from("iIII", data, offset)
+            offset += 16
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            yield wd, mask, name
+
+    def close(self):
+        os.close(self.fd)
+
+class ProjectIndexWatcher:
+    def __init__(self, index, poll_interval=INDEX_POLL_INTERVAL):
+        self.index = index
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        self.index.ensure_loaded()
+        if platform.system() == "Linux":
+            try:
+                return self._run_inotify()
+            except (OSError, AttributeError) as e:
+                print("inotify unavailable, polling PROJECTS_DIR instead:", e)
+        self._run_polling()
+
+    def _run_polling(self):
+        while not self._stop.wait(self.poll_interval):
+            self.index.sync()
+
+    def _run_inotify(self):
+        ino = _Inotify()
+        watches = {}  # wd → (project folder or None for the root, watched kind)
+
+        def watch_project(name):
+            d = self.index.root_dir / name
+            wd = ino.add_watch(d, ino.DIR_EVENTS)
+            if wd is not None:
+                watches[wd] = (name, "folder")
+            wd = ino.add_watch(d / ".ddev", ino.DIR_EVENTS | ino.IN_CLOSE_WRITE)
+            if wd is not None:
+                watches[wd] = (name, "ddev")
+
+        def watch_all():
+            watches.clear()
+            wd = ino.add_watch(self.index.root_dir, ino.DIR_EVENTS)
+            if wd is None:
+                raise OSError("cannot watch " + str(self.index.root_dir))
+            watches[wd] = (None, "root")
+            for name in list(self.index.dirs):
+                watch_project(name)
+
+        try:
+            watch_all()
+            last_sync = time.time()
+            while not self._stop.is_set():
+                if time.time() - last_sync > INDEX_SAFETY_SYNC:
+                    last_sync = time.time()
+                    self.index.sync()
+                    watch_all()
+                ready, _, _ = select.select([ino.fd], [], [], 1.0)
+                if not ready:
+                    continue
+                changed = set()
+                for wd, mask, name in ino.read_events():
+                    if mask & ino.IN_Q_OVERFLOW:
+                        self.index.sync()
+                        watch_all()
+                        changed.clear()
+                        break
+                    if mask & ino.IN_IGNORED:
+                        watches.pop(wd, None)
+                        continue
+                    project, kind = watches.get(wd, (None, None))
+                    if kind == "root" and name:
+                        changed.add(name)
+                    elif kind == "folder" and name == ".ddev":
+                        changed.add(project)
+                    elif kind == "ddev" and name == "config.yaml":
+                        changed.add(project)
+                if changed:
+                    self.index.apply_changes(changed)
+                    added = [name for name in changed if (self.index.root_dir / name).is_dir()]
+                    for name in added:
+                        watch_project(name)
+                    # .ddev may have appeared before its folder was watched, look again now that it is
+                    self.index.apply_changes(added)
+        finally:
+            ino.close()
+
+# Project operations shared by the GUI and the command line, none of them touch Tk
+
+DEV_PHP_INI = (
+    "[PHP]\n"
+    "upload_max_filesize = 4084M\n"
+    "post_max_size = 4084M\n"
+    "memory_limit = 256M\n"
+    "xdebug.mode=debug\n"
+    "xdebug.start_with_request=yes\n"
+    "xdebug.use_compression=false\n"
+    "xdebug.profiler_output_name=profiler.%H.%R.%t.out\n"
+    "xdebug.output_dir=\"/var/www/html/profiler/\"\n"
+)
+
+SERVICE_COMPOSE_FILES = {
+    "redis": ("docker-compose.redis.yaml", """
+version: '3.6'
+services:
+  redis:
+    image: redis:7
+    container_name: ddev-${DDEV_SITENAME}-redis
+    restart: always
+    ports:
+      - "6379"
+    """),
+    "memcached": ("docker-compose.memcached.yaml", """
+version: '3.6'
+services:
+  memcached:
+    image: memcached:latest
+    container_name: ddev-${DDEV_SITENAME}-memcached
+    restart: always
+    ports:
+      - "11211"
+    """)
+}
+
+DDEV_DOMAIN_SUFFIX = ".ddev.site"
+HOSTNAME_RE = re.compile(r"^[a-z0-9][a-z0-9\-\.]*[a-z0-9]$", re.IGNORECASE)
+
+def ddev_list_entries():
+    try:
+        result = run_command([DDEV_COMMAND, "list", "-j"], check=True)
+        data = json.loads(result.stdout)
+        return data.get("raw", [])
+    except Exception as e:
+        print("Error running ddev list:", e)
+        return []
+
+def project_rows(project_index, ddev_entries, sizes=lambda name: (None, None)):
+    # Map absolute approot → ddev entry
+    by_path = {str(Path(entry["approot"]).resolve()): entry for entry in ddev_entries}
+    projects = []
+    for name, entry in project_index.snapshot().items():
+        resolved_path = entry["resolved_path"]
+        ddev_entry = by_path.get(resolved_path, {})
+        size, db_size = sizes(name)
+        projects.append({
+            "name": name,
+            "status": (ddev_entry.get("status") or "unknown").lower(),
+            "resolved_path": resolved_path,
+            "size": size,
+            "db_size": db_size,
+            "site": ddev_entry.get("name"),
+            "url": ddev_entry.get("primary_url") or ddev_entry.get("httpsurl"),
+        })
+    return projects
+
+def run_ddev(job, project_path, command):
+    project_path = Path(project_path)
+    if command and command[0] in SESSION_RESET_COMMANDS:
+        shell_pool.recycle(project_path)
+    try:
+        return job.run([DDEV_COMMAND] + command, cwd=project_path, check=True)
+    finally:
+        describe_cache.invalidate(project_path)
+
+def create_php_project(job, name, path, php_version, db_version, webserver_type):
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    job.run([DDEV_COMMAND, "config", "--project-name", name, "--docroot", "public",
+             "--project-type", "php", "--php-version", php_version, "--database", db_version,
+             "--webserver-type", webserver_type], cwd=path, check=True)
+    try:
+        install_addon(job, path, "ddev/ddev-adminer")
+    except subprocess.CalledProcessError as e:
+        job.log(f"Adminer add-on failed: {e}", "stderr")
+    try:
+        ProjectConfig.load(path).update(disable_settings_management=True)
+    except FileNotFoundError:
+        pass
+
+    (path / "profiler").mkdir(parents=True, exist_ok=True)
+    php_config_dir = path / ".ddev" / "php"
+    php_config_dir.mkdir(parents=True, exist_ok=True)
+    with open(php_config_dir / "php.ini", "w") as f:
+        f.write(DEV_PHP_INI)
+
+    public = path / "public"
+    public.mkdir(parents=True, exist_ok=True)
+    with open(public / "placeholder.png", "wb") as img_file:
+        img_file.write(base64.b64decode(PLACEHOLDER_PNG))
+    htaccess_path = public / ".htaccess"
+    original_contents = htaccess_path.read_text() if htaccess_path.exists() else ""
+    with open(htaccess_path, "w") as f:
+        f.write(HTACCESS_RULES + original_contents)
+
+    run_ddev(job, path, ["start"])
+
+def set_xdebug_mode(job, project_path, mode):
+    project_path = Path(project_path)
+    php_ini_file = project_path / ".ddev" / "php" / "php.ini"
+    needs_restart = False
+
+    if php_ini_file.is_file():
+        with open(php_ini_file, "r") as file:
+            lines = file.readlines()
+
+        found_mode_line = False
+        updated_lines = []
+        for line in lines:
+            if line.strip().startswith("xdebug.mode"):
+                found_mode_line = True
+                current_mode = line.strip().split("=")[1].strip()
+                if current_mode != mode:
+                    updated_lines.append(f"xdebug.mode={mode}\n")
+                    needs_restart = True
+                else:
+                    updated_lines.append(line)
+            else:
+                updated_lines.append(line)
+
+        if not found_mode_line:
+            updated_lines.append(f"xdebug.mode={mode}\n")
+            needs_restart = True
+
+        with open(php_ini_file, "w") as file:
+            file.writelines(updated_lines)
+    else:
+        php_ini_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(php_ini_file, "w") as file:
+            file.write(f"xdebug.mode={mode}\n")
+        needs_restart = True
+
+    if needs_restart:
+        run_ddev(job, project_path, ["restart"])
+    run_ddev(job, project_path, ["xdebug", "on"])
+    return needs_restart
+
+def install_wordpress(job, project_path, name):
+    project_path = Path(project_path)
+    docroot = ProjectConfig.load(project_path).get_docroot("web")
+    try:
+        download_wordpress_core(job, project_path / docroot)
+    except JobCancelled:
+        raise
+    except Exception as e:
+        job.log(f"WordPress cache unavailable ({e}), downloading inside the container", "stderr")
+        job.shell(project_path, f"wp --path={docroot} core download", check=True)
+    job.shell(
+        project_path,
+        f"wp --path={docroot} core config --dbhost=db --dbname=db --dbuser=db --dbpass=db",
+        check=True
+    )
+    job.shell(
+        project_path,
+        f"wp --path={docroot} core install --url=https://{name}.ddev.site "
+        "--title='Installed WordPress' --admin_user=admin --admin_password=admin --admin_email=admin@admin.com",
+        check=True
+    )
+
+def enable_compose_service(job, project_path, service):
+    if service not in SERVICE_COMPOSE_FILES:
+        raise ValueError(f"Unknown service {service}")
+    filename, content = SERVICE_COMPOSE_FILES[service]
+    with open(Path(project_path) / ".ddev" / filename, "w") as f:
+        f.write(content.strip())
+    run_ddev(job, project_path, ["restart"])
+
+def normalize_hostname(h):
+    h = (h or "").strip().lower()
+    if not h:
+        return None
+    if h.endswith(DDEV_DOMAIN_SUFFIX):
+        h = h[: -len(DDEV_DOMAIN_SUFFIX)]
+    if "/" in h or " " in h:
+        return None
+    if h.startswith("."):
+        h = h[1:]
+    if h.endswith("."):
+        h = h[:-1]
+    return h if h and HOSTNAME_RE.match(h) else None
+
+def normalize_hostnames(items):
+    out, seen, errs = [], set(), []
+    for it in items:
+        v = normalize_hostname(it)
+        if v is None:
+            errs.append(f"Invalid: {it!r}")
+        elif v not in seen:
+            out.append(v); seen.add(v)
+    return out, errs
+
+def set_additional_hostnames(job, project_path, hosts):
+    run_ddev(job, project_path, ["config", "--auto", "--additional-hostnames", ",".join(hosts)])
+    run_ddev(job, project_path, ["restart"])
+    return [h + DDEV_DOMAIN_SUFFIX for h in hosts]
+
 class DDEVManagerGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("DDEV Project Manager")
         self.projects = []
         self.selected_project = None
+        self._snapshot = []
+        self._snapshot_lock = threading.Lock()
+        self._status_times = {}  # project → when a docker event last set its status
+        self._site_to_project = {}
+        self._primary_urls = {}
+        self._launch_cache = {}
+        self._row_names = []
+        self._refresh_lock = threading.Lock()
+        self._refresh_running = False
+        self._refresh_pending = False
+        self.executor = JobExecutor(int(settings.get("parallel_jobs", MAX_PARALLEL_JOBS)))
+        self.selected_projects = []
+        self.jobs_window = None
+        self.sort_mode = settings.get("sort_by", "status")
+        self.resources_window = None
+        self.performance_window = None
+        self.idle_tracker = IdleTracker(
+            int(settings.get("idle_timeout_minutes", IDLE_TIMEOUT_MINUTES)),
+            settings.get("idle_timeouts", {}),
+            settings.get("idle_pinned", []),
+        )
+        self.idle_action = settings.get("idle_action", "stop")
         icon_png_base64 = """
 iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjabVBbDsMgDPvnFDsCxOF1HLp20m6w489AqNpplgjGpm6IOz7vl3t0SFCnMZdUU/KEVq3SSIqfaKMGr6MOLIvnm+5OQyiBO+yDZPeXHs6AuTWyeA16mrHdjaqWX36C7EfoHQnJbkHVgiDTCBbQ5rN8qiVfn7Ad/o4yl+sFeWSfIb9nzZzeHilC5ECAZwXSbAB9RYdGElkDIi8GZHJBHcrqhAP5N6cF9wXxLlkrViIf9AAAAYNpQ0NQSUNDIHByb2ZpbGUAAHicfZE9SMNAHMVfU4si1Q52EOmQoTrZRaU41ioUoUKoFVp1MLn0C5q0JCkujoJrwcGPxaqDi7OuDq6CIPgB4i44KbpIif9LCi1iPDjux7t7j7t3gNCqMs3sSwCabhmZVFLM5VfF/lcEEMIwIojLzKzPSVIanuPrHj6+3sV4lve5P8eQWjAZ4BOJE6xuWMQbxPFNq855nzjMyrJKfE48adAFiR+5rrj8xrnksMAzw0Y2M08cJhZLPaz0MCsbGvEMcVTVdMoXci6rnLc4a9UG69yTvzBY0FeWuU4zghQWsQQJIhQ0UEEVFmK06qSYyNB+0sM/5vglcinkqoCRYwE1aJAdP/gf/O7WLE5PuUnBJBB4se2PcaB/F2g3bfv72LbbJ4D/GbjSu/5aC5j9JL3Z1aJHQGgbuLjuasoecLkDjD7VZUN2JD9NoVgE3s/om/LAyC0wuOb21tnH6QOQpa7SN8DBITBRoux1j3cP9Pb275lOfz/ByHLGxZE/pwAADltpVFh0WE1MOmNvbS5hZG9iZS54bXAAAAAAADw/eHBhY2tldCBiZWdpbj0i77u/IiBpZD0iVzVNME1wQ2VoaUh6cmVTek5UY3prYzlkIj8+Cjx4OnhtcG1ldGEgeG1sbnM6eD0iYWRvYmU6bnM6bWV0YS8iIHg6eG1wdGs9IlhNUCBDb3JlIDQuNC4wLUV4aXYyIj4KIDxyZGY6UkRGIHhtbG5zOnJkZj0iaHR0cDovL3d3dy53My5vcmcvMTk5OS8wMi8yMi1yZGYtc3ludGF4LW5zIyI+CiAgPHJkZjpEZXNjcmlwdGlvbiByZGY6YWJvdXQ9IiIKICAgIHhtbG5zOnhtcE1NPSJodHRwOi8vbnMuYWRvYmUuY29tL3hhcC8xLjAvbW0vIgogICAgeG1sbnM6c3RFdnQ9Imh0dHA6Ly9ucy5hZG9iZS5jb20veGFwLzEuMC9zVHlwZS9SZXNvdXJjZUV2ZW50IyIKICAgIHhtbG5zOmRjPSJodHRwOi8vcHVybC5vcmcvZGMvZWxlbWVudHMvMS4xLyIKICAgIHhtbG5zOkdJTVA9Imh0dHA6Ly93d3cuZ2ltcC5vcmcveG1wLyIKICAgIHhtbG5zOnRpZmY9Imh0dHA6Ly9ucy5hZG9iZS5jb20vdGlmZi8xLjAvIgogICAgeG1sbnM6eG1wPSJodHRwOi8vbnMuYWRvYmUuY29tL3hhcC8xLjAvIgogICB4bXBNTTpEb2N1bWVudElEPSJnaW1wOmRvY2lkOmdpbXA6MzEwODE4MTctZDc4Ny00MzdiLWI5MDItODViODRlZDVhYjNmIgogICB4bXBNTTpJbnN0YW5jZUlEPSJ4bXAuaWlkOjc4MDdmNzI3LWRhNzQtNDA2NC1hNjFjLWZjODg4NTdkYmU0MSIKICAgeG1wTU06T3JpZ2luYWxEb2N1bWVudElEPSJ4bXAuZGlkOjgwYTE0ZDBiLTQ5ODItNDUzMC05ZTEyLTExMTJlYjdmYzE3NSIKICAgZGM6Rm9ybWF0PSJpbWFnZS9wbmciCiAgIEdJTVA6QVBJPSIyLjAiCiAgIEdJTVA6UGxhdGZvcm09IkxpbnV4IgogICBHSU1QOlRpbWVTdGFtcD0iMTc0NzMxOTM1NTkwMTY2NyIKICAgR0lNUDpWZXJzaW9uPSIyLjEwLjM2IgogICB0aWZmOk9yaWVudGF0aW9uPSIxIgogICB4bXA6Q3JlYXRvclRvb2w9IkdJTVAgMi4xMCIKICAgeG1wOk1ldGFkYXRhRGF0ZT0iMjAyNTowNToxNVQxNzoyOToxNCswMzowMCIKICAgeG1wOk1vZGlmeURhdGU9IjIwMjU6MDU6MTVUMTc6Mjk6MTQrMDM6MDAiPgogICA8eG1wTU06SGlzdG9yeT4KICAgIDxyZGY6U2VxPgogICAgIDxyZGY6bGkKICAgICAgc3RFdnQ6YWN0aW9uPSJzYXZlZCIKICAgICAgc3RFdnQ6Y2hhbmdlZD0iLyIKICAgICAgc3RFdnQ6aW5zdGFuY2VJRD0ieG1wLmlpZDphMmEwMDQ3Zi1lNGEzLTQ5ZjYtODg5Zi1mY2EyZmNiYWY2OTUiCiAgICAgIHN0RXZ0OnNvZnR3YXJlQWdlbnQ9IkdpbXAgMi4xMCAoTGludXgpIgogICAgICBzdEV2dDp3aGVuPSIyMDI1LTA1LTE1VDE3OjI4OjA3KzAzOjAwIi8+CiAgICAgPHJkZjpsaQogICAgICBzdEV2dDphY3Rpb249InNhdmVkIgogICAgICBzdEV2dDpjaGFuZ2VkPSIvIgogICAgICBzdEV2dDppbnN0YW5jZUlEPSJ4bXAuaWlkOjQ2NmFmMzIyLTk1ODktNGRlYi04N2U0LThkZDdkOWRmYTk3NCIKICAgICAgc3RFdnQ6c29mdHdhcmVBZ2VudD0iR2ltcCAyLjEwIChMaW51eCkiCiAgICAgIHN0RXZ0OndoZW49IjIwMjUtMDUtMTVUMTc6Mjk6MTUrMDM6MDAiLz4KICAgIDwvcmRmOlNlcT4KICAgPC94bXBNTTpIaXN0b3J5PgogIDwvcmRmOkRlc2NyaXB0aW9uPgogPC9yZGY6UkRGPgo8L3g6eG1wbWV0YT4KICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgIAo8P3hwYWNrZXQgZW5kPSJ3Ij8+k40fMAAAAAZiS0dEAP8A/wD/oL2nkwAAAAlwSFlzAAALEwAACxMBAJqcGAAAAAd0SU1FB+kFDw4dDwhRI0sAACAASURBVHja7X13mBzVle/vVPfkPKPRSJqRNKOchUZIAgsBEsYIA16SA2/BsGCMbRwWr/2WXT+/5+f17nqDwYFHWDAYbGMWDAaTJIJIyjmOwowmaUbS5NHkmQ7n/VHV3VU3VFVLve+P9839PlBPd9WtW/eee8LvhAuMt/E23sbbeBtv4228jbfxNt7G23gbb+NtvI238Tbe/v9vdCE3v3u0Je2Xv//wyu7R0LqAYSwLcmRSXmZ6LgAYZHbNbD6FALDtgbHPyu8YILLuhXw/WX+x7aZYH1G292zdTponMQAyP5vPTFzDbH0SbnH2DBgUe27snW2Dtm4iccaZhalnx3Kw9XACgcCIJoaJrsGx/jGizqwAHRoYDb996fLKDx/+y6tC/08J4LsvbE07sOf4V4eIftgxFinTzpI4W6R4X8d1zolw/q5ZAamx+n5xrsUFIUqMIf5ZHCcDTPKz7OMnCNeoZtvqRzU+1esovzBvzjXQlm0E/jm3rPDRd75/Y+i/nAAeePiVyq0tvS92RXiFYoZcVli1C5RUoBkmC8ur2m2q12KP12eX78ilD1LuXmmxRGJyG4/I9iReab/O2X9pGh28dErhLQ89cFPdfxkBfOXf/zhv75n+TX2R6GT14ou8O8a/YyyXpevZxtK9h8gui6joQzuhLuuvnBYdO2MXonF7hgdRkl1EQZg3xRitn7INOnP5tKJ1j/z1jcdSTgD/69HX8l841rEjYtC8C1c7xN1sn2bVriPvv+O3CUTm4DZeO1+lnbgtvl/Oxz44nRdBsQ8uRsglPnbZtOKLH3ngpkE/q2H4Xba9p/sejhjGPBC50A25/E2SjCbhWpJ2HCkmUzM5ukVm8V6d4GVbv+yyyDrSZUX/rBi7an5I1hF8qQTiewGDoHkHW3v/IaUc4Kv/+vKsD0731jAozZuF6afJH9V7yWXAhybozVWkLnQynT1kvx+OkNyYE6LLrT9oxCchy0BoeVF21W9++KXWlHCAw+199yS7+E7qIuE/6yUduwbq3U6koHb2pmUy740vPrHz2TEtnEjYRPZn6vQB+3VunIG0O1Ueu+0a9mUOCPObuG44irS+aPTrKRMBo8yftbNIvyTA0qcES2Rm4Xd737brWWSxrJlc28LHFE77vWw+M8pANMqIMpv/RqKIRqIIhcIIRaKIRKO2gbOte4GAHWNz6iKstUggET1LIsRNZyAfgsG8prlv5NN+1ijo56KAQUsQSTyIkuUAMbNF0spZMGss0IZ1bI49RI3NPLIRCDPwq1uW4+IF0xEIGHGzHyDAIAQCAWSmB5EWMDA8Moa3txzCg28dtokO8rA+bNewyJbJhXGJeg/7sEYgK7+KaQkGjKUp4QA/fW3nzM7hUNJMX71SKhWGnS8Qn1NzQlRsjh1vzTbEjm1sPdHpg1fMxjWrF6G4MA8FeTkozM9BQV62+V9OFnIz0xE0TMLIzEjHTeuqccvsCYrx6IiAnQtINk4U+44hQIsaBZLI+T3BHWeQlF/znrahscy9jZ2TLpgA3jzQBBiGC9DiQ2FiOOUtGKQVJKyRl/Z9rmCJbIOGBah14YxJJrzqICqyDUlexDWLptp0BztRsYadk/N9WaETsCscqVhQO8cUBariuUL3x0535lwwAfSPjikG7F8RVN9Gtr1NSXARdkXsiCixYHFuAEwtKxJ6Yev/erEyfXKJGnDRsmWWrQxxYzgUTSjMTnXfrFL5pPvl1jUwfOEiYDgUEd0ZvjRUBxRqgTEJpdnOAVhiX7JypbIWhAmOf3SyUo5GUVKUp5C55l+sGfqU0kKLa9jXV2Ex6DR8FlaL7NzJzSGk0hMUgp7dFU0CMDAyeuEEMDg46kFnGpPGjswx4pp/wlFCatubZYbHOvlnJwwH203oFZ+tKkF6MCBYCV5aDKEwPwdLi7KkHznWN7spbxoG4WkaOsWff6RDYRkRYWw0mgICCEelyXFqtxqlhnVyHS47267cmt8tLczCvdUVWFKY6WCr7EDPFNiBtWmWTC8VFKu49LegABJV0rgsvmxOmbSIpBIJApbw6YoC/NVF5ZiSGZTX2YuZ2hRYio9JY/qSCidJtJGwNwF4moGRUBTICEgSlLw9HgnHBstKDClZvNMJcu9F5bj/81cgMz2IoZEx/PyFj/Dc4TM2uiOBlTpHlkHAivkVcXZJRHG2bkolsk2u7Ehas7gSj+9sQlTVvZ3jMMX//cdrF+HmddUgAu4fGsFDf/gIzx9rk3VblXuZ1EofKcCexD+sZTd9wyMXTgCBNPKw79mdPbEMbzqtNFZi4j+4cg7+8tpVMAxzxrIzM/Dfb1+Hote24BfbGxUs1XzG/Nx0fH7lDCydXY6qilJkZ2Y4SC7+aJXX0gFAMJbNn46dP/4iapvOYvfxFrywqxGtYxElhMwwsYbPXLow/ktudib+/s6rUfbaFjy8vUHGe1QBKtpNxe6opGIDRnwIEU8CyDBIw7ZY1ksg++rZAe5Q/D7n9wm/NjPjFzctx/rVi6RJCgYD+NrNazAhPxv/Y2NN/JcsA/j6JTNwZfUszJxWhoBBDqWPRWYEFd2q/RC52RlYNn86ls2fjjuvuwTHGk7jre3H8cyBVivSyIwKevqOy3DJkpnSogaDBr5682UoyMnEj9476lRyWbOzbR5MFhAQPRAlt3AqRADHFoZ0QCXF1TRSsHeCaBOTJcFNdmyXqdkBwuN3XIaVi2aqsW+L7X/+6osxsSgXz35Yg+uXVWLdynkozMtWEimLOEF853MS1oz53PS0AJbMmYolc6bizs5evLn5CD48fhYP3rIKi2ZVaFkxEeFL61cgPzcDD7y63+KAbhAvOUEu5ZUqv4Nz/KMhbwLwRHUnfu2JmbnpgTrDkB/GSCaihFzBpOI0A7++dx3mz5iSJLjg7WUbGQujrbMXrR296OwdRMe5IXSfGwJHo+YkBwIoyc/GxMJslBTkYHJpISZNKERmehCpa+b7btl3Anf/bivIoOQDRVw9kM4WjUSxfPakWS99+4aTF6YERqMgCigHSm6aLLPibzViWJEZxBNf+zRmVkx0vJBdadMvtVr5bG3vwcETLfjkcDNeru2AYfgzq+LBpVHGrXMnYs2iqVg8qxzlE4uQlEtXM87Vy2bjuYCBO3+7ReHt1fkQ2AdxCHNBpDGfkySANIfzJGnITwA95JeYmhXEM/evR8WkYofMJiKN00gPmIyMhbC3phEvfFyDd5p7E3MYW3wly1JLWcMgvFLbgVdqO8C8B1dPLcSXLl+A5QsqkZmRliRHcn63aslM/OHuIO585iOMeTI39rASFKKATKAtFEmBDjAWZeTQeXJkIqe5ooi2/bsbllmLLyuDHr6khKwbC+PjvSfwiw0HcXJwLOF4TFrgaUiYCO+2nMN7z2/DjOzd+M76Jbhi+VxkKEUEazR4Z1s2fzr+du08/MP7x4T1IwFAEyaABFCJbMgikQN400YnJ0MAUWYPDuAS+81C8ATLIdsFOZkO0DM2CWS3r+MmHEtzsu9oM/71Tzuwr2fYnzRlAaZOgioYwMmhEL7zyh4s3VSDB29ZhYvmT9dQpre4mFCQrYk4Y5kYQE7Mwe54UuwQBhCKRC4cCTTYa4pcMGoivRiw/nnp4xozCCMOlTOIY6ZigvLExT83MIyHnt+E257+0Ln4yp2ThNLPmvuEyd3fO4wv/fpD/OIPmzAwNOrCCdSsZ3hkDL/58KhanyPbhtGyfFaLATsoSXzhBBCNkk++7wqAa9gi49X6Lny8+7iNZpyhVsxyFNKJxrP48s9ew3/sa1Hi+A5CkLAUlpxUEvGqiEjccda/j+05hXt//mc0tHb4nAezvfDObuzrHnY+i20uYU5i00ENEkbC0VQQACu5ja8BsZsvIKGY/eBPe9DW3edACNluCdju3bTzKD73yDs4PjCm1xEkl6vg1bM7j1Q5aG7vpQgG3t8zjC/+agN2HKj1JUqO1LXiXz6utejcJRiV3Deam31EAMKcAgIIc8RFhyKNM0M1WDnujawJ7w5H8fB/foxwOGJ66e3s1toVzIyX39uDb7y4SxPrr7MyyRkhRCRr2XZEUvKqCRTGTpZSnGbgX65bgj89cB2qF1Z57tCBoVH86IUtlpkmKMgiIbC7TqFHCM2+x3zoAN5KYISTY0WaCBZS4gOJy16t78a6nUdxzaULzcmxO20A/GHjTvw4pjGLar5bqD8JO53FJBIosoegSDQRxAsRJmcE8dz96zE1Hjzi3V58dzcOnRsRpogE34ZKaWHfymUMQQz4gCy8lcCA4b3sRK52lppzkBRAY1i7QjQBX//oAH783jEncTEL2LQYQazSrG3JIqJpQ2QLD1OYsiK8C+Ant65MavEBYCwccd9M5AW66CwOEnwwjFAkBQQQUYAJnmohKRxIsR1IgtPD4tBXlxfgiovnSk/aebgB33v9gBDDL/jgHeovCfgDhPAsVTwD2Xxbiihekr8ozwhg5aIZSYPst12zAtOzggqViITNT0mAF2qlOxJJgRVAPhQJie2zgh/H2a08wcyMb998CdKCTsi5pa0b3/7dZtsmFGSwmwggl00CUgbhkIpWWGDV1o9XVE2QxutHLy7IzcIPblyuGD8758Y35ExQxkcCCEXCF64DmBHB5IsGHa5gNwhT2L1fv3g6Zk0rk/qsbTqDv7lqvsWtTRadnh5ETkYagsEg8rLTARBe23IULxxrt70U4Ze3XozigmwMjYQwOhbCyFgEQ6NjiEaiECNuyDCQlZmGrPQ0pKUFkJOZDjIIH+w9iSf2nlKuRZYrHOzeVi+djfWbj2NDDK5mKDASvawXykkof2UA0VQggYYcxeDB8RRQKGsDB0yny9olyj7Xrlzga0LT0gJ44fimeN+fm1WCtSvnJ+m/kNuk4nw8ua/FqjpiGzgB3QMjvvvpHxpBXnYC8QwEDHzl2mpseGKTwMFI1m1cU8L0VgIBGPXBAbzNQBI4APmUSUTwY6fdt3waysuKk2B3wGgogp5zAzjd1o0jda14bXONY1tsbOjG1gO1OHWmC2c7ejEWCvvqPRSOoufcIE63deNowxm8sfmIbfGdU//nkx0YGhnz1W9f/xBa23sc3y2cVY7rKosUIpwU5ib52HoybsDhFEQEUSRiwrMOXNoPDbjgrDZivf5TyZQbMG/afbged/9uq+nitYNN1gQORqK453fb4nJ9RUk2Hv/ODcjOynDt/XR7F6752VsJ76FuFzIhDMLh2lNYuXim56gL83Px+Muf4G9uv8qBeH7pyoV48zebffgRfJriwseBUOjCOUAwaJwHKxU4hiNq1lRaotEo1k7Jw+xpkySgxKstnlMhm+9kA3yE/M2dnUPYXdPk2e+0yaW4tCxXDlckUmrlT248gLAPl2tudgYe23sKp852O75fOncaFuWnxzcYSYpqcs4qcQWCRvDCOQAT4BV65EaV8/Iy8JUr56E4Pxs5WZkoys9CVkY6srIykKvYkc+8sR333bQa6Wn6oeXnZOGuJVPw7KEzarWDBTSNgNe2Hcfly+d4Wq83rpiJbW8edIabq/LvQNjcNoBP9hzz1FWYgcLMNGzYVoN7b7os/n16WhAv/o8vom9gCMMjYxgOhdE/MIz+wVF09Q3i8U1H0TAUSnLubSCej2u8o4LJvUiBGwdgZjz+jfWYNKHA1z1dvf34PzsbcfnSGVg6b5oikCTx+cqLqhIEIMWOyLlybzR247vtPVZkj75Vz58KvHnACVbFlTNncCuD8KPX9mLZvOkozM9xnY7BsTAe3d6AL33mYuTZXOCGYSahqO5fOqcC1zz0pmd2tK4+E6fCF5AWCJwH9zcHe2V5ASaXFiZi+F2VSMbumiYQET7Yd1IJKds/L55dkQg+1UXZOnJFCDsONXoOv6KsBKvLchUAiz2YNBHG3TYWxYvv7XPtc3g0hHAkiuEI48CJU76nsnLKBEzNTtdKAfbQu0KcAiDIFxQsywyACGV5GWYhCNaxU+ebvb2nHgzgyT3N6B8a8ZCrmbhjcbnStNS13285gbCHg4QIuHHlTIHuXBJYGfjZlpM423lObwb2DyItGAAR8MmBxqT2U/WkXLXLBTpnUGLIHEkBB6BoMlCwA95DeUleXOON4+xkS8aycYbe/iG83WgqSREA+481eyqYV15U6VQCWdi1DAcodaRvFCcaznr2Wz1vusBadfvPquhpEN7bqa/MdrrzHKLWcH5/5AxGRv3Xc4zNoZedoBqeM5L7fAnASCYghB3aa0VpfpwYOJZXx85Y/dhr1Ld02AJBgTd21noqmItnVQC6FDOxzo/104f7Tnr2W15WhCum5Ak1DVTWQOK3Z7edREjj6Klv7YoPK8xAy9ku3wQwvaxAO9/ksi0J8JHV7UcEuAI6UMtpC80qLcpNLAs5Q7zEuxpOdzl27qt1XWjrOuc6trycTNy1pFwBnypKxVj/PL6r0VO8AMDnVsy0RRWxRLDiG5waDktmXqx9cuSUQ49tPNPtmwAmKJVLf/FtfgpAeV8TiepTmJR0QXE2X1ac79RPSK8DHGlsd9Z3JGDXEW/b/fKllYLCp/AI2ZToMQb2HW3ynL9lc6cJO1+TyWxbWBUB9PQN4a3GnjjzIAANZ3r8E0BRnoduQ8qv/CbteIuAtDRlbTB9JTNz10SjUZtpo4gKFsCiw239UgjZi1tPCFCsAhSaVQ6OssIjKufZxQjh5S3HPedxysRCXFVRIPdJCnFj/d7ROyB1e+RkqyN2hRlobD8nKJ76pSrOz06wUG2dBPVXfsI5fUQFR3VE5kqNM3IyUJCbFR9Rwm3PzoJOMLOP9nYMSKjbrq4hNLS0e4iBLNy5ZIrg7nWWfRdrFW1s7sEpH3L4hhWzZEST9ZW8Bkdk5e79vfVSGFpt95BgvemJvCAvxxaToXs2KXWAQMC4cAKI+sV+hF13ybQiyUaNrzs7AzYGhkYtwAlS+PU2H7b7lUurEvcKrlQS6/NYu6nr3IBnv8vmTRWC0SXI0fFTQFCYe/oG8XzNWQnD2dcx4FsEZKQHsXpynofiqgGJUoEDENF5wdEDY2E1o5IKKQKIRMwca7s3zGrPbTvp6c1bNLvcOmTBpUqnLdS6MECYVznFk6eVlRRg/bRC2xyLKVjOzSdC2/uONSesKHshsGgU4ajPAjAMM8UrqZREs/pJeio4gAFnXr3fUf+5vgvbDtQpAnjIqVsJ+qMIGDWPhHG0/ozr4/JzsvDlRVM8dkeCkG+vnqbI71O/4fV2MaDiBpwQbxMKnRr7n3fUOjEJeyU5H7szysAHO49iT9ewHulSGmnW83yYAT6ygxkcJN9lxe3HuvzV77ZidelBXFtdiWVzKlBZPsEhl+KTYBiIRhlGQPA32Gz3pXOnuj537UWV+O2RMzZMXJFcav2zerFpOYTCEfewLgBL504F825BUXMqfzEdrXxiYQL8ae/BhqYeSEWzLMoPanZnOBJF/al27D3egtf3NmBP97Avhc9BHrHLoimICGJKLh3aGf5N2NIxgC0bD4M2HsbsnHR8YeUMXL1qHspKEiZidlaGRQBqinpqTzPu+dwIcm1RNbIYqABH2Vl1RBb+yDGAeVXmeReHak9hSmmRq7NqYnE+rqsqxltNPTaiktO0AkyYXFoYJ+ydR5qgKxtXmpUubdzWtm68ve0oXtrbhObhsBMsixM0J2MMIisz48JFQCQc1cQcuEQJSfH25n0nBsfwkw+O4dWPDjkuTwsGMLMgUwblrbULA55OlPycLHx58WS3ogUAgDuXT0NWZjoAYPOBJuw87K1kXrdipqJoNTmA9y8smITM9LQ4635pe63TKrEFeq6cJCt1f/zgAP5980k0DYXlhCr2BuFVLRROQUhYRlrA2wFht7NV0cCCvGvrGZAUtOWT8+VMVwuFYwBv7zzp3xqQdn5ifDH2PzQ8huf2NeOFrScQ8VDIlsydKuARTq2bCPjUgkSJmIbWjgTrZrkAVEWxjO619w7bhswC6sjwrEeoZN8pcAaFQhH5QAtXK1BTLpUTwup4e58U+jxrSpFQfdNZP/+l423o6O53B4VmV5jbTxVZQ0A2UbwETU19KwajjL09w6hrOuvab2lhHm6aVSokwDhrA8+rTEQ2bT/UIMDTzh08u1xOJtl9+hwupKlIw4cR4EMERKPn9XC3k1Z2dQxhYNCJx8+cUqIvmWuZo7tq3Nl1fm4W7lg8WWad1ua5Y1kFsi32/8nBxvjPn+yv93zH9cur1MEmBFSXZKG8rMjMyQ9H8Pvt9Xr7nIHy0gLHlHSdG0DT0Jht5/utKumuAwSMFJiBFAxok0JdjzGwY58ERzp2IEA4LUTJziifYGN/9m4SO/qPW094YhtXXlQFobRn/POaJSb7HxwexbP7WuLr8+sd9RjyqKu7ZE5MDAjsmIEbqivjn2sbz6JhOGSrTScHeFZOKXHM5KkzXXCWi9exfPK59JYRkIp4AEMpenweHEH2Or4JcmEGTjR3OLH3smJUZgYhluK0Z3hvbR9A0+kOD99ABaLsFDkAkGXY2H/daYzYZGxPhHHwRItrvyWFubh1TqnyravnVsTH/PGBem3VDgBYUZqDUpuTDABqGtuUk6kriMXKvxQcIC1w4QQAw/CVpqa0DuyKDJGDxW862CywK8LnL56ueHU74kae0HB+bhbuWDTZ6Twh4MvLpiLHQuo+PtggjfytHd65/Z+pniG94/SsIKqs6mYjoyE8u6tRsUMT199QXSWlv7+1v8kGGLHn3tYuh2CNGUiBCAgY0BS60IUjaPL22RlZ82ZDFzp7nErdpxZXKcqwO/v7/fY6z7CutbFIIZsuclmM/Q+N4pn9LTbiMp/zn8fa0N7d51MMJN74iysqkRYwQ+cP17WiR0zGEFbp4vlTHaDSqTNd2N057OSYPlm8N/afAhHAUfYQ8j7EkiIWgAySbPs5lZNwUWEm1Mekmu3kYMglrMtaqNlTHePOCRAWWuz/8MkWhONjSnAoMsgTEyguyMEX5k500M7KBVPNaqoAPthXrz7oxNJF1pXno6p8oqPP/SdanGcJSOEGnDwhWFcHUhESFjTIdee74sEOW98Jy87ISsPCmeWS1nrX2gUKMQIHJvDxgXpPMfCXCxPWwJeXTY1nBX24v0FLuy9sOW6WxHF5z09XJ7CGSWkGZk8zUcW+gWE8faBVOLfAORl3rFskYWYLZkxGYZzNygEz5GfDabcnpUIEGP53vvIy+biUqswgnrz/GiUEe3n1bJRnBgSZ5jzL/eldjRgcdtfa1y2rihseayyAaGBoBM8daJUljDXE3d3DONnc5vqeS+dMNUvMMnD7yipkpAdBAPYfb3axgxkXFWZi+YIqqb9Z08rw9L1rURA0FJvsfKuSmj2MpaJARCAYuICByOrKdGvxy8uKlUGL2ZkZ+N61SwSu4cya7YswDtW2eIJC0Sgj1yDMj2H/dS2IEilAmgSX+cSDuxTl5+Dz88xU9ksXJ3SNt3fVOSlKyIX4zvXLka7RyhfMLMcz965DfkA8WPPCmp/MIO/EkKCYHZwMIhGz4c0JnpIRwJPfuAYVk0pc6XvdivmoLs5y3RAbd7mfkl6Qm4XbF03GHdUJ7P+j/Y3yBhVOCn1me71n2Panq6swKzcNs6eb6F97dz9eqe2EdISN9fFzVcVYuXiGa58mEaxFXoD0RbCS1AUomooycZGI+vQXV9ZPsuxn4JG712Kao6aOurOM9CD+7tZL4VZx5Pmas55RPesuqopr//2DI3j2YKvgZYMUYN8RjuJQrbvjaensqbht5Yy4S3dvTaMV+CFvlFyD8J1bVvtSyBbOqsDPb7tEcVYi+bL7xWWIcAoqhcIgZRS6P5pI7K7sIGFBEqXgF8+pwHdXz3SiiDalkAzCnppmTzEwr8rcpYfrWuNnH8i1Ap3rtmGnO3cpKsjB+tULrWrmwCvba7WT8tObl6O8rEgTscXS34tmlluKqJjfQC7B+PLxuQTABwPwUSAiErXVnfJr9bGwe4HBUNTTzhbbHZ9dhStiqVEsWxUvbz3uaQ1kWz7xDw80OE8BFSuC2Yb7uyNn0NXrzl1KCsych5a2bnx8dkDQKM3+v72qCutWzk+cUMjOxY4RkH01W9p7LG4i5iK4VQqRy/UykNB33Kw8P2pcspaoNDA2d+xjr2zDD+/+jK+UJcCsw/Pju67C7Q+/gVMjEYiHSn10ph/NZ7oEsSK3/sERPHewVV1CXBFnQQZhd00TrvnUQg/chbHrSKMwMSa3mpRuoHr2JBw81qQ0j5mF4mNkOt4efn2vfmBJpocHfEyzd40gw0DEs+Kk25HuiRLnfzjehlVbD2P9msW+36OspACPfGUd7nz8PfSG5TPydhxp9CSAg7WnhMJU5PTTE0M8geylrSfwmU8tdCX60VAYL+2oU4BdhLNjUdz12202ZdjWv+NwTPfDpR2UozqK2I17h1OSHMoeyaAKFmQPThMqgn3/tf1oaulMSpudUzkZz9y7zrKVyeFXeH5rnWeVjg/2N2oUWUEJsJmIm8/2o7FV73gaGBrBj379Dvb1jAg4vuIQSxEIs5eHVaYb2kxJi2CVoRYefNlHmUBvDhCOhgEYmsd4FYkWDo9mIESMHz//MR751vVx88yPSJk/sxzP3fdpfPPpTaY4sPo72j+K2qaz2rOG+gaG8dtDpxPh2ar6u/adaWPJ2w41oKq8VOLgA0Oj+MFTG7Gx+Ryqi7NwxxXzMaW0AIYRSHRjwwESpQmt5FjHnlAfAc+2I7n6B4aw9cgpPLa7SRHz6GLBcQpODKFAEByOgH3lmioogWWWu6V9AM++sR1fu/XypHqbWzUZz337OvzPZzdhc9tAPE7yk/31WgI4cOKUnOEcP7VLNdbYn4Rnt5zErVdVx8vVxNbp8Vc2Y2PzOXxhbikevOMqW81A60Q0spe6Jyemw/bjtlhKCxPrE8WeuXLxTKyYV2seOOXgW6wVCSkJCImEwoD6eVtq9AAADU5JREFU+GL/KqEYK8jAw9sbsOtwg+udQwpAZnJpIX75rRvw15dUxtXq3+xswLCmZNumfQ0OX4LDv2BPRSOS0LemkRCO1Z92uCVONrfhqf2tYGZ885bV5uLbIOuYZp9IVDErnZtV0GNR1rbTzgWlUlSgOa7VM1ZfNBv3LC1XFuxRbU4/tYK98wLIf06AVilkWYkhEH744na8WDUJ+TnOQ5rrW9rx24378PyRM3j0i6tw1ar5knVw3y2X45LFlfjnl7Zjf+8IDte1YIVQu7e3fwjPHz1ry26yxxmyfEoXi0QLvL/nJJbEM4UZB+tMgrh6WiFKrVPJCUBDayd6+wadicRJnaunvtgwDMyfWY5gMABm4JIFU/H0gdNInNoIpbVAPoNIva2AKMX5hHuWsrMcrJNFqZACQuNQCI++vBnf+vzlyMnKQOPpTrz4/n7TqwaAAgbuf2kXftjdh9uuWSmZj0vnTMNvvj8Z7+84ik8ONkkEcPDEKVlmxtg/ac7tI6e4emrvKdzzF8PIz8kCEaGu1UwBn5ibAWazfsLA0CiuffgtM70NCgJgb0NJWZ7e+uep2y7B6uo5AAE5mWlwHsClNhUZQLqRikOjwAjolt4+CGYXcEgu2hD7/TeHzuDFIy9iUXE2dnQMKHYr8A/vH0drZz/uv3VNPKon1jLT03DdmiW4UuEdfGdPvf2wAkEQCyvDwulb1i1muZpTuHz5HDAD4XisfaKuXzgcRhRW+JwozKXz6oTT0xwHUCu2GZvmXPxXVpiHEK2aBPe+YB0gljml9C9zkoGLpBIPwFCEsbNjMK4lmxWOnErZ0wdP45u/egONrZ3KcYqE0T84gg21HYrT7VWTJjiF7MOLMk40t9usIrk78svhISbM6A6GYGlonNBNNX34P2YvKQ7gfEFOQpadX7qyzF0SbVvHID7787fwk/WLcN2aJZpz+8yWl5OJT35yG042t6GmsQ17687izZOdCFtdi2nvFK9VwLi2sgjVM0oxf3oZ5lROsp1LbAtUtd8XK3xl/fDg5bMxu7wE//bGPhzrG4V0BA371wHsa8CS/e+eKsapMAONgMkH/ekyYkFDgpxOJZotGoKxsU4Gx2sKRAH8/YbDeHtvI37xreviWL8OSl40uwKLZlfgC1cD/xhl9PYNYHhkDH1DYxgbCwHMMAIBFOZlIis9HQUFOUjXJoxSfBcKqoJ13B0hJ2jgjs+ugmEYeGJ6Gb7zxEbs7x7R23mSvFDr9zGrgn1tRuuQvVSUi7fWP8mFFwapUFhkBdF+ILXicClhp2xuH0TPuUFXApDexSCUFObh/Js1FhYcdbZi2gOhCFrbuzF1UgkmFhfgka9fi+/9x0Zs7xxSgGRiJrMGRtdl2GgJwfwuJWHh9tBiduKVEm6lxQi1lcN1SRAE10OTLDAlIy2Vp3v743CSLBYhD4Nw32PvouVsN0BASWEeHrpvPdaU5aqP0bMFjSq5AavdAn5YcrqPIq+eBJBtoVys0TQTdqcamGClrSN/J8edisEQ5IjiioQjyHJJF/+vabYoYtbkyzDQMBTC3Y9uREOL6UsoLszFv923HtdNL9SzeWXqv1NZJhtKKZ90psAQUlEiJi3dkPc96X0CpCEN1rwcK7VXlr6PH4ZuvVROWgA5SbB/sfUPjaK3fxjn+gbR2dOHVuuQiD1HGszd6+r8QlwZ1CnIp4bDuOvRd1DXfBYMoCA3Gz++5zNY76idRK7AAIkqH+u4JwRvkjXnPqBgb18Ay4fByOfcex1oQAKYTJJhGfudfObDrJ5ScN7g9Ie7j+Orz2+z1BPDApgSJDc9Kw0v/e2NEkIZv4ZU/jiS1rA9FMGdj72HN//+ZhTmZSE7KxM3rJyFDc27fehUMpyuChVjsJYIA6nAAQK2auHqB7kdbKQrLqmrPCjqBKqcfPO7Cbnp57X8wyNj+NfX98IwDBiGASJOFLS2OmwaDuFPm/Z7+7hEG1Ihxh/+b5eiyDIjB4ZH8LpHuJlO7LBSDLuvA3FKkkPZx+JqDSaFUwhxRwh5AUeOl3Wyt70t5zDo43QRsb27/SjqB0OyriHkCfzTRyeUiahiQVLdOc8E4Lm7LsOqxTPBYPT0DeFvn9gQPymMwYgyIxq1/rX9R5paUKQgODd+GUEKzMB0Ky/AzpxJQ3EylCGifgn5Znq+RBZmt/wTrDVxTcKpVDswhm/88nXcuXYh5lZOwpSJhZq6xnZ0cBj//s4hvdUKp6fu0Vd34J+/dp3DB8HsReimS+C5u9bg4gWVYADdvQP4/pPvYGv7IACgPCOIp752NYrysxWzxDje2IYvP7fZmnGSxaKy3K4sXo1UEICO0nT+Duh1ewdvJAdZOb+X3UYJyo8BLoB5FtDOl8zDpOflpuP6pdNQPbccs6aVIT9HthA2bKlB+1hUIjVn7mrC/HqtvhtX7ajB1ZcsACynT+/wmPKAysQ4Cb++/VNYbi1+e9c5fO+pd7GrK1Ed9OLyAlSWT4Cu9Gv1gkpEI58gEHDqJu6nCIrilRFNhRKYFlAbneRihIg7W73L7dCPTEQJpRCOg59J6s/87Vj/GI5tqQM214GZcfPsUqxZOBVzpk/EhMJcHD55Gj99v8ZheVCcEFURD+bnb728B+t3nkRORgAv13ZagA87Jpo4sUcjkUi8pN3pjl7c//g7FhyceMlXT3biond2Y7LlTk5MhtnLoYazVjk9dl9rFw5MIBhIRUSQkZxjm+0mm30RNUyLPIwiBoHYj/aREMZkAH+q68Sf6jpN+oiy+R6s1bG1ChWBsfFUb1wsyBKZbEEehEAggGf+vANzp03Az9464Dz0yRYL8b/fPZqEW8TNjwyFNWIhgamIB6CAkZS1Rb6JREcIzh1GWnNTLcg5brraQtLjRrSbyUqyd4jZpUB0wrMXxycsV/avdjYCOxu91sv/76yvFuImEsZSkRjCEcb5pymyq/hwHs6twzpVdXb0E0BaeEmkUJ/1dljBp4Q/DcOQD/wmKAueaf9WVtI3390IGHEiZJXZqakazpQiHSCpyCZXi8CJAZCrv4Al8pdltVeYjdcINcqmNB4Bo2BCZ/9oXCTk5WThj/ddJeQq+p81t9EaBmHFwqp4n/1Do1IOgrMoVuKZaakQAcFAwKP6JitPAiFlrTY3PqCyHkjhilHIamkGWRPGyu6HncRZvw17dZSxTxDBhuZetHWdQ1lJAZhjp5naEM542pdTrBASrl1iyw4iGQoXI4tj8/zxoWaBiwnJAvH4S8boWAqSQ6PRiMtmYo/d60b1Krxf53zxCHBkv1/6cKPFIEHlOUG2UthE+MVLmzE0MmpbQHbU+SGKldsnG/CFeJwigzQ1EcXPZr+bdtTg+aNnFZVExVc2CT1CKbACZpQW4FBDBy6sqRU4Oi9R4t4/u1gZKruD/eCarLZfXqnrQsNDf8bd6xaianIJgnb/u7X745yABNxElQCgilUE0HVuEB/ur8eTe1sUflfFHJP5XpGwv0gO13a8rT/tpp++ODbGqSQACXdTyFr1siUTFuVFSGr7X/+9Xvx5vKr2vC23QA+BONiLsznFZjQSwd/duqr43iuW9FyQCJhblhcqCBrH/OrffqffuahONusmGEijP4jXuqhwwnc6l5RaD3F1AuksFfZx4gbZOZJwyAWzVFtZ/1zzc3FGsMFr8X0RAADkpwU2SM5IIq0yp8cL3WjWjmE57SWyzCGZRGzXSQc6yO5akvwZOlCIlOpn4hdyqig660GcI4awwPLikf3YePEwbFLjrs7nmfcVpgff87O2vghgxoTcJ3MCOoeE/izgBITHkoLkh4odRiOzYC6rso9YwSkU5cB8cSznM0gBPqkPlIJNnrNk+5MKIBAXWiUJWTfn9vti0UqMgZHQoykjgMe+e3NNDuFZ/Z7RUCSrB+jG3MUS3+QKd+qPVWdlpK1KYdIDwh4CXHGMTMw3YZsXyYhR7H5WWD6ilk9+iNW8qCRIf9z+0N37U0YAAFCek/ZAYZBOqRfM4/gyHwEkcAl41geX6LEFUh7vJsJuJClXpHoeqQidPcxfdnIDJb5B0CapSKeS+CvQE2Q+8xdLKr6bSug+3irueWReWnbGpkDAmHx+uFYyoWRew2WP/twtC399wyfqqLpO57vwkyQogmukeV9nyzRocFFJ9jUv/OCLW/zOaFKJvy2//uaxJUXZ64oCdExWSDwUE5BmYZIUK7rJI83O0S62avfpUt3I4zM076h7D7fvbWgkfBSPti7JADdePiVvbTKLnzQHiLUHHn0ts6b13IOnB0PfHiYqkqBT9rJfyZ+VTopTwDVKlwNcUW4yXR9eHCBJF4MnHOLVN7twL5LeuyBAI0UGPXLjxdP+6ZtfWNeDC+CpSbenXt+e/8rWE9eHCdf0jkaWdIfCeaGoXQbbj463xdKTBFsrRxO/hxJ1nHzAfQochcxYO60AYacpai8kpeTcDK/AOBJzPsjNC6IxpoV5IWZkBQPICxrnMoLG4eL0wOZpxbl//OVf39iD8Tbextt4G2/jbbyNt/E23sbbeBtv4228jbfxNt7G23jTtv8LhUN7zZm3+zkAAAAASUVORK5CYII=
         """
-        icon = tk.PhotoImage(data=icon_png_base64)
-        root.iconphoto(False, icon)
+        # Decoding the icon is not needed for the first paint
+        root.after_idle(lambda: root.iconphoto(False, tk.PhotoImage(data=icon_png_base64)))
+        describe_cache.on_update = self._on_describe_update
         self.setup_ui()
+        startup_mark("ui built")
+        self._saved_rows = None
+        self._live = False
+        self.daemon = None
+        self._publish_snapshot(sort_projects(load_project_snapshot(), self.sort_mode))
+        startup_mark("snapshot loaded")
+        # Watchers, scanners and the first `ddev list` start once the window is up
+        root.after_idle(self._start_background)
+
+    def _start_background(self):
+        startup_mark("first paint")
+        self.daemon = DaemonClient.connect()
+        self.project_index = ProjectIndex(PROJECTS_DIR)
+        self.project_index.on_change = self.refresh_projects
+        self.resource_monitor = ResourceMonitor(self.on_resources, stats_source=self._stats_source)
+        self.resource_monitor.start()
+        describe_cache.loader = self._describe_via_daemon
+        if self.daemon:
+            # The daemon already watches folders, docker events and disk usage for every client
+            threading.Thread(target=self._follow_daemon, daemon=True).start()
+        else:
+            self._start_watchers()
+            self.purge_trash()
         self.refresh_projects_periodically()
+        self.root.after(IDLE_CHECK_INTERVAL, self.check_idle_projects)
+        if settings.get("metrics_textfile"):
+            self.root.after(METRICS_INTERVAL, self.write_metrics_periodically)
+        startup_mark("background started")
 
     def setup_ui(self):
         self.main_frame = tk.Frame(self.root)
@@ -99,7 +2928,7 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
         self.sidebar = tk.Frame(self.main_frame, width=200)
         self.sidebar.pack(side=tk.LEFT, fill=tk.Y)
 
-        self.project_listbox = tk.Listbox(self.sidebar)
+        self.project_listbox = tk.Listbox(self.sidebar, selectmode=tk.EXTENDED, exportselection=False)
         self.project_listbox.pack(fill=tk.BOTH, expand=True)
         self.project_listbox.bind('<<ListboxSelect>>', self.on_project_select)
 
@@ -115,6 +2944,39 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
         self.new_wp_project_button = tk.Button(self.sidebar, text="Install WordPress Core", command=self.install_wordpress_core)
         self.new_wp_project_button.pack(fill=tk.X)
 
+        self.template_button = tk.Button(self.sidebar, text="New From Template", command=self.create_from_template)
+        self.template_button.pack(fill=tk.X)
+        self.jobs_button = tk.Button(self.sidebar, text="Jobs", command=self.show_jobs)
+        self.jobs_button.pack(fill=tk.X)
+        self.resources_button = tk.Button(self.sidebar, text="Resources", command=self.show_resources)
+        self.resources_button.pack(fill=tk.X)
+        self.performance_button = tk.Button(self.sidebar, text="Performance", command=self.show_performance)
+        self.performance_button.pack(fill=tk.X)
+
+        parallel_frame = tk.Frame(self.sidebar)
+        parallel_frame.pack(fill=tk.X)
+        tk.Label(parallel_frame, text="Parallel jobs:").pack(side=tk.LEFT)
+        self.parallel_var = tk.IntVar(value=self.executor.max_workers)
+        tk.Spinbox(
+            parallel_frame, from_=1, to=32, width=4, textvariable=self.parallel_var,
+            command=self.on_parallel_change
+        ).pack(side=tk.LEFT)
+
+        sort_frame = tk.Frame(self.sidebar)
+        sort_frame.pack(fill=tk.X)
+        tk.Label(sort_frame, text="Sort by:").pack(side=tk.LEFT)
+        self.sort_var = tk.StringVar(value=self.sort_mode)
+        sort_box = ttk.Combobox(sort_frame, textvariable=self.sort_var, values=SORT_MODES, state="readonly", width=8)
+        sort_box.pack(side=tk.LEFT)
+        sort_box.bind("<<ComboboxSelected>>", self.on_sort_change)
+        self.bulk_status = tk.Label(self.sidebar, text="", anchor="w", justify=tk.LEFT, wraplength=200)
+        self.bulk_status.pack(fill=tk.X)
+
+        details_frame = tk.LabelFrame(self.sidebar, text="Details")
+        details_frame.pack(fill=tk.X)
+        self.details_label = tk.Label(details_frame, text="", anchor="w", justify=tk.LEFT, wraplength=200)
+        self.details_label.pack(fill=tk.X)
+
         self.controls = tk.Frame(self.main_frame)
         self.controls.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
@@ -122,6 +2984,7 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
             ("Start", self.start_project),
             ("Stop", self.stop_project),
             ("Restart", self.restart_project),
+            ("Stop All Running", self.stop_all_running),
             ("Open Browser", self.open_browser),
             ("Open Adminer", self.open_adminer),
             ("Open Folder", self.open_project_folder),
@@ -137,102 +3000,612 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
             ("Enable Memcached", lambda: self.enable_service("memcached")),
             ("Reset WP Admin Users", self.reset_admin_users),
             ("Prepare dev environment", self.setup_environment),
+            ("Save as Template", self.save_as_template),
+            ("Idle Auto-Stop…", self.idle_settings),
         ]
 
         for text, command in buttons:
             btn = tk.Button(self.controls, text=text, command=command)
             btn.pack(fill=tk.X, pady=2)
 
-    def run_ddev_command(self, project, command):
-        def worker():
-            project_path = PROJECTS_DIR / project
+        self.setup_console()
+
+    def setup_console(self):
+        self.console_frame = tk.Frame(self.root)
+        self.console_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, before=self.main_frame)
+
+        header = tk.Frame(self.console_frame)
+        header.pack(fill=tk.X)
+        tk.Label(header, text="Console").pack(side=tk.LEFT)
+        tk.Button(header, text="Close tab", command=self.close_console_tab).pack(side=tk.RIGHT)
+
+        self.console_tabs = ttk.Notebook(self.console_frame, height=160)
+        self.console_tabs.pack(fill=tk.BOTH, expand=True)
+        self._console = {}  # job id → (job, tab frame, text widget, last line seq)
+        self.root.after(CONSOLE_UPDATE_INTERVAL, self._pump_console)
+
+    def close_console_tab(self):
+        current = self.console_tabs.select()
+        for job_id, (job, frame, text, seq) in list(self._console.items()):
+            if str(frame) == current:
+                self.console_tabs.forget(frame)
+                frame.destroy()
+                self._console[job_id] = (job, None, None, job.output_seq)
+
+    def _console_tab(self, job):
+        frame = tk.Frame(self.console_tabs)
+        text = tk.Text(frame, height=10, wrap=tk.NONE, state=tk.DISABLED)
+        scroll = tk.Scrollbar(frame, command=text.yview)
+        text.configure(yscrollcommand=scroll.set)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.tag_configure("stderr", foreground="red")
+        text.tag_configure("cmd", foreground="blue")
+        self.console_tabs.add(frame, text=f"#{job.id} {job.project or ''} {job.title}".strip())
+        self.console_tabs.select(frame)
+
+        # Drop the oldest finished tabs once there are too many
+        tabs = [(job_id, entry) for job_id, entry in self._console.items() if entry[1] is not None]
+        for job_id, (old_job, old_frame, _text, seq) in tabs[:max(0, len(tabs) + 1 - CONSOLE_MAX_TABS)]:
+            if old_job.finished is not None:
+                self.console_tabs.forget(old_frame)
+                old_frame.destroy()
+                self._console[job_id] = (old_job, None, None, seq)
+        return frame, text
+
+    def _pump_console(self):
+        # One batched Text update per interval no matter how chatty the commands are
+        try:
+            for job in self.executor.snapshot():
+                job_id = job.id
+                _job, frame, text, seq = self._console.get(job_id, (job, None, None, 0))
+                if job.output_seq <= seq:
+                    continue
+                if frame is None:
+                    if job_id in self._console:
+                        continue  # tab was closed
+                    frame, text = self._console_tab(job)
+                lines, skipped, last = job.output_since(seq)
+                text.configure(state=tk.NORMAL)
+                at_end = text.yview()[1] >= 0.999
+                if skipped > 0 and seq:
+                    text.insert(tk.END, f"... {skipped} lines skipped\n", "cmd")
+                for _seq, stream, line in lines:
+                    text.insert(tk.END, line + "\n", stream)
+                line_count = int(text.index("end-1c").split(".")[0])
+                if line_count > CONSOLE_MAX_LINES:
+                    text.delete("1.0", f"{line_count - CONSOLE_MAX_LINES}.0")
+                if at_end:
+                    text.see(tk.END)
+                text.configure(state=tk.DISABLED)
+                self._console[job_id] = (job, frame, text, last)
+        finally:
+            self.root.after(CONSOLE_UPDATE_INTERVAL, self._pump_console)
+
+    def run_ddev_command(self, project, command, on_success=None):
+        return self.submit_job(project, "ddev " + " ".join(command), self._ddev_task(project, command), on_success=on_success)
+
+    def _ddev_task(self, project, command):
+        daemon = self.daemon
+        if not daemon or len(command) != 1 or command[0] not in CLI_ACTIONS:
+            return lambda job: run_ddev(job, PROJECTS_DIR / project, command)
+
+        # Lifecycle commands queue in the daemon, one job per project across all clients
+        def task(job):
+            shell_pool.recycle(PROJECTS_DIR / project)
             try:
-                result = subprocess.run(
-                    [DDEV_COMMAND] + command,
-                    cwd=project_path,
-                    encoding="utf-8",
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode != 0:
-                    self.show_error("Error", result.stderr)
-            except Exception as e:
-                self.show_error("Exception", str(e))
-
-        threading.Thread(target=worker, daemon=True).start()
+                return daemon.run_job(job, [command[0], project])
+            finally:
+                describe_cache.invalidate(PROJECTS_DIR / project)
+        return task
+
+    def submit_job(self, project, title, fn, on_success=None, error_title="Error"):
+        if project:
+            self.idle_tracker.touch(project)
+        def on_done(job):
+            if job.state == "failed":
+                self.show_error(error_title, format_job_error(job))
+            elif job.state == "done" and on_success:
+                self.root.after(0, lambda: on_success(job.result))
+
+        return self.executor.submit(project, title, fn, on_done=on_done)
 
     def show_error(self, title, message):
         self.root.after(0, lambda: messagebox.showerror(title, message))
 
-    def refresh_projects(self):
-        # Remember current selection (by project name)
-        current_selection = self.project_listbox.curselection()
-        selected_project_name = None
-        if current_selection:
-            label = self.project_listbox.get(current_selection[0])
-            # label is like: "[running] nest"
-            selected_project_name = label.split(' ', 1)[1]
-
-        # Clear listbox
-        self.project_listbox.delete(0, tk.END)
-
-        # Get ddev data
-        ddev_entries = self.get_ddev_raw_entries()
-
-        # Map absolute approot → status
-        status_by_path = {
-            str(Path(entry["approot"]).resolve()): entry["status"]
-            for entry in ddev_entries
-        }
+    def show_info(self, title, message):
+        self.root.after(0, lambda: messagebox.showinfo(title, message))
 
-        # Custom order: running → paused → stopped → unknown/other
-        status_priority = {
-            "running": 0,
-            "paused": 1,
-            "stopped": 2,
-            "unknown": 3,
-        }
+    def show_jobs(self):
+        if self.jobs_window is not None and self.jobs_window.winfo_exists():
+            self.jobs_window.lift()
+            return
 
-        # Collect all projects first
-        projects = []
-        for d in PROJECTS_DIR.iterdir():
-            if not (d / ".ddev").exists():
-                continue
+        win = tk.Toplevel(self.root)
+        win.title("Jobs")
+        self.jobs_window = win
 
-            resolved_path = str(d.resolve())
-            raw_status = status_by_path.get(resolved_path, "unknown")
-            status = (raw_status or "unknown").lower()
+        tree = ttk.Treeview(win, columns=("project", "task", "state", "elapsed", "progress"), show="headings", height=14)
+        for column, heading, width in (
+            ("project", "Project", 140), ("task", "Task", 260), ("state", "State", 80), ("elapsed", "Elapsed", 70),
+            ("progress", "Progress", 360)
+        ):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor="w")
+        tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=(8, 4))
 
-            projects.append({
-                "name": d.name,
-                "status": status,
-                "resolved_path": resolved_path,
-            })
+        def on_cancel():
+            by_id = {str(job.id): job for job in self.executor.snapshot()}
+            for item in tree.selection():
+                job = by_id.get(item)
+                if job and job.state in ("queued", "running"):
+                    self.executor.cancel(job)
 
-        # Sort projects by status, then by name
-        projects.sort(
-            key=lambda p: (
-                status_priority.get(p["status"], 99),
-                p["name"].lower()
-            )
+        tk.Button(win, text="Cancel selected", command=on_cancel).pack(side=tk.RIGHT, padx=8, pady=(0, 8))
+
+        def update():
+            if not win.winfo_exists():
+                return
+            jobs = self.executor.snapshot()
+            ids = {str(job.id) for job in jobs}
+            for item in tree.get_children():
+                if item not in ids:
+                    tree.delete(item)
+            for job in reversed(jobs):
+                values = (job.project or "-", job.title, job.state, f"{job.elapsed:.1f}s", job.progress)
+                item = str(job.id)
+                if tree.exists(item):
+                    tree.item(item, values=values)
+                else:
+                    tree.insert("", tk.END, iid=item, values=values)
+            win.after(500, update)
+
+        update()
+
+    def show_resources(self):
+        if self.resources_window is not None and self.resources_window.winfo_exists():
+            self.resources_window.lift()
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title("Resources")
+        self.resources_window = win
+        canvas = tk.Canvas(win, width=620, height=400, background="white")
+        canvas.pack(fill=tk.BOTH, expand=True)
+
+        def sparkline(x, y, width, height, values, color):
+            peak = max(values) or 1
+            step = width / max(len(values) - 1, 1)
+            points = []
+            for i, value in enumerate(values):
+                points += [x + i * step, y + height - value * height / peak]
+            if len(points) >= 4:
+                canvas.create_line(*points, fill=color)
+
+        def update():
+            if not win.winfo_exists():
+                return
+            canvas.delete("all")
+            usage = self.resource_monitor.snapshot()
+            rows = sorted(usage.items(), key=lambda item: -item[1]["mem"])
+            if not rows:
+                canvas.create_text(10, 10, anchor="nw", text="No running ddev containers.")
+            for index, (site, entry) in enumerate(rows):
+                y = 10 + index * 44
+                services = ", ".join(
+                    f"{service} {cpu:.0f}%/{format_bytes(mem)}"
+                    for service, (cpu, mem) in sorted(entry["services"].items())
+                )
+                canvas.create_text(
+                    10, y, anchor="nw",
+                    text=f"{self._site_to_project.get(site, site)}: cpu {entry['cpu']:.0f}%, mem {format_bytes(entry['mem'])}"
+                )
+                canvas.create_text(10, y + 16, anchor="nw", text=services, fill="gray40")
+                series = self.resource_monitor.series(site)
+                sparkline(420, y, 90, 30, [cpu for _t, cpu, _mem in series], "red")
+                sparkline(520, y, 90, 30, [mem for _t, _cpu, mem in series], "blue")
+            canvas.config(scrollregion=(0, 0, 620, 20 + len(rows) * 44))
+            win.after(STATS_UPDATE_INTERVAL * 1000, update)
+
+        update()
+
+    def show_performance(self):
+        if self.performance_window is not None and self.performance_window.winfo_exists():
+            self.performance_window.lift()
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title("Performance")
+        self.performance_window = win
+
+        tree = ttk.Treeview(
+            win, columns=("kind", "count", "p50", "p95", "max", "failures", "cancelled", "output"),
+            show="headings", height=16
         )
+        for column, heading, width in (
+            ("kind", "Command", 180), ("count", "Calls", 60), ("p50", "p50", 70), ("p95", "p95", 70),
+            ("max", "Max", 70), ("failures", "Failed", 60), ("cancelled", "Cancelled", 70), ("output", "Output", 90)
+        ):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor="w")
+        tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=(8, 4))
+        source_label = tk.Label(win, anchor="w")
+        source_label.pack(fill=tk.X, padx=8)
+
+        def records():
+            local = tracer.snapshot()
+            daemon = self.daemon
+            if not daemon:
+                return local, "This window's subprocess calls"
+            try:
+                remote = daemon.request("GET", "/traces")["records"]
+            except Exception as e:
+                return local, f"This window only, daemon unavailable: {e}"
+            return local + remote, "This window and the daemon"
 
-        # Rebuild listbox in sorted order
-        new_index_to_select = None
+        def export(kind):
+            if kind == "jsonl":
+                path = filedialog.asksaveasfilename(
+                    title="Export traces", defaultextension=".jsonl", filetypes=[("JSON lines", "*.jsonl")])
+            else:
+                path = filedialog.asksaveasfilename(
+                    title="Export Prometheus textfile", defaultextension=".prom", filetypes=[("Prometheus", "*.prom")])
+            if not path:
+                return
+            try:
+                if kind == "jsonl":
+                    tracer.write_jsonl(path)
+                else:
+                    tracer.write_prometheus(path)
+            except OSError as e:
+                messagebox.showerror("Export failed", str(e))
+
+        buttons = tk.Frame(win)
+        buttons.pack(fill=tk.X, padx=8, pady=(4, 8))
+        tk.Button(buttons, text="Export JSON lines…", command=lambda: export("jsonl")).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Export Prometheus…", command=lambda: export("prom")).pack(side=tk.LEFT, padx=4)
+        tk.Button(buttons, text="Clear", command=tracer.clear).pack(side=tk.RIGHT)
+
+        def seconds(value):
+            return "-" if value is None else f"{value * 1000:.0f} ms" if value < 1 else f"{value:.1f} s"
+
+        def update():
+            if not win.winfo_exists():
+                return
+            all_records, source = records()
+            summary = trace_summary(all_records)
+            source_label.config(text=f"{source}, last {len(all_records)} calls")
+            for item in tree.get_children():
+                if item not in summary:
+                    tree.delete(item)
+            for kind, entry in sorted(summary.items(), key=lambda item: -item[1]["p95"]):
+                values = (
+                    kind, entry["count"], seconds(entry["p50"]), seconds(entry["p95"]), seconds(entry["max"]),
+                    entry["failures"], entry["cancelled"], format_bytes(entry["output_bytes"])
+                )
+                if tree.exists(kind):
+                    tree.item(kind, values=values)
+                else:
+                    tree.insert("", tk.END, iid=kind, values=values)
+            win.after(2000, update)
+
+        update()
+
+    def write_metrics_periodically(self):
+        # A running daemon owns the textfile, its numbers cover every client
+        if not self.daemon:
+            threading.Thread(target=write_metrics_textfile, daemon=True).start()
+        self.root.after(METRICS_INTERVAL, self.write_metrics_periodically)
+
+    def _start_watchers(self):
+        self.index_watcher = ProjectIndexWatcher(self.project_index)
+        self.index_watcher.start()
+        self.disk_scanner = DiskUsageScanner(
+            lambda: {name: entry["resolved_path"] for name, entry in self.project_index.snapshot().items()},
+            on_update=self.on_disk_usage,
+        )
+        self.disk_scanner.start()
+        self.status_watcher = ProjectStatusWatcher(
+            self.on_project_status,
+            on_connect=self.refresh_projects,
+        )
+        self.status_watcher.start()
 
-        for idx, proj in enumerate(projects):
-            # If you prefer capitalised labels, use proj["status"].capitalize()
-            label = f"[{proj['status']}] {proj['name']}"
-            self.project_listbox.insert(tk.END, label)
+    def _stats_source(self):
+        return self.daemon.stats_stream() if self.daemon else docker_stats_stream()
 
-            if proj["name"] == selected_project_name:
-                new_index_to_select = idx
+    def _describe_via_daemon(self, project_path):
+        daemon = self.daemon
+        return daemon.describe(project_path) if daemon else None
 
-           # Restore selection if possible
-        if new_index_to_select is not None:
-            self.project_listbox.select_set(new_index_to_select)
-            self.project_listbox.event_generate("<<ListboxSelect>>")
+    def _follow_daemon(self):
+        delay = 1
+        while True:
+            try:
+                for event in self.daemon.stream("/events"):
+                    delay = 1
+                    self._on_daemon_event(event)
+            except Exception as e:
+                print("Lost connection to the daemon:", e)
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+            client = DaemonClient.connect()
+            if client is None:
+                # The daemon is gone, this window goes back to watching on its own
+                self.root.after(0, self._leave_daemon)
+                return
+            self.daemon = client
 
+    def _leave_daemon(self):
+        # On the Tk thread, and the watchers exist before anything stops asking the daemon
+        self._start_watchers()
+        self.daemon = None
+        self.refresh_projects()
+
+    def _on_daemon_event(self, event):
+        if event["type"] == "describe":
+            describe_cache.store(PROJECTS_DIR / event["project"], event["describe"])
+        elif event["type"] == "projects":
+            projects = event["projects"]
+            with self._snapshot_lock:
+                previous = {p["name"]: p["status"] for p in self._snapshot}
+            for proj in projects:
+                if proj["name"] in previous and previous[proj["name"]] != proj["status"]:
+                    # The container behind any open shell session just started or went away
+                    shell_pool.recycle(PROJECTS_DIR / proj["name"])
+                    describe_cache.invalidate(PROJECTS_DIR / proj["name"])
+            self._remember_sites(projects)
+            self._merge_refresh(projects, time.time())
+
+    def _remember_sites(self, projects):
+        for proj in projects:
+            # Docker events only carry the ddev site name
+            if proj.get("site"):
+                self._site_to_project[proj["site"]] = proj["name"]
+            if proj.get("url"):
+                self._primary_urls[proj["name"]] = proj["url"]
+
+    def _merge_refresh(self, projects, started):
+        def merge(current):
+            by_name = {p["name"]: p for p in current}
+            merged = []
+            for proj in projects:
+                old = by_name.get(proj["name"])
+                if old is not None:
+                    # Keep the last cpu/mem readings, they arrive separately from the stats stream
+                    proj = dict(proj, cpu=old.get("cpu"), mem=old.get("mem"))
+                    # A docker event that landed after this refresh's `ddev list` started is newer
+                    if self._status_times.get(proj["name"], 0) > started:
+                        proj["status"] = old["status"]
+                merged.append(proj)
+            return sort_projects(merged, self.sort_mode)
+
+        return self._update_snapshot(merge)
+
+    def refresh_projects(self):
+        # Share an in-flight refresh instead of starting another `ddev list`,
+        # but run once more after it, it may have scanned before the change
+        with self._refresh_lock:
+            if self._refresh_running:
+                self._refresh_pending = True
+                return
+            self._refresh_running = True
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
+
+    def _refresh_worker(self):
+        while True:
+            try:
+                self._refresh_once()
+            except Exception as e:
+                print("Error refreshing projects:", e)
+            with self._refresh_lock:
+                if not self._refresh_pending:
+                    self._refresh_running = False
+                    return
+                self._refresh_pending = False
+
+    def _refresh_once(self):
+        started = time.time()
+        projects = self._merge_refresh(self.collect_projects(), started)
+        if not self._live:
+            self._live = True
+            startup_mark("live data")
+            if "--startup-profile" in sys.argv:
+                print(startup_report())
+        rows = [(p["name"], p["status"], p.get("size"), p.get("db_size")) for p in projects]
+        if rows != self._saved_rows:
+            save_project_snapshot(projects)
+            self._saved_rows = rows
+        describe_cache.prefetch([
+            PROJECTS_DIR / p["name"] for p in projects
+            if p["status"] == "running" and not describe_cache.is_fresh(PROJECTS_DIR / p["name"])
+        ])
+
+    def collect_projects(self):
+        daemon = self.daemon
+        if daemon:
+            projects = daemon.request("GET", "/projects")["projects"]
+        else:
+            ddev_entries = self.get_ddev_raw_entries()
+            # The index keeps folders current without a rescan
+            self.project_index.ensure_loaded()
+            projects = project_rows(self.project_index, ddev_entries, self.disk_scanner.sizes)
+        self._remember_sites(projects)
+        return sort_projects(projects, self.sort_mode)
+
+    def _publish_snapshot(self, projects):
+        return self._update_snapshot(lambda current: projects)
+
+    def _update_snapshot(self, change):
+        # Read, change and publish in one critical section so concurrent writers can't undo
+        # each other; change gets copies of the rows and returns the new list, or None to skip
+        with self._snapshot_lock:
+            previous = self._snapshot
+            projects = change([dict(p) for p in previous])
+            if projects is None:
+                return None
+            changes, count = diff_rows(previous, projects)
+            self._snapshot = projects
+            # Scheduled under the lock so row changes reach the listbox in the order they were made
+            if changes or count != len(previous):
+                self.root.after(0, lambda: self._apply_row_changes(changes, count))
+        return projects
+
+    def on_project_status(self, site, status):
+        name = self._site_to_project.get(site, site)
+        # The container behind any open shell session just started or went away
+        shell_pool.recycle(PROJECTS_DIR / name)
+        describe_cache.invalidate(PROJECTS_DIR / name)
+        self._status_times[name] = time.time()
+
+        def change(projects):
+            known = False
+            for proj in projects:
+                if proj["name"] == name:
+                    proj["status"] = status
+                    proj.pop("stale", None)
+                    known = True
+            return sort_projects(projects, self.sort_mode) if known else None
+
+        if self._update_snapshot(change) is None:
+            # A project we have not listed yet, fall back to a full refresh
+            self.refresh_projects()
+
+    def on_disk_usage(self, name, size, db_size):
+        def change(projects):
+            for proj in projects:
+                if proj["name"] == name:
+                    proj["size"] = size
+                    proj["db_size"] = db_size
+            return sort_projects(projects, self.sort_mode)
+
+        self._update_snapshot(change)
+
+    def on_resources(self, usage):
+        by_project = {self._site_to_project.get(site, site): entry for site, entry in usage.items()}
+        self.idle_tracker.observe(by_project)
+
+        def change(projects):
+            for proj in projects:
+                entry = by_project.get(proj["name"])
+                # Rounded so a row only repaints when the shown value moves
+                proj["cpu"] = round(entry["cpu"]) if entry else None
+                proj["mem"] = round(entry["mem"], -6) if entry else None
+            return sort_projects(projects, self.sort_mode)
+
+        self._update_snapshot(change)
+
+    def check_idle_projects(self):
+        try:
+            with self._snapshot_lock:
+                running = [p["name"] for p in self._snapshot if p["status"] == "running"]
+            usage = {
+                self._site_to_project.get(site, site): entry
+                for site, entry in self.resource_monitor.snapshot().items()
+            }
+            for project, idle_seconds in self.idle_tracker.idle_projects(running):
+                freed = (usage.get(project) or {}).get("mem", 0)
+                # Counts as activity so the same project is not picked again while it stops
+                self.idle_tracker.touch(project)
+                self.run_ddev_command(project, [self.idle_action])
+                log_idle_action(project, self.idle_action, idle_seconds, freed)
+        except Exception as e:
+            print(f"Idle check failed: {e}")
+        self.root.after(IDLE_CHECK_INTERVAL, self.check_idle_projects)
+
+    def idle_settings(self):
+        project = self.selected_project
+        tracker = self.idle_tracker
+
+        win = tk.Toplevel(self.root)
+        win.title("Idle Auto-Stop")
+        win.grab_set()
+
+        default_var = tk.IntVar(value=tracker.timeout_minutes)
+        action_var = tk.StringVar(value=self.idle_action)
+        tk.Label(win, text="Stop projects idle for (minutes, 0 = never):").pack()
+        tk.Spinbox(win, from_=0, to=10080, width=6, textvariable=default_var).pack()
+        tk.Label(win, text="Action:").pack()
+        ttk.Combobox(win, textvariable=action_var, values=IDLE_ACTIONS, state="readonly").pack()
+
+        if project:
+            pinned_var = tk.BooleanVar(value=project in tracker.pinned)
+            override_var = tk.StringVar(value=str(tracker.overrides.get(project, "")))
+            tk.Label(win, text=f"{project}:").pack(pady=(10, 0))
+            tk.Checkbutton(win, text="Pin (never auto-stop)", variable=pinned_var).pack()
+            tk.Label(win, text="Own timeout in minutes (empty = default):").pack()
+            tk.Entry(win, textvariable=override_var, width=8).pack()
+
+        tk.Label(win, text="Recently stopped:").pack(pady=(10, 0))
+        log_text = tk.Text(win, height=8, width=80)
+        log_text.insert("1.0", "".join(read_idle_log()) or "Nothing yet.")
+        log_text.config(state=tk.DISABLED)
+        log_text.pack(padx=8)
+
+        def on_submit():
+            try:
+                timeout_minutes = max(0, int(default_var.get()))
+            except (tk.TclError, ValueError):
+                messagebox.showerror("Error", "The idle timeout must be a whole number of minutes.", parent=win)
+                return
+            tracker.timeout_minutes = timeout_minutes
+            self.idle_action = action_var.get()
+            if project:
+                if pinned_var.get():
+                    tracker.pinned.add(project)
+                else:
+                    tracker.pinned.discard(project)
+                override = override_var.get().strip()
+                if override.isdigit():
+                    tracker.overrides[project] = int(override)
+                else:
+                    tracker.overrides.pop(project, None)
+            save_setting("idle_timeout_minutes", tracker.timeout_minutes)
+            save_setting("idle_action", self.idle_action)
+            save_setting("idle_pinned", sorted(tracker.pinned))
+            save_setting("idle_timeouts", tracker.overrides)
+            win.destroy()
+
+        tk.Button(win, text="Save", command=on_submit).pack(pady=10)
+
+    def on_sort_change(self, event=None):
+        self.sort_mode = self.sort_var.get()
+        save_setting("sort_by", self.sort_mode)
+        self._update_snapshot(lambda projects: sort_projects(projects, self.sort_mode))
+
+    def _apply_row_changes(self, changes, count):
+        selected_project_name = self.selected_project
+
+        for idx, proj in changes:
+            # If you prefer capitalised labels, use proj["status"].capitalize()
+            status = proj["status"] + ("?" if proj.get("stale") else "")
+            label = f"[{status}] {proj['name']}"
+            if proj.get("size") is not None:
+                label += f"  {format_bytes(proj['size'])}"
+                if proj.get("db_size"):
+                    label += f" + db {format_bytes(proj['db_size'])}"
+            if proj.get("cpu") is not None:
+                label += f"  cpu {proj['cpu']}% mem {format_bytes(proj['mem'])}"
+            if idx < self.project_listbox.size():
+                self.project_listbox.delete(idx)
+                self._row_names[idx] = proj["name"]
+            else:
+                self._row_names.append(proj["name"])
+            self.project_listbox.insert(idx, label)
+
+        if self.project_listbox.size() > count:
+            self.project_listbox.delete(count, tk.END)
+        del self._row_names[count:]
+
+        # Restore selection by name, rows may have moved
+        wanted = {self._row_names.index(name) for name in self.selected_projects if name in self._row_names}
+        if wanted != set(self.project_listbox.curselection()):
+            self.project_listbox.selection_clear(0, tk.END)
+            for idx in wanted:
+                self.project_listbox.select_set(idx)
+        self.selected_projects = [name for name in self.selected_projects if name in self._row_names]
+        if selected_project_name not in self._row_names:
+            self.selected_project = self.selected_projects[0] if self.selected_projects else None
 
     def open_project_folder(self):
         if self.selected_project:
@@ -244,50 +3617,148 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
         if platform.system() == "Windows":
             os.startfile(path)
         elif platform.system() == "Darwin":  # macOS
-            subprocess.run(["open", path])
+            traced_run(["open", path])
         else:  # Assume Linux/Unix
-            subprocess.run(["xdg-open", path])
+            traced_run(["xdg-open", path])
 
     def get_ddev_raw_entries(self):
-        try:
-            result = subprocess.run(
-                ["ddev", "list", "-j"],
-                capture_output=True,
-                encoding="utf-8",
-                check=True,
-                text=True
-            )
-            data = json.loads(result.stdout)
-            return data.get("raw", [])
-        except Exception as e:
-            print("Error running ddev list:", e)
-            return []
+        return ddev_list_entries()
 
     def refresh_projects_periodically(self):
         self.refresh_projects()
-        self.root.after(REFRESH_INTERVAL, self.refresh_projects_periodically)
+        # With the events stream up, polling is only a safety net
+        interval = REFRESH_INTERVAL
+        if self.daemon or self.status_watcher.connected:
+            interval = EVENTS_REFRESH_INTERVAL
+        self.root.after(interval, self.refresh_projects_periodically)
 
     def on_project_select(self, event):
         try:
             selection = event.widget.curselection()
             if selection:
-                index = selection[0]
-                label = self.project_listbox.get(index)
-                self.selected_project = label.split(' ', 1)[1]  # Skip symbol
+                self.selected_projects = [self._row_names[index] for index in selection]
+                self.selected_project = self.selected_projects[0]
         except Exception:
             self.selected_project = None
+            self.selected_projects = []
+        for project in self.selected_projects:
+            self.idle_tracker.touch(project)
+        self.show_details()
+
+    def show_details(self):
+        project = self.selected_project
+        if not project:
+            self.details_label.config(text="")
+            return
+        project_path = PROJECTS_DIR / project
+        raw = describe_cache.peek(project_path)
+        if raw:
+            lines = [
+                f"Type: {raw.get('type', '?')}",
+                f"PHP: {raw.get('php_version', '?')}",
+                f"Database: {raw.get('database_type', '?')} {raw.get('database_version', '')}".rstrip(),
+                f"Webserver: {raw.get('webserver_type', '?')}",
+            ]
+            lines += (raw.get("urls") or [raw.get("primary_url", "")])
+            for service in ("mailpit", "adminer"):
+                url = describe_service_url(raw, service)
+                if url:
+                    lines.append(f"{service.capitalize()}: {url}")
+            others = sorted(set(raw.get("services") or {}) - {"web", "db"})
+            if others:
+                lines.append("Services: " + ", ".join(others))
+        else:
+            # Fall back to config.yaml until describe data is in
+            try:
+                config = ProjectConfig.load(project_path)
+                db_type, db_version = config.database
+                lines = [
+                    f"Type: {config.project_type or '?'}",
+                    f"PHP: {config.php_version or '?'}",
+                    f"Database: {db_type} {db_version}",
+                    f"Webserver: {config.webserver_type or '?'}",
+                ]
+            except Exception:
+                lines = []
+            if self._project_status(project) == "running":
+                describe_cache.prefetch([project_path])
+        self.details_label.config(text="\n".join(lines))
+
+    def _project_status(self, project):
+        with self._snapshot_lock:
+            for proj in self._snapshot:
+                if proj["name"] == project:
+                    return proj["status"]
+        return None
+
+    def _on_describe_update(self, project_path, raw):
+        if self.selected_project and str(PROJECTS_DIR / self.selected_project) == str(project_path):
+            self.root.after(0, self.show_details)
 
     def start_project(self):
-        if self.selected_project:
-            self.run_ddev_command(self.selected_project, ["start"])
+        self.run_bulk("start", self.selected_projects)
 
     def stop_project(self):
-        if self.selected_project:
-            self.run_ddev_command(self.selected_project, ["stop"])
+        self.run_bulk("stop", self.selected_projects)
 
     def restart_project(self):
-        if self.selected_project:
-            self.run_ddev_command(self.selected_project, ["restart"])
+        self.run_bulk("restart", self.selected_projects)
+
+    def stop_all_running(self):
+        with self._snapshot_lock:
+            running = [p["name"] for p in self._snapshot if p["status"] in ("running", "paused")]
+        if not running:
+            messagebox.showinfo("Info", "No running projects.")
+            return
+        if messagebox.askyesno("Confirm", f"Stop {len(running)} running projects?"):
+            self.run_bulk("stop", running)
+
+    def on_parallel_change(self):
+        try:
+            value = max(1, int(self.parallel_var.get()))
+        except (tk.TclError, ValueError):
+            return
+        self.executor.set_max_workers(value)
+        save_setting("parallel_jobs", value)
+
+    def run_bulk(self, action, projects):
+        if not projects:
+            return
+        if len(projects) == 1:
+            return self.run_ddev_command(projects[0], [action])
+
+        bulk = {"done": 0, "failed": {}, "started": time.time()}
+
+        def update_status():
+            finished = bulk["done"] + len(bulk["failed"])
+            text = f"{action}: {finished}/{len(projects)} finished"
+            if bulk["failed"]:
+                text += f", {len(bulk['failed'])} failed"
+            if finished == len(projects):
+                text += f" in {time.time() - bulk['started']:.0f}s"
+            self.bulk_status.config(text=text)
+            if finished == len(projects):
+                self.refresh_projects()
+                if bulk["failed"]:
+                    summary = "\n".join(
+                        f"- {name}: {error.splitlines()[0] if error else 'failed'}"
+                        for name, error in sorted(bulk["failed"].items())
+                    )
+                    messagebox.showerror(
+                        f"{action.capitalize()} failed",
+                        f"{len(bulk['failed'])} of {len(projects)} projects failed:\n{summary}"
+                    )
+
+        def on_done(job):
+            if job.state == "done":
+                bulk["done"] += 1
+            else:
+                bulk["failed"][job.project] = format_job_error(job) if job.error else job.state
+            self.root.after(0, update_status)
+
+        for project in projects:
+            self.executor.submit(project, f"ddev {action}", self._ddev_task(project, [action]), on_done=on_done)
+        update_status()
 
     WP_CORE_PHP = {
         "index.php", "wp-activate.php", "wp-blog-header.php", "wp-comments-post.php",
@@ -296,54 +3767,45 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
     }
 
     def _read_docroot(self,project_path: Path, default="public") -> str:
-        cfg = project_path / ".ddev" / "config.yaml"
-        if not cfg.is_file():
-            return default
         try:
-            with cfg.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-                return str(data.get("docroot", default)).strip() or default
+            return ProjectConfig.load(project_path).get_docroot(default)
+        except FileNotFoundError:
+            return default
         except Exception as e:
             print(f"Error reading config.yaml: {e}")
             return default
 
-    def _wp_is_installed(self,project_path: Path) -> bool:
-        try:
-            force = subprocess.run(
-                ["ddev", "config", "--project-type=wordpress"],
-                cwd=project_path,
-                check=True,
-            )
-            res = subprocess.run(
-                ["ddev", "wp", "core", "is-installed"],
-                cwd=project_path,
-                check=True,
-            )
-            return res.returncode == 0
-        except Exception as e:
-            print(f"WP install check failed: {e}")
-            return False
-
-    def open_browser(self):
-        if not self.selected_project:
-            return
-
-        project_path = PROJECTS_DIR / self.selected_project
+    def _launch_target(self, project_path: Path):
         docroot = self._read_docroot(project_path)
         root = project_path / docroot
+        config_file = project_path / ".ddev" / "config.yaml"
+
+        try:
+            # Adding or removing files in the docroot bumps its mtime, config edits bump the yaml
+            signature = (
+                docroot,
+                root.stat().st_mtime_ns,
+                config_file.stat().st_mtime_ns if config_file.exists() else None,
+            )
+        except OSError:
+            return None
 
-        if not root.exists():
-            return self.run_ddev_command(self.selected_project, ["launch"])
+        cached = self._launch_cache.get(str(project_path))
+        if cached and cached[0] == signature:
+            return cached[1]
 
-        if self._wp_is_installed(project_path):
-            wp_admin = root / "wp-admin"
-            if wp_admin.is_dir():
-                return self.run_ddev_command(self.selected_project, ["launch", "/wp-admin"])
-            return self.run_ddev_command(self.selected_project, ["launch"])
+        target = self._scan_launch_target(root)
+        self._launch_cache[str(project_path)] = (signature, target)
+        return target
+
+    def _scan_launch_target(self, root: Path):
+        # A configured WordPress sends /wp-admin to the installer itself when the db is empty
+        if (root / "wp-config.php").is_file() and (root / "wp-admin").is_dir():
+            return "/wp-admin"
 
         installer = root / "installer.php"
         if installer.is_file():
-            return self.run_ddev_command(self.selected_project, ["launch", "/installer.php"])
+            return "/installer.php"
 
         try:
             candidates = sorted(p for p in root.glob("*.php") if p.name not in self.WP_CORE_PHP)
@@ -352,183 +3814,92 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
             candidates = []
 
         if candidates:
-            rel = "/" + candidates[0].name
-            return self.run_ddev_command(self.selected_project, ["launch", rel])
+            return "/" + candidates[0].name
 
         if (root / "wp-admin").is_dir():
-            return self.run_ddev_command(self.selected_project, ["launch", "/wp-admin"])
-
-        return self.run_ddev_command(self.selected_project, ["launch"])
-
-    def open_adminer(self):
-        if self.selected_project:
-            self.run_ddev_command(self.selected_project, ["adminer"])
+            return "/wp-admin"
 
-    def open_mailpit(self):
-        if self.selected_project:
-            self.run_ddev_command(self.selected_project, ["mailpit"])
+        return None
 
-    def reset_admin_users(self):
+    def open_browser(self):
+        import webbrowser
         if not self.selected_project:
-            messagebox.showerror("Error", "No project selected.")
             return
 
-        try:
-            project_path = PROJECTS_DIR / self.selected_project
-            config_path = project_path / ".ddev" / "config.yaml"
-            with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
-                docroot = config.get("docroot", "public")
-
-                wp_config = Path(config_path).parent.parent / docroot / "wp-config.php"
-
-                prefix = extract_table_prefix(wp_config, docroot, project_path)
-
-                get_admins_sql = (
-                    f"SELECT user_id FROM {prefix}usermeta "
-                    f"WHERE meta_key = '{prefix}capabilities' AND meta_value LIKE '%administrator%';"
-                )
-
-            result = subprocess.run(
-                [DDEV_COMMAND, "exec", "bash", "-c",
-                 f'wp --path={docroot} db query "{get_admins_sql}" --skip-column-names'],
-                cwd=project_path,
-                encoding="utf-8",
-                capture_output=True,
-                text=True,
-                check=True
-            )
+        project = self.selected_project
+        project_path = PROJECTS_DIR / project
+        target = self._launch_target(project_path)
 
-            user_ids = [line.strip() for line in result.stdout.splitlines() if line.strip().isdigit()]
+        raw = describe_cache.peek(project_path) or {}
+        url = raw.get("primary_url") or self._primary_urls.get(project)
+        if url:
+            webbrowser.open(url.rstrip("/") + (target or "/"))
+            return
 
-            if not user_ids:
-                messagebox.showinfo("Info", "No administrator users found.")
-                return
+        def task(job):
+            command = [DDEV_COMMAND, "launch"] + ([target] if target else [])
+            return job.run(command, cwd=project_path, check=True)
 
-            for idx, uid in enumerate(user_ids):
-                login = "admin" if idx == 0 else f"admin{idx}"
-                self.update_admin_user_sql(uid, login)
+        self.submit_job(project, "Open browser", task)
 
-            messagebox.showinfo("Success", f"Updated {len(user_ids)} admin users.")
+    def open_adminer(self):
+        if self.selected_project:
+            self.open_service(self.selected_project, "adminer")
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    def open_mailpit(self):
+        if self.selected_project:
+            self.open_service(self.selected_project, "mailpit")
 
+    def open_service(self, project, service):
+        import webbrowser
+        url = describe_service_url(describe_cache.peek(PROJECTS_DIR / project) or {}, service)
+        if url:
+            webbrowser.open(url)
+        else:
+            self.run_ddev_command(project, [service])
 
-    def update_admin_user_sql(self, uid, login):
+    def reset_admin_users(self):
         if not self.selected_project:
             messagebox.showerror("Error", "No project selected.")
             return
 
-        try:
-            project_path = PROJECTS_DIR / self.selected_project
-            config_path = project_path / ".ddev" / "config.yaml"
-
-            if not config_path.exists():
-                raise FileNotFoundError(f"{config_path} not found")
-
-            with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
+        project = self.selected_project
 
-            docroot = config.get("docroot", "public")
-
-            wp_config = Path(config_path).parent.parent / docroot / "wp-config.php"
-
-            prefix = extract_table_prefix(wp_config, docroot, project_path)
-
-            password_hash = "$P$Bk60b9sSLvYMTmfLn0njbnRavY8.6U0"
-
-            with tempfile.NamedTemporaryFile(
-                mode='w', delete=False, suffix=".sql", dir=project_path
-            ) as sql_file:
-                sql_file.write(
-                    f"UPDATE {prefix}users SET user_login = '{login}', "
-                    f"user_pass = '{password_hash}' WHERE ID = {uid};"
-                )
-                sql_filename = sql_file.name
-
-            filename_in_container = f"/var/www/html/{Path(sql_filename).name}"
-
-            bash_command = f"wp --path={docroot} db query < {filename_in_container}"
-
-            subprocess.run(
-                [DDEV_COMMAND, "exec", "bash", "-c", bash_command],
-                cwd=project_path,
-                check=True
-            )
-
-            Path(sql_filename).unlink()
-
-            print(f"Updated user ID {uid} to {login}")
+        def on_success(changes):
+            if not changes:
+                self.show_info("Info", "No administrator users found.")
+                return
+            lines = "\n".join(f"#{uid}: {old} → {new}" for uid, old, new in changes)
+            self.show_info("Success", f"Updated {len(changes)} admin users:\n{lines}")
 
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Error", f"Command failed:\n{e.stderr}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.submit_job(
+            project, "Reset WP admin users",
+            lambda job: reset_wp_admins(job, PROJECTS_DIR / project),
+            on_success=on_success
+        )
 
     def setup_environment(self):
         if not self.selected_project:
             messagebox.showerror("Error", "No project selected.")
             return
 
-        project_path = PROJECTS_DIR / self.selected_project
-        config_path = project_path / ".ddev" / "config.yaml"
-        with open(config_path, "r") as f:
-             config = yaml.safe_load(f)
-             docroot = config.get("docroot", "public")
-        container_docroot = f"/var/www/html/{docroot}"
-
-        smtp_plugins = [
-            "wp-mail-smtp", "wp-mail-smtp-pro" , "post-smtp", "easy-wp-smtp", "smtp-mailer", "gmail-smtp",
-            "sendinblue", "mailgun", "pepipost-smtp", "mailjet", "smtp-settings"
-        ]
-
-        other_plugins = [
-            "akismet", "hello-dolly", "hello"
-        ]
+        project = self.selected_project
+        project_path = PROJECTS_DIR / project
+        docroot = ProjectConfig.load(project_path).docroot
 
-        migration_plugin = "all-in-one-wp-migration"
-        setup_lines = []
-
-        for plugin in smtp_plugins:
-            setup_lines.append(f'''
-            cd {container_docroot} || exit 1
-            if wp plugin is-installed {plugin}; then
-                if wp plugin is-active {plugin}; then
-                    wp plugin deactivate {plugin};
-                fi
-                wp plugin delete {plugin};
-            fi
-            ''')
-
-        for plugin in other_plugins:
-            setup_lines.append(f'''
-            wp plugin delete {plugin};
-            ''')
-
-        setup_lines.append(f'''
-        if ! wp plugin is-installed {migration_plugin}; then
-            wp plugin install {migration_plugin} --activate;
-        elif ! wp plugin is-active {migration_plugin}; then
-            wp plugin activate {migration_plugin};
-        fi
-        wp rewrite flush --hard;
-        ''')
-
-        setup_script = "\n".join(setup_lines)
-
-        try:
-            subprocess.run(
-                ["ddev", "exec", "bash", "-c", setup_script],
-                cwd=project_path,
-                check=True
-            )
-            messagebox.showinfo("Setup Complete", f"Environment setup completed for {self.selected_project}.")
+        def on_success(report):
+            changed = [f"{name}: {action}" for name, action in report if action != "already active"]
+            summary = "\n".join(changed) if changed else "Nothing to change."
+            self.show_info("Setup Complete", f"Environment setup completed for {project}.\n{summary}")
 
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Setup Failed", f"Error setting up environment: {e}")
+        self.submit_job(
+            project, "Prepare dev environment",
+            lambda job: reconcile_plugins(job, project_path, docroot),
+            on_success=on_success, error_title="Setup Failed"
+        )
 
     def open_terminal_ssh(self):
+        import shutil
         if not self.selected_project:
             messagebox.showerror("Error", "No project selected.")
             return
@@ -560,25 +3931,39 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
         if self.selected_project:
             confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {self.selected_project}?")
             if confirm:
-                project_path = PROJECTS_DIR / self.selected_project
-                subprocess.run(
-                    ["ddev", "delete", "-Oy"],
-                    cwd=project_path,
-                    encoding="utf-8",
-                    capture_output=True,
-                    text=True
+                project = self.selected_project
+                project_path = PROJECTS_DIR / project
+                shell_pool.recycle(project_path)
+                describe_cache.invalidate(project_path)
+                self.selected_project = None
+                self.selected_projects = []
+
+                def task(job):
+                    # Containers go while their bind mounts (and Mutagen sync) still point at the folder
+                    job.run([DDEV_COMMAND, "delete", "-Oy"], cwd=project_path)
+                    try:
+                        target = move_to_trash(project_path)
+                    except OSError as e:
+                        # Windows refuses to rename folders with open handles, delete in place then
+                        print(f"Could not move {project} to trash: {e}")
+                        target = project_path
+                    self.project_index.apply_changes([project])
+                    return remove_tree(job, target)
+
+                self.submit_job(
+                    project, "Delete project", task,
+                    on_success=lambda _count: self.refresh_projects(),
+                    error_title="Failed to remove project folder"
                 )
-                try:
-                    if project_path.exists():
-                        for root, dirs, files in os.walk(project_path, topdown=False):
-                            for name in files:
-                                os.remove(os.path.join(root, name))
-                            for name in dirs:
-                                os.rmdir(os.path.join(root, name))
-                        os.rmdir(project_path)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to remove project folder: {e}")
-                self.refresh_projects()
+
+    def purge_trash(self):
+        # Leftovers from a delete that was interrupted or crashed
+        try:
+            leftovers = sorted(trash_dir().iterdir())
+        except OSError:
+            return
+        for trashed in leftovers:
+            self.submit_job(None, f"Finish deleting {trashed.name}", lambda job, p=trashed: purge_trashed_project(job, p))
 
     def import_db(self):
         if self.selected_project:
@@ -589,73 +3974,94 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
                     ("GZipped SQL files", "*.sql.gz"),
                     ("Gzipped SQL (alt)", "*.sql.gzip"),
                     ("ZIP archives", "*.zip"),
-                    ("All supported", ("*.sql", "*.sql.gz", "*.sql.gzip", "*.zip")),
+                    ("Zstandard SQL files", "*.sql.zst"),
+                    ("All supported", ("*.sql", "*.sql.gz", "*.sql.gzip", "*.zip", "*.sql.zst")),
                     ("All files", "*.*")
                 ]
             )
             if db_file:
-                self.run_ddev_command(self.selected_project, ["import-db", "--file", db_file])
+                project = self.selected_project
+                speedups = messagebox.askyesno(
+                    "Import speedups",
+                    "Speed up the import by disabling foreign key and unique checks "
+                    "and relaxing InnoDB log flushing while it runs?"
+                )
+                self.submit_job(
+                    project, f"Import {os.path.basename(db_file)}",
+                    lambda job: import_database(job, PROJECTS_DIR / project, db_file, speedups),
+                    on_success=lambda _result: self.show_info("Import DB", f"Database imported into {project}."),
+                    error_title="Import failed"
+                )
 
     def export_db(self):
-        if self.selected_project:
-            export_path = filedialog.asksaveasfilename(title="Save exported SQL as", defaultextension=".sql")
-            if export_path:
-                self.run_ddev_command(self.selected_project, ["export-db", "--file", export_path])
-
-    def enable_xdebug(self, mode):
-
         if not self.selected_project:
-            messagebox.showerror("Error", "No project selected.")
             return
+        project = self.selected_project
+        options = self.ask_export_options()
+        if not options:
+            return
+        extension = EXPORT_EXTENSIONS[options["fmt"]]
+        export_path = filedialog.asksaveasfilename(
+            title="Save exported SQL as",
+            defaultextension=extension,
+            initialfile=f"{project}{extension}"
+        )
+        if export_path:
+            self.submit_job(
+                project, f"Export {os.path.basename(export_path)}",
+                lambda job: export_database(job, PROJECTS_DIR / project, export_path, **options),
+                on_success=lambda _result: self.show_info("Export DB", f"Database exported to {export_path}."),
+                error_title="Export failed"
+            )
 
-        try:
-            project_path = PROJECTS_DIR / self.selected_project
-            php_config_dir = project_path / ".ddev" / "php"
-            php_ini_file = php_config_dir / "php.ini"
-            ini_exists = os.path.isfile(php_ini_file)
-            needs_restart = False
-
-            if ini_exists:
-                with open(php_ini_file, "r") as file:
-                    lines = file.readlines()
-
-                found_mode_line = False
-                updated_lines = []
-
-                for line in lines:
-                    if line.strip().startswith("xdebug.mode"):
-                        found_mode_line = True
-                        current_mode = line.strip().split("=")[1].strip()
-                        if current_mode != mode:
-                            updated_lines.append(f"xdebug.mode={mode}\n")
-                            needs_restart = True
-                        else:
-                            updated_lines.append(line)
-                    else:
-                        updated_lines.append(line)
+    def ask_export_options(self):
+        formats = [fmt for fmt in EXPORT_FORMATS if fmt != "zstd" or zstd_available()]
+        result = {}
 
-                if not found_mode_line:
-                    updated_lines.append(f"xdebug.mode={mode}\n")
-                    needs_restart = True
+        win = tk.Toplevel(self.root)
+        win.title("Export Options")
+        win.grab_set()
 
-                with open(php_ini_file, "w") as file:
-                    file.writelines(updated_lines)
+        format_var = tk.StringVar(value=formats[0])
+        level_var = tk.IntVar(value=6)
+        parallel_var = tk.IntVar(value=4)
+        skip_var = tk.BooleanVar(value=False)
 
-            else:
-                os.makedirs(os.path.dirname(php_ini_file), exist_ok=True)
-                with open(php_ini_file, "w") as file:
-                    file.write(f"xdebug.mode={mode}\n")
-                needs_restart = True
+        tk.Label(win, text="Format:").pack()
+        ttk.Combobox(win, textvariable=format_var, values=formats, state="readonly").pack()
+        tk.Label(win, text="Compression level:").pack()
+        tk.Spinbox(win, from_=1, to=19, width=4, textvariable=level_var).pack()
+        tk.Label(win, text="Parallel connections:").pack()
+        tk.Spinbox(win, from_=1, to=16, width=4, textvariable=parallel_var).pack()
+        tk.Checkbutton(win, text="Skip data of cache, log, session and transient tables", variable=skip_var).pack()
 
-            if needs_restart:
-                subprocess.run([DDEV_COMMAND, "restart", self.selected_project], cwd=project_path, check=True)
+        def on_submit():
+            fmt = format_var.get()
+            level = int(level_var.get())
+            result.update({
+                "fmt": fmt,
+                "level": min(level, 9) if fmt == "gzip" else level,
+                "parallel": max(1, int(parallel_var.get())),
+                "skip_transient": skip_var.get(),
+            })
+            win.destroy()
 
-            subprocess.run([DDEV_COMMAND, "xdebug", "on"], cwd=project_path, check=True)
+        tk.Button(win, text="OK", command=on_submit).pack(pady=10)
+        self.root.wait_window(win)
+        return result or None
 
-            messagebox.showinfo("Success", f"Xdebug '{mode}' mode set and enabled.")
+    def enable_xdebug(self, mode):
+        if not self.selected_project:
+            messagebox.showerror("Error", "No project selected.")
+            return
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to set Xdebug mode: {e}")
+        project = self.selected_project
+        self.submit_job(
+            project, f"Enable Xdebug ({mode})",
+            lambda job: set_xdebug_mode(job, PROJECTS_DIR / project, mode),
+            on_success=lambda _restarted: self.show_info("Success", f"Xdebug '{mode}' mode set and enabled."),
+            error_title="Failed to set Xdebug mode"
+        )
 
     def ask_project_settings(self):
         settings = load_defaults()
@@ -698,458 +4104,248 @@ iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4
 
     def create_new_project(self):
         name = simpledialog.askstring("New Project", "Enter project name:")
-        if name:
-            php_version, db_version, webserver_type = self.ask_project_settings()
-            path = PROJECTS_DIR / name
-            path.mkdir(parents=True, exist_ok=True)
-            subprocess.run([DDEV_COMMAND, "config", "--project-name", name, "--docroot", "public",
-                            "--project-type", "php", "--php-version", php_version, "--database", db_version, "--webserver-type", webserver_type], cwd=path)
-            config_file = path / ".ddev" / "config.yaml"
-            subprocess.run([
-                    DDEV_COMMAND, "add-on", "get", "ddev/ddev-adminer"
-            ], cwd=path)
-            if config_file.exists():
-                with open(config_file, "r") as f:
-                    config = yaml.safe_load(f)
-                config["disable_settings_management"] = True
-                with open(config_file, "w") as f:
-                    yaml.safe_dump(config, f)
-
-        project_path = path
-        php_config_dir = project_path / ".ddev" / "php"
-        php_ini_file = php_config_dir / "php.ini"
-        profiler_dir = project_path / "profiler"
-        profiler_dir.mkdir(parents=True, exist_ok=True)
-
-        try:
-            php_config_dir.mkdir(parents=True, exist_ok=True)
-            output_dir = "/var/www/html/profiler/"
-            php_ini_content = (
-                "[PHP]\n"
-                "upload_max_filesize = 4084M\n"
-                "post_max_size = 4084M\n"
-                "memory_limit = 256M\n"
-                f"xdebug.mode=debug\n"
-                "xdebug.start_with_request=yes\n"
-                "xdebug.use_compression=false\n"
-                "xdebug.profiler_output_name=profiler.%H.%R.%t.out\n"
-                f"xdebug.output_dir=\"{output_dir}\"\n"
-            )
-
-            with open(php_ini_file, "w") as f:
-                f.write(php_ini_content)
-
-            subprocess.run([DDEV_COMMAND, "start"], cwd=path)
-            self.refresh_projects()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed: {e}")
-            self.refresh_projects()
-
-        import base64
-
-        transparent_png_base64 = (
-            b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMCAKbNPioAAAAASUVORK5CYII='
-        )
+        if not name:
+            return
+        project_settings = self.ask_project_settings()
+        if not project_settings:
+            return
+        php_version, db_version, webserver_type = project_settings
 
-        try:
-            placeholder_path = path / "public" / "placeholder.png"
-            placeholder_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(placeholder_path, "wb") as img_file:
-                img_file.write(base64.b64decode(transparent_png_base64))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create placeholder.png: {e}")
-
-        htaccess_path = path / "public" / ".htaccess"
-
-        custom_rules = (
-            "<IfModule mod_rewrite.c>\n"
-            "RewriteEngine On\n"
-            "RewriteCond %{REQUEST_FILENAME} !-f\n"
-            "RewriteRule \\.(jpe?g|png|gif|webp|bmp|svg|ico)$ /placeholder.png [L]\n"
-            "</IfModule>\n\n"
-            "# BEGIN WordPress\n\n"
-            "<IfModule mod_rewrite.c>\n"
-            "RewriteEngine On\n"
-            "RewriteRule .* - [E=HTTP_AUTHORIZATION:%{HTTP:Authorization}]\n"
-            "RewriteBase /\n"
-            "RewriteRule ^index\\.php$ - [L]\n"         
-            "RewriteCond %{REQUEST_FILENAME} !-f\n"
-            "RewriteCond %{REQUEST_FILENAME} !-d\n"
-            "RewriteRule . /index.php [L]\n"
-            "</IfModule>\n\n"
-            "# END WordPress\n"
+        self.submit_job(
+            name, "Create project",
+            lambda job: create_php_project(job, name, PROJECTS_DIR / name, php_version, db_version, webserver_type),
+            on_success=lambda _result: self.refresh_projects()
         )
 
-        try:
-            if htaccess_path.exists():
-                with open(htaccess_path, "r") as f:
-                    original_contents = f.read()
-            else:
-                original_contents = ""
-
-            with open(htaccess_path, "w") as f:
-                f.write(custom_rules + original_contents)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to modify .htaccess: {e}")
-
     def create_wordpress_project(self):
         name = simpledialog.askstring("New WordPress Project", "Enter project name:")
-        if name:
-            php_version, db_version, webserver_type = self.ask_project_settings()
-            path = PROJECTS_DIR / name
-            path.mkdir(parents=True, exist_ok=True)
-            subprocess.run([DDEV_COMMAND, "config", "--project-name", name, "--project-type", "wordpress", "--docroot", "web",
-                            "--php-version", php_version, "--database", db_version, "--webserver-type", webserver_type], cwd=path)
-            config_file = path / ".ddev" / "config.yaml"
-            subprocess.run([
-                    DDEV_COMMAND, "add-on", "get", "ddev/ddev-adminer"
-            ], cwd=path)
-            if config_file.exists():
-                with open(config_file, "r") as f:
-                    config = yaml.safe_load(f)
-                config["disable_settings_management"] = True
-                with open(config_file, "w") as f:
-                    yaml.safe_dump(config, f)
-                    project_path = path
-        php_config_dir = project_path / ".ddev" / "php"
-        php_ini_file = php_config_dir / "php.ini"
-        profiler_dir = project_path / "profiler"
-        profiler_dir.mkdir(parents=True, exist_ok=True)
+        if not name:
+            return
+        project_settings = self.ask_project_settings()
+        if not project_settings:
+            return
+        php_version, db_version, webserver_type = project_settings
 
-        try:
-            php_config_dir.mkdir(parents=True, exist_ok=True)
-            output_dir = "/var/www/html/profiler/"
-            php_ini_content = (
-                "[PHP]\n"
-                "upload_max_filesize = 4084M\n"
-                "post_max_size = 4084M\n"
-                "memory_limit = 256M\n"
-                f"xdebug.mode=debug\n"
-                "xdebug.start_with_request=yes\n"
-                "xdebug.use_compression=false\n"
-                "xdebug.profiler_output_name=profiler.%H.%R.%t.out\n"
-                f"xdebug.output_dir=\"{output_dir}\"\n"
-            )
+        def task(job):
+            path = PROJECTS_DIR / name
+            steps = wordpress_provision_steps(name, path, php_version, db_version, webserver_type)
+            return Provisioner(job, path, steps).run()
 
-            with open(php_ini_file, "w") as f:
-                f.write(php_ini_content)
+        def on_success(_timings):
+            self.refresh_projects()
+            self.show_info("Success", "WordPress project created and configured.")
 
-            subprocess.run([DDEV_COMMAND, "start"], cwd=path)
-            subprocess.run([DDEV_COMMAND, "wp", "--path=web", "core", "download"], cwd=path)
-            subprocess.run([DDEV_COMMAND, "wp", "--path=web", "core", "install", "--url=http://{}.ddev.site".format(name),
-                            "--title=WordPress Site", "--admin_user=admin", "--admin_password=admin", "--admin_email=admin@example.com"], cwd=path)
-            wp_config = path / "web" / "wp-config.php"
+        self.submit_job(name, "Create WordPress project", task, on_success=on_success)
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed: {e}")
+    def save_as_template(self):
+        if not self.selected_project:
+            messagebox.showerror("Error", "No project selected.")
+            return
+        project = self.selected_project
+        if self._project_status(project) != "running":
+            messagebox.showerror("Error", "Start the project first, its database goes into the template.")
+            return
+        template_name = simpledialog.askstring("Save as Template", "Template name:", initialvalue=project)
+        if not template_name:
+            return
+        if template_name in list_templates() and not messagebox.askyesno(
+                "Confirm", f"Replace the existing template '{template_name}'?"):
+            return
 
+        self.submit_job(
+            project, f"Save template {template_name}",
+            lambda job: save_template(job, PROJECTS_DIR / project, template_name),
+            on_success=lambda _path: self.show_info("Template saved", f"'{template_name}' is ready for new projects."),
+            error_title="Failed to save template"
+        )
 
-        try:
-            with open(wp_config, "r") as f:
-                lines = f.readlines()
-
-                insert_index = next((i for i, line in enumerate(lines) if "/* That's all, stop editing!" in line), len(lines))
-
-                debug_config = [
-                    "define('WP_DEBUG', true);\n",
-                    "define('WP_DEBUG_LOG', true);\n",
-                    "define('WP_REDIS_HOST', 'redis');\n",
-                    "define('WP_REDIS_PORT', 6379);\n",
-                    "define('WP_REDIS_TIMEOUT', 1);\n",
-                    "define('WP_REDIS_READ_TIMEOUT', 1);\n",
-                    "define('WP_REDIS_DATABASE', 0);\n"
-                ]
+    def create_from_template(self):
+        templates = list_templates()
+        if not templates:
+            messagebox.showinfo("Info", "No templates yet. Use 'Save as Template' on a provisioned project.")
+            return
 
-                existing_content = ''.join(lines)
-                to_insert = ["\n"] + [line for line in debug_config if line not in existing_content]
+        result = {}
+        win = tk.Toplevel(self.root)
+        win.title("New From Template")
+        win.grab_set()
 
-                if len(to_insert) > 1:  # If anything is new (more than just the "\n")
-                    lines[insert_index:insert_index] = to_insert
-                    with open(wp_config, "w") as f:
-                        f.writelines(lines)
+        template_var = tk.StringVar(value=templates[0])
+        name_var = tk.StringVar()
 
-                messagebox.showinfo("Success", "WordPress project created and configured.")
-        except Exception as e:
-                messagebox.showerror("Error", f"Failed to modify wp-config.php: {e}")
+        tk.Label(win, text="Template:").pack()
+        ttk.Combobox(win, textvariable=template_var, values=templates, state="readonly").pack()
+        tk.Label(win, text="Project name:").pack()
+        tk.Entry(win, textvariable=name_var).pack()
 
-        import base64
+        def on_submit():
+            result["template"] = template_var.get()
+            result["name"] = name_var.get().strip()
+            win.destroy()
 
-        transparent_png_base64 = (
-            b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMCAKbNPioAAAAASUVORK5CYII='
-        )
+        tk.Button(win, text="Create", command=on_submit).pack(pady=10)
+        self.root.wait_window(win)
 
-        try:
-            placeholder_path = path / "web" / "placeholder.png"
-            placeholder_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(placeholder_path, "wb") as img_file:
-                img_file.write(base64.b64decode(transparent_png_base64))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create placeholder.png: {e}")
-
-        htaccess_path = path / "web" / ".htaccess"
-
-        custom_rules = (
-            "<IfModule mod_rewrite.c>\n"
-            "RewriteEngine On\n"
-            "RewriteCond %{REQUEST_FILENAME} !-f\n"
-            "RewriteRule \\.(jpe?g|png|gif|webp|bmp|svg|ico)$ /placeholder.png [L]\n"
-            "</IfModule>\n\n"
-            "# BEGIN WordPress\n\n"
-            "<IfModule mod_rewrite.c>\n"
-            "RewriteEngine On\n"
-            "RewriteRule .* - [E=HTTP_AUTHORIZATION:%{HTTP:Authorization}]\n"
-            "RewriteBase /\n"
-            "RewriteRule ^index\\.php$ - [L]\n"
-            "RewriteCond %{REQUEST_FILENAME} !-f\n"
-            "RewriteCond %{REQUEST_FILENAME} !-d\n"
-            "RewriteRule . /index.php [L]\n"
-            "</IfModule>\n\n"
-            "# END WordPress\n"
-        )
+        name = result.get("name")
+        if not name:
+            return
+        path = PROJECTS_DIR / name
+        if path.exists() and any(path.iterdir()) and not (path / PROVISION_STATE_FILE).exists():
+            messagebox.showerror("Error", f"A folder named '{name}' already exists.")
+            return
+        template_name = result["template"]
 
-        try:
-            if htaccess_path.exists():
-                with open(htaccess_path, "r") as f:
-                    original_contents = f.read()
-            else:
-                original_contents = ""
+        def task(job):
+            return Provisioner(job, path, template_clone_steps(template_name, name, path)).run()
 
-            with open(htaccess_path, "w") as f:
-                f.write(custom_rules + original_contents)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to modify .htaccess: {e}")
+        def on_success(_timings):
+            self.refresh_projects()
+            self.show_info("Success", f"{name} created from template '{template_name}'.")
 
-        self.refresh_projects()
+        self.submit_job(name, f"Clone template {template_name}", task, on_success=on_success)
 
     def install_wordpress_core(self):
         if not self.selected_project:
             messagebox.showerror("Error", "No project selected.")
             return
 
-        try:
-            project_path = PROJECTS_DIR / self.selected_project
-            config_path = project_path / ".ddev" / "config.yaml"
-
-            if not config_path.exists():
-                raise FileNotFoundError(f"{config_path} not found")
-
-            with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
-
-            docroot = config.get("docroot", "web")
-            wp_path = project_path / docroot
-
-            subprocess.run(
-                [DDEV_COMMAND, "exec", "bash", "-c",
-                 f"wp --path={docroot} core download"],
-                cwd=project_path, check=True
-            )
-
-            subprocess.run(
-                [DDEV_COMMAND, "exec", "bash", "-c",
-                 f"wp --path={docroot} core config --dbhost=db --dbname=db --dbuser=db --dbpass=db"],
-                cwd=project_path, check=True
-            )
-
-            subprocess.run(
-                [DDEV_COMMAND, "exec", "bash", "-c",
-                 f"wp --path={docroot} core install --url=https://{self.selected_project}.ddev.site "
-                 "--title='Installed WordPress' --admin_user=admin --admin_password=admin --admin_email=admin@admin.com"],
-                cwd=project_path, check=True
-            )
-
-            messagebox.showinfo("Success", "WordPress installed successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to install WordPress: {e}")
+        project = self.selected_project
+        self.submit_job(
+            project, "Install WordPress core",
+            lambda job: install_wordpress(job, PROJECTS_DIR / project, project),
+            on_success=lambda _result: self.show_info("Success", "WordPress installed successfully."),
+            error_title="Failed to install WordPress"
+        )
 
     def add_vhost(self):
-        import json, re, subprocess, tkinter as tk
-        from tkinter import messagebox, ttk
-
         if not self.selected_project:
             messagebox.showerror("Error", "No project selected.")
             return
 
-        DDEV_DOMAIN_SUFFIX = ".ddev.site"
-        VALID = re.compile(r"^[a-z0-9][a-z0-9\-\.]*[a-z0-9]$", re.IGNORECASE)
-
-        def normalize_one(h):
-            h = (h or "").strip().lower()
-            if not h:
-                return None
-            if h.endswith(DDEV_DOMAIN_SUFFIX):
-                h = h[: -len(DDEV_DOMAIN_SUFFIX)]
-            if "/" in h or " " in h:
-                return None
-            if h.startswith("."):
-                h = h[1:]
-            if h.endswith("."):
-                h = h[:-1]
-            return h if h and VALID.match(h) else None
-
-        def normalize_many(items):
-            out, seen, errs = [], set(), []
-            for it in items:
-                v = normalize_one(it)
-                if v is None:
-                    errs.append(f"Invalid: {it!r}")
-                elif v not in seen:
-                    out.append(v); seen.add(v)
-            return out, errs
+        normalize_one = normalize_hostname
+        normalize_many = normalize_hostnames
 
         def split_multi(s):
             return [p.strip() for p in s.replace(",", "\n").splitlines() if p.strip()]
 
-        project_path = PROJECTS_DIR / self.selected_project
+        project = self.selected_project
+        project_path = PROJECTS_DIR / project
 
-        # Read current hostnames from `ddev describe -j`
-        try:
-            p = subprocess.run(
-                [DDEV_COMMAND, "describe", "-j"],
-                cwd=str(project_path),
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                capture_output=True,
-                check=True,
-            )
-            out = (p.stdout or "") + "\n" + (p.stderr or "")
-            j = json.loads(out)
-            r = j.get("raw") or {}
+        def describe(job):
+            return describe_cache.fetch(project_path, job)
 
-            # FQDNs from ddev. First is primary; also available as r["hostname"].
-            fqdn_list = r.get("hostnames") or []
-            if not fqdn_list and r.get("hostname"):
-                fqdn_list = [r["hostname"]]
-            if not fqdn_list:
-                raise RuntimeError("No hostnames found in ddev JSON.")
+        def apply(job, new_hosts):
+            shown = "\n".join(f"- {h}" for h in set_additional_hostnames(job, project_path, new_hosts))
+            self.show_info("Success", f"Updated additional_hostnames:\n{shown}")
 
-            # Normalize to base names (strip .ddev.site etc.)
-            primary = normalize_one(r.get("hostname") or fqdn_list[0])
-            bases = [normalize_one(x) for x in fqdn_list if normalize_one(x)]
+        def edit(r):
+            # Read current hostnames from `ddev describe -j`
+            try:
+                # FQDNs from ddev. First is primary; also available as r["hostname"].
+                fqdn_list = r.get("hostnames") or []
+                if not fqdn_list and r.get("hostname"):
+                    fqdn_list = [r["hostname"]]
+                if not fqdn_list:
+                    raise RuntimeError("No hostnames found in ddev JSON.")
 
-            # Additional only (exclude primary). Use `current` downstream for the listbox.
-            current, _errs = normalize_many([b for b in bases if b != primary])
+                # Normalize to base names (strip .ddev.site etc.)
+                primary = normalize_one(r.get("hostname") or fqdn_list[0])
+                bases = [normalize_one(x) for x in fqdn_list if normalize_one(x)]
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to read hostnames via `ddev describe -j`: {e}")
-            return
+                # Additional only (exclude primary). Use `current` downstream for the listbox.
+                current, _errs = normalize_many([b for b in bases if b != primary])
+
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read hostnames via `ddev describe -j`: {e}")
+                return
 
-        # Modal dialog
-        parent = getattr(self, "root", None) or tk._get_default_root()
-        dlg = tk.Toplevel(parent)
-        dlg.title("Edit ddev vhosts")
-        dlg.transient(parent)
-        dlg.grab_set()
+            # Modal dialog
+            parent = getattr(self, "root", None) or tk._get_default_root()
+            dlg = tk.Toplevel(parent)
+            dlg.title("Edit ddev vhosts")
+            dlg.transient(parent)
+            dlg.grab_set()
 
-        ttk.Label(dlg, text="Configured vhosts (without .ddev.site):").grid(row=0, column=0, columnspan=3, sticky="w", padx=8, pady=(8,4))
+            ttk.Label(dlg, text="Configured vhosts (without .ddev.site):").grid(row=0, column=0, columnspan=3, sticky="w", padx=8, pady=(8,4))
 
-        lb = tk.Listbox(dlg, selectmode=tk.EXTENDED, height=12)
-        lb.grid(row=1, column=0, columnspan=3, sticky="nsew", padx=8)
-        for h in sorted(set(current)):
-            lb.insert(tk.END, h)
+            lb = tk.Listbox(dlg, selectmode=tk.EXTENDED, height=12)
+            lb.grid(row=1, column=0, columnspan=3, sticky="nsew", padx=8)
+            for h in sorted(set(current)):
+                lb.insert(tk.END, h)
 
-        ttk.Label(dlg, text="Add hostnames (comma or newline separated):").grid(row=2, column=0, columnspan=2, sticky="w", padx=8, pady=(10,2))
-        add_text = tk.Text(dlg, height=3, width=40)
-        add_text.grid(row=3, column=0, columnspan=2, sticky="ew", padx=8)
+            ttk.Label(dlg, text="Add hostnames (comma or newline separated):").grid(row=2, column=0, columnspan=2, sticky="w", padx=8, pady=(10,2))
+            add_text = tk.Text(dlg, height=3, width=40)
+            add_text.grid(row=3, column=0, columnspan=2, sticky="ew", padx=8)
 
-        def on_add():
-            raw = add_text.get("1.0", "end").strip()
-            if not raw:
+            def on_add():
+                raw = add_text.get("1.0", "end").strip()
+                if not raw:
+                    return
+                cleaned, errs = normalize_many(split_multi(raw))
+                if errs:
+                    messagebox.showerror("Invalid entries", "\n".join(errs), parent=dlg); return
+                existing = {lb.get(i) for i in range(lb.size())}
+                for h in cleaned:
+                    if h not in existing:
+                        lb.insert(tk.END, h)
+                add_text.delete("1.0", "end")
+
+            def on_remove():
+                sel = list(lb.curselection())
+                for idx in reversed(sel):
+                    lb.delete(idx)
+
+            ttk.Button(dlg, text="Add", command=on_add).grid(row=3, column=2, sticky="e", padx=(0,8))
+            ttk.Button(dlg, text="Remove selected", command=on_remove).grid(row=4, column=2, sticky="e", padx=(0,8), pady=(8,0))
+
+            btns = ttk.Frame(dlg); btns.grid(row=5, column=0, columnspan=3, sticky="e", padx=8, pady=8)
+            result = {"ok": False}
+            def on_ok():
+                items = [lb.get(i) for i in range(lb.size())]
+                cleaned, errs = normalize_many(items)
+                if errs:
+                    messagebox.showerror("Invalid entries", "\n".join(errs), parent=dlg); return
+                result["list"] = cleaned; result["ok"] = True
+                dlg.destroy()
+            def on_cancel():
+                dlg.destroy()
+            ttk.Button(btns, text="Cancel", command=on_cancel).pack(side="right", padx=(0,6))
+            ttk.Button(btns, text="OK", command=on_ok).pack(side="right")
+
+            dlg.columnconfigure(0, weight=1); dlg.columnconfigure(1, weight=1)
+            dlg.rowconfigure(1, weight=1)
+            dlg.wait_window()
+
+            if not result.get("ok"):
                 return
-            cleaned, errs = normalize_many(split_multi(raw))
-            if errs:
-                messagebox.showerror("Invalid entries", "\n".join(errs), parent=dlg); return
-            existing = {lb.get(i) for i in range(lb.size())}
-            for h in cleaned:
-                if h not in existing:
-                    lb.insert(tk.END, h)
-            add_text.delete("1.0", "end")
-
-        def on_remove():
-            sel = list(lb.curselection())
-            for idx in reversed(sel):
-                lb.delete(idx)
-
-        ttk.Button(dlg, text="Add", command=on_add).grid(row=3, column=2, sticky="e", padx=(0,8))
-        ttk.Button(dlg, text="Remove selected", command=on_remove).grid(row=4, column=2, sticky="e", padx=(0,8), pady=(8,0))
-
-        btns = ttk.Frame(dlg); btns.grid(row=5, column=0, columnspan=3, sticky="e", padx=8, pady=8)
-        result = {"ok": False}
-        def on_ok():
-            items = [lb.get(i) for i in range(lb.size())]
-            cleaned, errs = normalize_many(items)
-            if errs:
-                messagebox.showerror("Invalid entries", "\n".join(errs), parent=dlg); return
-            result["list"] = cleaned; result["ok"] = True
-            dlg.destroy()
-        def on_cancel():
-            dlg.destroy()
-        ttk.Button(btns, text="Cancel", command=on_cancel).pack(side="right", padx=(0,6))
-        ttk.Button(btns, text="OK", command=on_ok).pack(side="right")
 
-        dlg.columnconfigure(0, weight=1); dlg.columnconfigure(1, weight=1)
-        dlg.rowconfigure(1, weight=1)
-        dlg.wait_window()
+            new_hosts = result.get("list", [])
+            if sorted(new_hosts) == sorted(current):
+                messagebox.showinfo("No changes", "No updates to additional_hostnames.")
+                return
 
-        if not result.get("ok"):
-            return
+            self.submit_job(project, "Update vhosts", lambda job: apply(job, new_hosts), error_title="ddev failed")
 
-        new_hosts = result.get("list", [])
-        if sorted(new_hosts) == sorted(current):
-            messagebox.showinfo("No changes", "No updates to additional_hostnames.")
+        if describe_cache.is_fresh(project_path):
+            edit(describe_cache.peek(project_path))
             return
-
-        try:
-            args = [
-                DDEV_COMMAND, "config", "--auto",
-                "--additional-hostnames", ",".join(new_hosts) if new_hosts else "",
-            ]
-            subprocess.run(args, cwd=project_path, check=True)
-            subprocess.run([DDEV_COMMAND, "restart"], cwd=project_path, check=True)
-            shown = "\n".join(f"- {h}{DDEV_DOMAIN_SUFFIX}" for h in new_hosts)
-            messagebox.showinfo("Success", f"Updated additional_hostnames:\n{shown}")
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Error", f"ddev failed: {e}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update vhosts: {e}")
+        self.submit_job(project, "ddev describe", describe, on_success=edit,
+                        error_title="Failed to read hostnames via `ddev describe -j`")
 
     def enable_service(self, service):
         if not self.selected_project:
             messagebox.showerror("Error", "No project selected.")
             return
-        project_path = PROJECTS_DIR / self.selected_project
-        service_files = {
-        "redis": ("docker-compose.redis.yaml", """
-version: '3.6'
-services:
-  redis:
-    image: redis:7
-    container_name: ddev-${DDEV_SITENAME}-redis
-    restart: always
-    ports:
-      - "6379"
-    """),
-            "memcached": ("docker-compose.memcached.yaml", """
-version: '3.6'
-services:
-  memcached:
-    image: memcached:latest
-    container_name: ddev-${DDEV_SITENAME}-memcached
-    restart: always
-    ports:
-      - "11211"
-    """)
-        }
-        filename, content = service_files.get(service, (None, None))
-        if not filename:
+        if service not in SERVICE_COMPOSE_FILES:
             messagebox.showerror("Error", f"Unknown service {service}")
             return
-        service_file = project_path / ".ddev" / filename
-        with open(service_file, "w") as f:
-            f.write(content.strip())
-        subprocess.run([DDEV_COMMAND, "restart"], cwd=project_path)
-        messagebox.showinfo("Success", f"{service.capitalize()} enabled and project restarted.")
+        project_path = PROJECTS_DIR / self.selected_project
+
+        self.submit_job(
+            self.selected_project, f"Enable {service}",
+            lambda job: enable_compose_service(job, project_path, service),
+            on_success=lambda _result: self.show_info("Success", f"{service.capitalize()} enabled and project restarted.")
+        )
 
 def load_defaults():
     if os.path.exists(CONFIG_FILE):
@@ -1161,22 +4357,722 @@ def load_defaults():
     return DEFAULTS.copy()
 
 def save_defaults(php_version, db_version, webserver):
-    data = {
+    data = load_defaults()
+    data.update({
         "php_version": php_version,
         "db_version": db_version,
         "webserver": webserver,
         "pathwin": DEFAULTS["pathwin"],
         "pathnix": str(DEFAULTS["pathnix"]),
-    }
+    })
+    write_settings(data)
+
+def save_setting(key, value):
+    data = load_defaults()
+    data[key] = value
+    data["pathnix"] = str(data.get("pathnix", DEFAULTS["pathnix"]))
+    write_settings(data)
+
+def write_settings(data):
     try:
         with open(CONFIG_FILE, "w") as f:
             json.dump(data, f, indent=2)
     except IOError as e:
         print(f"Error saving config: {e}")
 
+CLI_ACTIONS = ["start", "stop", "restart", "pause"]
+CLI_COMMANDS = CLI_ACTIONS + [
+    "status", "create", "create-wp", "install-wp", "xdebug", "service", "setup-env", "reset-admins", "vhosts",
+    "daemon",
+]
+
+def cli_parser():
+    import argparse
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--parallel", type=int, default=int(settings.get("parallel_jobs", MAX_PARALLEL_JOBS)),
+                        help="projects to work on at the same time")
+    common.add_argument("--json", action="store_true", help="print machine-readable results")
+    common.add_argument("-v", "--verbose", action="store_true", help="stream command output to stderr")
+    common.add_argument("--no-daemon", action="store_true", help="run here even if a daemon is running")
+    common.add_argument("--trace", metavar="FILE", help="write every ddev/docker call as JSON lines")
+
+    parser = argparse.ArgumentParser(prog="ddevgui", description="Manage DDEV projects without the GUI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    status = sub.add_parser("status", parents=[common], help="list projects with status and sizes")
+    status.add_argument("projects", nargs="*")
+
+    for action in CLI_ACTIONS:
+        p = sub.add_parser(action, parents=[common], help=f"ddev {action} the given projects")
+        p.add_argument("projects", nargs="*")
+        p.add_argument("--all", action="store_true", help="every project in the websites folder")
+
+    for command, kind in (("create", "PHP"), ("create-wp", "WordPress")):
+        p = sub.add_parser(command, parents=[common], help=f"create new {kind} projects")
+        p.add_argument("projects", nargs="+")
+        p.add_argument("--php", default=settings.get("php_version", DEFAULTS["php_version"]), choices=PHP_VERSIONS)
+        p.add_argument("--db", default=settings.get("db_version", DEFAULTS["db_version"]), choices=DB_VERSIONS)
+        p.add_argument("--webserver", default=settings.get("webserver", DEFAULTS["webserver"]), choices=WEBSERVERS)
+
+    p = sub.add_parser("xdebug", parents=[common], help="set the Xdebug mode and enable it")
+    p.add_argument("mode", choices=["debug", "profile"])
+    p.add_argument("projects", nargs="+")
+
+    p = sub.add_parser("service", parents=[common], help="add a Redis or Memcached container")
+    p.add_argument("service", choices=sorted(SERVICE_COMPOSE_FILES))
+    p.add_argument("projects", nargs="+")
+
+    for command, text in (
+        ("install-wp", "download, configure and install WordPress core"),
+        ("setup-env", "reconcile dev plugins (mail plugins removed, migration plugin active)"),
+        ("reset-admins", "reset WordPress admin users to admin/admin"),
+    ):
+        p = sub.add_parser(command, parents=[common], help=text)
+        p.add_argument("projects", nargs="+")
+
+    p = sub.add_parser("vhosts", parents=[common], help="replace a project's additional hostnames")
+    p.add_argument("project")
+    p.add_argument("hosts", nargs="*")
+
+    p = sub.add_parser("daemon", parents=[common], help="serve project state and jobs to GUIs and scripts")
+    p.add_argument("--port", type=int, default=0, help="localhost port, a free one by default")
+    return parser
+
+def cli_operation(args):
+    # One (title, fn) per project; fn(job, name, path) runs inside a JobExecutor worker
+    def existing(fn):
+        def run(job, name, path):
+            if not (path / ".ddev" / "config.yaml").is_file():
+                raise FileNotFoundError(f"{path} is not a ddev project")
+            return fn(job, name, path)
+        return run
+
+    command = args.command
+    if command in CLI_ACTIONS:
+        def action(job, name, path):
+            run_ddev(job, path, [command])
+        return f"ddev {command}", existing(action)
+    if command == "create":
+        return "Create project", lambda job, name, path: create_php_project(
+            job, name, path, args.php, args.db, args.webserver)
+    if command == "create-wp":
+        return "Create WordPress project", lambda job, name, path: Provisioner(
+            job, path, wordpress_provision_steps(name, path, args.php, args.db, args.webserver)).run()
+    if command == "install-wp":
+        return "Install WordPress core", existing(install_wordpress)
+    if command == "xdebug":
+        return f"Enable Xdebug ({args.mode})", existing(
+            lambda job, name, path: {"restarted": set_xdebug_mode(job, path, args.mode)})
+    if command == "service":
+        return f"Enable {args.service}", existing(
+            lambda job, name, path: enable_compose_service(job, path, args.service))
+    if command == "setup-env":
+        return "Prepare dev environment", existing(
+            lambda job, name, path: dict(reconcile_plugins(job, path, ProjectConfig.load(path).docroot)))
+    if command == "reset-admins":
+        return "Reset WP admin users", existing(
+            lambda job, name, path: [{"id": uid, "old": old, "new": new} for uid, old, new in reset_wp_admins(job, path)])
+    if command == "vhosts":
+        hosts, errors = normalize_hostnames(args.hosts)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return "Update vhosts", existing(lambda job, name, path: set_additional_hostnames(job, path, hosts))
+    raise ValueError(f"Unknown command {command}")
+
+def job_summary(job):
+    return {
+        "id": job.id,
+        "project": job.project,
+        "title": job.title,
+        "state": job.state,
+        "finished": job.finished is not None,
+        "elapsed": round(job.elapsed, 2),
+        "result": job.result if job.state == "done" else None,
+        "error": format_job_error(job) if job.error else None,
+    }
+
+def run_batch(executor, projects, title, fn, verbose=False):
+    pending = threading.Semaphore(0)
+    jobs = [
+        executor.submit(name, title, lambda job, n=name: fn(job, n, PROJECTS_DIR / n), on_done=lambda job: pending.release())
+        for name in projects
+    ]
+    seen = {}
+    remaining = len(jobs)
+    try:
+        while remaining:
+            if pending.acquire(timeout=CONSOLE_UPDATE_INTERVAL / 1000):
+                remaining -= 1
+            if verbose:
+                for job in jobs:
+                    lines, _, seen[job.id] = job.output_since(seen.get(job.id, 0))
+                    for _, _, line in lines:
+                        print(f"[{job.project}] {line}", file=sys.stderr)
+    except KeyboardInterrupt:
+        for job in jobs:
+            executor.cancel(job)
+        for _ in range(remaining):
+            pending.acquire()
+    return [job_summary(job) for job in jobs]
+
+def run_remote_batch(client, argv, verbose=False):
+    jobs = {job["id"]: job for job in client.request("POST", "/jobs", {"argv": argv})["jobs"]}
+    seen = dict.fromkeys(jobs, 0)
+    try:
+        while not all(job["finished"] for job in jobs.values()):
+            time.sleep(CONSOLE_UPDATE_INTERVAL / 1000)
+            if verbose:
+                for job_id in [job_id for job_id, job in jobs.items() if not job["finished"]]:
+                    data = client.request("GET", f"/jobs/{job_id}?since={seen[job_id]}")
+                    seen[job_id] = data["last"]
+                    jobs[job_id] = data["job"]
+                    for _, _, line in data["output"]:
+                        print(f"[{jobs[job_id]['project']}] {line}", file=sys.stderr)
+            running = [job_id for job_id, job in jobs.items() if not job["finished"]]
+            if not running:
+                break
+            found = {job["id"]: job for job in client.request("GET", "/jobs?ids=" + ",".join(map(str, running)))["jobs"]}
+            for job_id in running:
+                # Gone from the daemon's history, e.g. after it restarted; the outcome is unknown
+                jobs[job_id] = found.get(job_id) or dict(
+                    jobs[job_id], state="failed", finished=True, error="Job is no longer known to the daemon"
+                )
+    except KeyboardInterrupt:
+        for job_id, job in jobs.items():
+            if not job["finished"]:
+                client.request("POST", f"/jobs/{job_id}/cancel")
+                jobs[job_id] = dict(job, state="cancelled", finished=True)
+    return list(jobs.values())
+
+def cli_projects(args):
+    if args.command == "vhosts":
+        return [args.project]
+    if getattr(args, "all", False):
+        index = ProjectIndex(PROJECTS_DIR)
+        index.ensure_loaded()
+        return sorted(index.snapshot())
+    return list(dict.fromkeys(args.projects))
+
+def print_projects(args, projects):
+    if args.projects:
+        projects = [p for p in projects if p["name"] in args.projects]
+    if args.json:
+        print(json.dumps(projects, indent=2))
+        return 0
+    for proj in projects:
+        size = format_bytes(proj["size"]) if proj["size"] is not None else "-"
+        print(f"{proj['status']:<8} {proj['name']:<30} {size:>10}  {proj['url'] or ''}")
+    return 0
+
+def cli_status(args):
+    index = ProjectIndex(PROJECTS_DIR)
+    index.ensure_loaded()
+    sizes = DiskUsageScanner(lambda: {}).sizes
+    return print_projects(args, sort_projects(project_rows(index, ddev_list_entries(), sizes)))
+
+def run_cli(argv):
+    args = cli_parser().parse_args(argv)
+    if args.command == "daemon":
+        return run_daemon(args)
+
+    # A running daemon already has the state and queues jobs for every client
+    client = None if args.no_daemon else DaemonClient.connect()
+    started = time.time()
+    try:
+        return _run_cli_command(args, argv, client)
+    finally:
+        if args.trace:
+            records = tracer.snapshot()
+            if client:
+                records += [r for r in client.request("GET", "/traces")["records"] if r["time"] >= started]
+            with open(args.trace, "w") as f:
+                for record in sorted(records, key=lambda r: r["time"]):
+                    f.write(json.dumps(record) + "\n")
+
+def _run_cli_command(args, argv, client):
+    if args.command == "status":
+        if client:
+            return print_projects(args, client.request("GET", "/projects")["projects"])
+        return cli_status(args)
+
+    started = time.time()
+    if client:
+        try:
+            results = run_remote_batch(client, argv, verbose=args.verbose)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+    else:
+        projects = cli_projects(args)
+        if not projects:
+            print("No projects given.", file=sys.stderr)
+            return 2
+        try:
+            title, fn = cli_operation(args)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        try:
+            results = run_batch(JobExecutor(max(1, args.parallel)), projects, title, fn, verbose=args.verbose)
+        finally:
+            shell_pool.close_all()
+    failed = [r for r in results if r["state"] != "done"]
+
+    if args.json:
+        print(json.dumps({
+            "command": args.command,
+            "elapsed": round(time.time() - started, 2),
+            "ok": not failed,
+            "results": results,
+        }, indent=2, default=str))
+    else:
+        for r in results:
+            if r["state"] == "done":
+                print(f"ok      {r['project']} ({r['elapsed']:.1f}s)")
+            else:
+                reason = (r["error"] or r["state"]).splitlines()[0]
+                print(f"{r['state']:<7} {r['project']}: {reason}")
+        print(f"{len(results) - len(failed)}/{len(results)} succeeded in {time.time() - started:.1f}s")
+    return 1 if failed else 0
+
+class DaemonClient:
+    # Talks to `ddevgui.py daemon` over its localhost JSON API
+    def __init__(self, port, token):
+        self.url = f"http://127.0.0.1:{port}"
+        self.headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+
+    @classmethod
+    def connect(cls, daemon_file=DAEMON_FILE):
+        try:
+            with open(daemon_file, "r") as f:
+                info = json.load(f)
+            client = cls(info["port"], info["token"])
+            client.request("GET", "/health", timeout=2)
+            return client
+        except Exception:
+            return None
+
+    def request(self, method, path, body=None, timeout=30):
+        import urllib.request
+        import urllib.error
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, headers=self.headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.load(e).get("error")
+            except (ValueError, AttributeError):
+                message = None
+            raise RuntimeError(message or f"daemon answered {e.code} for {path}")
+
+    def stream(self, path):
+        # Server-sent events; the daemon sends a comment line at least every DAEMON_HEARTBEAT seconds
+        import urllib.request
+        request = urllib.request.Request(self.url + path, headers=self.headers)
+        with urllib.request.urlopen(request, timeout=DAEMON_HEARTBEAT * 3) as response:
+            for line in response:
+                if line.startswith(b"data: "):
+                    yield json.loads(line[6:])
+
+    def stats_stream(self):
+        # Same shape as docker_stats_stream, so ResourceMonitor can read the daemon's single stream
+        for event in self.stream("/stats"):
+            yield from event["rows"]
+            yield None
+
+    def describe(self, project_path):
+        from urllib.parse import quote
+        return self.request("GET", "/describe?project=" + quote(Path(project_path).name))["describe"]
+
+    def run_job(self, job, argv):
+        remote = self.request("POST", "/jobs", {"argv": argv})["jobs"][0]
+        seq = 0
+        cancel_sent = False
+        while True:
+            if job.cancel_requested and not cancel_sent:
+                self.request("POST", f"/jobs/{remote['id']}/cancel")
+                cancel_sent = True
+            try:
+                data = self.request("GET", f"/jobs/{remote['id']}?since={seq}")
+            except RuntimeError:
+                if self.request("GET", f"/jobs?ids={remote['id']}")["jobs"]:
+                    raise
+                raise RuntimeError(f"Job {remote['id']} is no longer known to the daemon, its outcome is unknown")
+            for _, stream, line in data["output"]:
+                job.log(line, stream)
+            seq = data["last"]
+            remote = data["job"]
+            if remote["finished"]:
+                break
+            time.sleep(CONSOLE_UPDATE_INTERVAL / 1000)
+        if remote["state"] == "cancelled":
+            raise JobCancelled()
+        if remote["state"] != "done":
+            raise RuntimeError(remote["error"] or remote["state"])
+        return remote["result"]
+
+class ProjectDaemon:
+    # Owns the watchers, caches and job queue so any number of clients cost one set of ddev/docker queries
+    def __init__(self, parallel=MAX_PARALLEL_JOBS):
+        import secrets
+        self.token = secrets.token_urlsafe(32)
+        self.executor = JobExecutor(parallel)
+        self.projects = []
+        self._site_to_project = {}
+        self._subscribers = {"events": set(), "stats": set()}
+        self._stats_running = False
+        self._lock = threading.Lock()
+        self._projects_lock = threading.Lock()  # held across read-modify-publish of self.projects
+        self._status_times = {}
+        self._refresh_lock = threading.Lock()
+        self._refresh_running = False
+        self._refresh_pending = False
+        self.index = ProjectIndex(PROJECTS_DIR)
+        self.index.on_change = self.refresh
+        self.index_watcher = ProjectIndexWatcher(self.index)
+        self.disk_scanner = DiskUsageScanner(
+            lambda: {name: entry["resolved_path"] for name, entry in self.index.snapshot().items()},
+            on_update=self.on_disk_usage,
+        )
+        self.status_watcher = ProjectStatusWatcher(self.on_project_status, on_connect=self.refresh)
+
+    def start(self):
+        describe_cache.on_update = lambda project_path, raw: self.publish(
+            "events", {"type": "describe", "project": Path(project_path).name, "describe": raw}
+        )
+        self.index_watcher.start()
+        self.disk_scanner.start()
+        self.status_watcher.start()
+        try:
+            for trashed in sorted(trash_dir().iterdir()):
+                self.executor.submit(None, f"Finish deleting {trashed.name}", lambda job, p=trashed: purge_trashed_project(job, p))
+        except OSError:
+            pass
+        threading.Thread(target=self._poll, daemon=True).start()
+
+    def _poll(self):
+        last_metrics = time.time()
+        while True:
+            self.refresh()
+            if time.time() - last_metrics >= METRICS_INTERVAL / 1000:
+                last_metrics = time.time()
+                write_metrics_textfile()
+            # With the events stream up, polling is only a safety net
+            interval = EVENTS_REFRESH_INTERVAL if self.status_watcher.connected else REFRESH_INTERVAL
+            time.sleep(interval / 1000)
+
+    def refresh(self):
+        with self._refresh_lock:
+            if self._refresh_running:
+                self._refresh_pending = True
+                return
+            self._refresh_running = True
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
+
+    def _refresh_worker(self):
+        while True:
+            try:
+                self._refresh_once()
+            except Exception as e:
+                print("Error refreshing projects:", e)
+            with self._refresh_lock:
+                if not self._refresh_pending:
+                    self._refresh_running = False
+                    return
+                self._refresh_pending = False
+
+    def _refresh_once(self):
+        self.index.ensure_loaded()
+        started = time.time()
+        projects = project_rows(self.index, ddev_list_entries(), self.disk_scanner.sizes)
+
+        def merge(current):
+            statuses = {p["name"]: p["status"] for p in current}
+            for proj in projects:
+                # A docker event that landed after this refresh's `ddev list` started is newer
+                if proj["name"] in statuses and self._status_times.get(proj["name"], 0) > started:
+                    proj["status"] = statuses[proj["name"]]
+            return sort_projects(projects)
+
+        self._update_projects(merge)
+        describe_cache.prefetch([
+            PROJECTS_DIR / p["name"] for p in projects
+            if p["status"] == "running" and not describe_cache.is_fresh(PROJECTS_DIR / p["name"])
+        ])
+
+    def _update_projects(self, change):
+        # One critical section from read to publish, so concurrent updates can't overwrite
+        # each other and clients see them in order; change returns None to skip
+        with self._projects_lock:
+            projects = change([dict(p) for p in self.projects])
+            if projects is None:
+                return None
+            with self._lock:
+                changed = projects != self.projects
+                self.projects = projects
+                for proj in projects:
+                    if proj.get("site"):
+                        self._site_to_project[proj["site"]] = proj["name"]
+            if changed:
+                self.publish("events", {"type": "projects", "projects": projects})
+        return projects
+
+    def on_project_status(self, site, status):
+        name = self._site_to_project.get(site, site)
+        shell_pool.recycle(PROJECTS_DIR / name)
+        describe_cache.invalidate(PROJECTS_DIR / name)
+        self._status_times[name] = time.time()
+
+        def change(projects):
+            if name not in [p["name"] for p in projects]:
+                return None
+            for proj in projects:
+                if proj["name"] == name:
+                    proj["status"] = status
+            return sort_projects(projects)
+
+        if self._update_projects(change) is None:
+            self.refresh()
+
+    def on_disk_usage(self, name, size, db_size):
+        def change(projects):
+            for proj in projects:
+                if proj["name"] == name:
+                    proj["size"] = size
+                    proj["db_size"] = db_size
+            return projects
+
+        self._update_projects(change)
+
+    def subscribe(self, channel):
+        # Bounded, a stalled client loses events instead of growing the daemon
+        q = queue.Queue(maxsize=DAEMON_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[channel].add(q)
+            if channel == "events":
+                q.put({"type": "projects", "projects": self.projects})
+            start_stats = channel == "stats" and not self._stats_running
+            if start_stats:
+                self._stats_running = True
+        if start_stats:
+            threading.Thread(target=self._relay_stats, daemon=True).start()
+        return q
+
+    def unsubscribe(self, channel, q):
+        with self._lock:
+            self._subscribers[channel].discard(q)
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers[channel])
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                pass
+
+    def _relay_stats(self):
+        # `docker stats` only runs while some client is watching
+        while True:
+            with self._lock:
+                if not self._subscribers["stats"]:
+                    self._stats_running = False
+                    return
+            stream = docker_stats_stream()
+            try:
+                frame = []
+                for row in stream:
+                    if row is not None:
+                        frame.append(row)
+                        continue
+                    if frame:
+                        self.publish("stats", {"type": "stats", "rows": frame})
+                    frame = []
+                    with self._lock:
+                        if not self._subscribers["stats"]:
+                            break
+            except Exception as e:
+                print("Docker stats stream failed:", e)
+            finally:
+                stream.close()
+            time.sleep(1)
+
+    def handle(self, method, parts, query, body):
+        if method == "GET" and parts == ["health"]:
+            return {"ok": True, "pid": os.getpid()}
+        if method == "GET" and parts == ["projects"]:
+            with self._lock:
+                return {"projects": self.projects}
+        if method == "POST" and parts == ["refresh"]:
+            self.refresh()
+            return {"ok": True}
+        if method == "GET" and parts == ["traces"]:
+            records = tracer.snapshot()
+            return {"records": records, "summary": trace_summary(records)}
+        if method == "GET" and parts == ["describe"]:
+            project_path = PROJECTS_DIR / query["project"][0]
+            if not (project_path / ".ddev" / "config.yaml").is_file():
+                raise LookupError(f"{project_path.name} is not a ddev project")
+            return {"describe": describe_cache.get(project_path)}
+        if method == "GET" and parts == ["jobs"]:
+            if "ids" not in query:
+                return {"jobs": [job_summary(job) for job in self.executor.snapshot()]}
+            ids = {int(i) for i in query["ids"][0].split(",") if i}
+            return {"jobs": self._watch([job for job in self.executor.snapshot() if job.id in ids])}
+        if method == "POST" and parts == ["jobs"]:
+            return {"jobs": self._watch(self.submit(body.get("argv") or []))}
+        if parts[:1] == ["jobs"] and len(parts) >= 2:
+            job = next((j for j in self.executor.snapshot() if str(j.id) == parts[1]), None)
+            if job is None:
+                raise LookupError(f"No job {parts[1]}")
+            if method == "GET" and len(parts) == 2:
+                lines, _, last = job.output_since(int(query.get("since", ["0"])[0]))
+                return {"job": self._watch([job])[0], "output": lines, "last": last}
+            if method == "POST" and parts[2:] == ["cancel"]:
+                self.executor.cancel(job)
+                return {"job": job_summary(job)}
+        raise LookupError(f"Unknown endpoint {method} /{'/'.join(parts)}")
+
+    def _watch(self, jobs):
+        # Jobs a client submitted or polls by id stay in the history until it has seen them
+        # finish; a client that stops polling releases them after JOB_WATCH_TTL
+        now = time.time()
+        summaries = []
+        for job in jobs:
+            summary = job_summary(job)
+            job.watched_until = 0 if summary["finished"] else now + JOB_WATCH_TTL
+            summaries.append(summary)
+        return summaries
+
+    def submit(self, argv):
+        try:
+            args = cli_parser().parse_args([str(arg) for arg in argv])
+        except SystemExit:
+            raise ValueError(f"Invalid command: {' '.join(map(str, argv))}")
+        if args.command in ("status", "daemon"):
+            raise ValueError(f"{args.command} is not a job")
+        projects = cli_projects(args)
+        if not projects:
+            raise ValueError("No projects given.")
+        title, fn = cli_operation(args)
+        return [
+            self.executor.submit(name, title, lambda job, n=name: fn(job, n, PROJECTS_DIR / n))
+            for name in projects
+        ]
+
+def serve_daemon(daemon, port=0, daemon_file=DAEMON_FILE):
+    import hmac
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def _send_json(self, data, status=200):
+            payload = json.dumps(data, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _dispatch(self, method):
+            if not hmac.compare_digest(self.headers.get("Authorization", ""), f"Bearer {daemon.token}"):
+                return self._send_json({"error": "unauthorized"}, 401)
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            if method == "GET" and parts in (["events"], ["stats"]):
+                return self._stream(parts[0])
+            if method == "GET" and parts == ["metrics"]:
+                payload = tracer.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                result = daemon.handle(method, parts, parse_qs(url.query), body)
+            except LookupError as e:
+                return self._send_json({"error": str(e)}, 404)
+            except ValueError as e:
+                return self._send_json({"error": str(e)}, 400)
+            except Exception as e:
+                return self._send_json({"error": str(e)}, 500)
+            self._send_json(result)
+
+        def _stream(self, channel):
+            q = daemon.subscribe(channel)
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                while True:
+                    try:
+                        event = q.get(timeout=DAEMON_HEARTBEAT)
+                        self.wfile.write(b"data: " + json.dumps(event, default=str).encode() + b"\n\n")
+                    except queue.Empty:
+                        self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+            except OSError:
+                pass
+            finally:
+                daemon.unsubscribe(channel, q)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    # Only the user who started the daemon can read the token
+    fd = os.open(daemon_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"port": server.server_address[1], "token": daemon.token, "pid": os.getpid()}, f)
+    print(f"ddevgui daemon listening on 127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            with open(daemon_file, "r") as f:
+                if json.load(f).get("pid") == os.getpid():
+                    os.remove(daemon_file)
+        except (OSError, ValueError):
+            pass
+
+def run_daemon(args):
+    if DaemonClient.connect():
+        print(f"A daemon is already running (see {DAEMON_FILE}).", file=sys.stderr)
+        return 1
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    daemon = ProjectDaemon(max(1, args.parallel))
+    daemon.start()
+    try:
+        serve_daemon(daemon, args.port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shell_pool.close_all()
+    return 0
+
 if __name__ == "__main__":
     PROJECTS_DIR = Path(PROJECTS_DIR)
     PROJECTS_DIR.mkdir(exist_ok=True)
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS + ["-h", "--help"]:
+        sys.exit(run_cli(sys.argv[1:]))
+    if tk is None:
+        sys.exit("tkinter is not available, use the command line instead (ddevgui.py --help)")
     root = tk.Tk()
+    startup_mark("tk")
     app = DDEVManagerGUI(root)
     root.mainloop()
+    shell_pool.close_all()
@@ -0,0 +1,68 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ddevgui import ProjectStatusWatcher
+
+
+def event(action, site="shop", service="web"):
+    attributes = {"com.ddev.site-name": site}
+    if service:
+        attributes["com.docker.compose.service"] = service
+    return {"Type": "container", "Action": action, "Actor": {"Attributes": attributes}}
+
+
+def collect(events):
+    seen = []
+    watcher = ProjectStatusWatcher(lambda site, status: seen.append((site, status)), event_source=lambda: [])
+    for e in events:
+        watcher.handle_event(e)
+    return seen
+
+
+def test_actions_map_to_status():
+    seen = collect([event("start"), event("pause"), event("unpause"), event("stop"), event("die")])
+    assert seen == [
+        ("shop", "running"), ("shop", "paused"), ("shop", "running"), ("shop", "stopped"), ("shop", "stopped"),
+    ]
+
+
+def test_other_actions_are_ignored():
+    assert collect([event("exec_start: bash -c true"), event("health_status: healthy"), event("create")]) == []
+
+
+def test_only_web_container_counts():
+    seen = collect([event("stop", service="db"), event("die", service="ddev-router"), event("start", service="web")])
+    assert seen == [("shop", "running")]
+
+
+def test_events_without_site_label_are_ignored():
+    assert collect([event("start", site=None)]) == []
+
+
+def test_on_connect_runs_again_after_reconnect():
+    connects = []
+    seen = []
+    calls = {"n": 0}
+
+    def source():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            def broken():
+                yield event("start")
+                raise ConnectionError("docker went away")
+            return broken()
+        return [event("stop")]
+
+    def on_status(site, status):
+        seen.append((site, status))
+        if len(seen) == 2:
+            watcher.stop()
+
+    watcher = ProjectStatusWatcher(on_status, on_connect=lambda: connects.append(watcher.connected), event_source=source)
+    watcher._run()
+    assert calls["n"] == 2
+    assert connects == [True, True]
+    assert seen == [("shop", "running"), ("shop", "stopped")]
+    assert not watcher.connected